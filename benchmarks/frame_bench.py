@@ -0,0 +1,141 @@
+"""End-to-end rendering benchmark on a headless display.
+
+Starts the game with the dummy SDL video driver, loads a heavy late-game
+golden scenario (see src/scenarios.py), lets the wave build up, then renders
+a fixed number of frames through Game.draw. Reports the time spent in each
+draw function and frame-time percentiles. One simulation tick runs (untimed)
+between frames so the scene keeps moving, and enemies are topped up so the
+sky stays crowded (--swarm).
+
+Usage: python benchmarks/frame_bench.py [--frames N] [--scenario NAME] [--swarm N] [--json PATH]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Add the project root to the python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.commands import start_wave
+from src.main import Game, SIM_DT
+from src.scenarios import SCENARIOS, build_state
+
+# Game methods timed individually (everything draw_frame and draw call)
+DRAW_FUNCTIONS = [
+    'draw_grid', 'draw_buildings', 'draw_shield', 'draw_enemies', 'draw_ground_units', 'draw_drones',
+    'draw_projectiles', 'draw_particles', 'draw_hud', 'draw_messages', 'draw_message_log',
+    'draw_wave_complete_popup', 'draw_game_over', 'draw_debug_overlay', 'present',
+]
+PERCENTILES = (50, 90, 95, 99)
+
+def percentile(sorted_values, p):
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def instrument(game, names):
+    """Replace game methods with timing wrappers. Returns name -> list of per-frame ms."""
+    timings = {name: [] for name in names}
+    current = {name: 0.0 for name in names}
+
+    def wrap(name, method):
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                current[name] += time.perf_counter() - started
+        return timed
+
+    for name in names:
+        setattr(game, name, wrap(name, getattr(game, name)))
+
+    def end_frame():
+        for name in names:
+            timings[name].append(current[name] * 1000)
+            current[name] = 0.0
+    return timings, end_frame
+
+def setup_game(scenario, warmup_ticks: int, show_debug: bool) -> Game:
+    game = Game(threaded_sim=False)
+    game.assets.loaded.wait() # Time drawing, not atlas loading
+    game.assets.prepare()
+
+    game.state = build_state(scenario)
+    game.menu_state = "PLAYING"
+    game.saved_state = game.state.snapshot()
+    game.show_debug = show_debug
+    game.on_wave_complete = lambda state: None # Never autosave from the benchmark
+    start_wave(game.state)
+    for _ in range(warmup_ticks):
+        game.sim.step()
+    game.update(SIM_DT)
+    return game
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--scenario", default="boss-30", choices=[s.name for s in SCENARIOS])
+    parser.add_argument("--warmup-ticks", type=int, default=30 * 45,
+                        help="simulation ticks before measuring (lets enemies pile up)")
+    parser.add_argument("--swarm", type=int, default=100,
+                        help="keep at least N enemies in the air (0 = only the scenario's own)")
+    parser.add_argument("--debug-overlay", action="store_true", help="draw the F3 overlay as well")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    scenario = next(s for s in SCENARIOS if s.name == args.scenario)
+    game = setup_game(scenario, args.warmup_ticks, args.debug_overlay)
+    timings, end_frame = instrument(game, DRAW_FUNCTIONS)
+
+    frame_ms = []
+    entity_counts = []
+    combat = game.state.combat
+    for _ in range(args.frames):
+        while len(combat.enemies) < args.swarm:
+            combat.spawn_enemy()
+        game.update(SIM_DT) # One simulation tick (untimed)
+        snap = game.sim.snapshot
+        entity_counts.append(len(snap.enemies) + len(snap.projectiles) + len(snap.drones) + len(snap.ground_units))
+        started = time.perf_counter()
+        game.draw(0.5)
+        frame_ms.append((time.perf_counter() - started) * 1000)
+        end_frame()
+    game.autosave.stop()
+
+    frames = sorted(frame_ms)
+    total = sum(frame_ms)
+    print(f"{args.frames} frames, scenario {scenario.name} (wave {game.state.wave}, {game.state.phase}), "
+          f"{statistics.mean(entity_counts):.0f} entities on average, "
+          f"{len(game.state.grid.buildings)} buildings, particles {game.particles.count}\n")
+    print(f"{'function':<26}{'mean ms':>10}{'p95 ms':>10}{'max ms':>10}{'share':>9}")
+    results = {}
+    for name in sorted(DRAW_FUNCTIONS, key=lambda n: -sum(timings[n])):
+        values = timings[name]
+        if not any(values):
+            continue
+        ordered = sorted(values)
+        results[name] = {'mean_ms': statistics.mean(values), 'p95_ms': percentile(ordered, 95),
+                         'max_ms': ordered[-1], 'share': sum(values) / total}
+        r = results[name]
+        print(f"{name:<26}{r['mean_ms']:>10.3f}{r['p95_ms']:>10.3f}{r['max_ms']:>10.3f}{r['share']:>9.1%}")
+
+    frame_stats = {f"p{p}_ms": percentile(frames, p) for p in PERCENTILES}
+    frame_stats.update(mean_ms=statistics.mean(frames), max_ms=frames[-1])
+    print(f"\n{'frame':<26}{statistics.mean(frames):>10.3f} mean  "
+          + "  ".join(f"p{p} {frame_stats[f'p{p}_ms']:.3f}" for p in PERCENTILES)
+          + f"  max {frames[-1]:.3f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({'scenario': scenario.name, 'frames': args.frames, 'frame': frame_stats,
+                       'functions': results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Check that optimized combat/grid code plays out exactly like the reference.
+
+Runs every golden scenario (fixed seeds and layouts, waves 1-30 including
+boss waves) with the reference classes and with a candidate, compares a
+digest of the game state after every tick, and reports the first divergent
+tick and entity.
+
+Usage: python benchmarks/golden.py [--candidate module:Class ...] [--scenario NAME ...] [--max-ticks N]
+
+A candidate is a CombatManager or CityGrid subclass, e.g.
+    python benchmarks/golden.py --candidate mypatch:FastCombatManager
+"""
+import argparse
+import importlib
+import os
+import sys
+
+# Add the project root to the python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core_data import CityGrid, CombatManager
+from src.scenarios import SCENARIOS, diff_rows, first_divergence, run_scenario, state_rows
+
+MAX_DIFF_LINES = 10
+
+def load_class(spec: str):
+    """'package.module:Class' -> class"""
+    module_name, _, class_name = spec.partition(":")
+    if not class_name:
+        raise SystemExit(f"Expected module:Class, got {spec!r}")
+    return getattr(importlib.import_module(module_name), class_name)
+
+def resolve_classes(specs):
+    """(grid_class, combat_class) from a list of module:Class specs"""
+    grid_class, combat_class = CityGrid, CombatManager
+    for spec in specs:
+        cls = load_class(spec)
+        if issubclass(cls, CombatManager):
+            combat_class = cls
+        elif issubclass(cls, CityGrid):
+            grid_class = cls
+        else:
+            raise SystemExit(f"{spec} is neither a CombatManager nor a CityGrid subclass")
+    return grid_class, combat_class
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidate", action="append", default=[], metavar="module:Class",
+                        help="optimized CombatManager/CityGrid subclass (repeatable)")
+    parser.add_argument("--reference", action="append", default=[], metavar="module:Class",
+                        help="reference classes (default: src.core_data)")
+    parser.add_argument("--scenario", action="append", default=[], metavar="NAME",
+                        help="run only these scenarios")
+    parser.add_argument("--max-ticks", type=int, metavar="N",
+                        help="stop each scenario after N ticks (quick check)")
+    parser.add_argument("--list", action="store_true", help="list the scenarios and exit")
+    args = parser.parse_args()
+
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    if args.list or not scenarios:
+        for s in SCENARIOS:
+            waves = f"{s.first_wave}-{s.first_wave + s.waves - 1}" if s.waves > 1 else str(s.first_wave)
+            print(f"{s.name:<12} waves {waves:<6} layout {s.layout:<10} seed {s.seed}")
+        return
+
+    reference = resolve_classes(args.reference)
+    candidate = resolve_classes(args.candidate)
+    print(f"reference: {reference[1].__name__} / {reference[0].__name__}")
+    print(f"candidate: {candidate[1].__name__} / {candidate[0].__name__}\n")
+    print(f"{'scenario':<12}{'ticks':>8}{'ref ms':>10}{'cand ms':>10}{'speedup':>9}  result")
+
+    failures = 0
+    for scenario in scenarios:
+        expected = run_scenario(scenario, *reference, max_ticks=args.max_ticks)
+        actual = run_scenario(scenario, *candidate, max_ticks=args.max_ticks)
+        tick = first_divergence(expected, actual)
+        if tick is None and expected.outcome != actual.outcome:
+            tick = len(expected.digests) - 1
+        speedup = expected.seconds / actual.seconds if actual.seconds else float('inf')
+        result = "ok" if tick is None else f"DIVERGED at tick {tick}"
+        print(f"{scenario.name:<12}{expected.outcome.ticks:>8}{expected.seconds * 1000:>10.1f}"
+              f"{actual.seconds * 1000:>10.1f}{speedup:>8.2f}x  {result}")
+        if tick is None:
+            continue
+
+        failures += 1
+        expected_rows = state_rows(run_scenario(scenario, *reference, stop_tick=tick, record_digests=False))
+        actual_rows = state_rows(run_scenario(scenario, *candidate, stop_tick=tick, record_digests=False))
+        lines = diff_rows(expected_rows, actual_rows)
+        for line in lines[:MAX_DIFF_LINES]:
+            print(f"    {line}")
+        if len(lines) > MAX_DIFF_LINES:
+            print(f"    ... {len(lines) - MAX_DIFF_LINES} more")
+        if expected.outcome != actual.outcome:
+            print(f"    outcome {expected.outcome} -> {actual.outcome}")
+
+    print(f"\n{len(scenarios) - failures}/{len(scenarios)} scenarios match")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
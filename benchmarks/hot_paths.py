@@ -0,0 +1,230 @@
+"""Microbenchmarks for the grid and combat hot paths.
+
+Times CityGrid.can_place, get_building_at and destroy_building cascades,
+CombatManager.update, find_nearest_enemy and check_collisions, and
+GameState.update_economy on synthetic fixtures (empty, half-full and full
+32x12 grids; 10/100/1000 enemies and projectiles).
+
+Usage:
+    python benchmarks/hot_paths.py [--output results.json] [--filter TEXT] [--repeat N]
+    python benchmarks/hot_paths.py --compare baseline.json [--threshold 0.10] [--min-delta-us 1.0]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+# Add the project root to the python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core_data import (GameState, BuildingType, Enemy, Projectile, GRID_START_X, GRID_SLOT_WIDTH,
+                           GROUND_Y, SHIELD_Y)
+
+RESULTS_VERSION = 1
+SIM_DT = 1.0 / 30
+GRID_FILLS = {'empty': 0, 'half': 6, 'full': 12} # Rows filled in every column
+ENTITY_COUNTS = (10, 100, 1000)
+
+# Column stacks: power plants, turrets, datacenters, barracks
+STACKS = [BuildingType.POWER_PLANT, BuildingType.TURRET, BuildingType.DATACENTER, BuildingType.BARRACKS]
+
+# --- Fixtures ---
+
+def make_grid_state(fill: str) -> GameState:
+    """All 32 columns unlocked, the bottom rows of every column built up"""
+    state = GameState(credits=100000, wave=20)
+    state.rng.seed(0)
+    grid = state.grid
+    while grid.unlock_column("left") or grid.unlock_column("right"):
+        pass
+    for row in range(GRID_FILLS[fill]):
+        for column in range(grid.max_columns):
+            grid.place_building(STACKS[column % len(STACKS)], column, row)
+    state.update_economy()
+    return state
+
+def add_entities(state: GameState, count: int, seed: int = 1):
+    """count enemies spread over the sky, count turret projectiles flying among them"""
+    rng = random.Random(seed)
+    combat = state.combat
+    combat.start_wave()
+    width = state.grid.max_columns * GRID_SLOT_WIDTH
+    for _ in range(count):
+        x = GRID_START_X + rng.uniform(0, width)
+        y = rng.uniform(-50, SHIELD_Y)
+        combat.enemies.append(Enemy(x=x, y=y, vx=rng.uniform(-20, 20), vy=rng.uniform(30, 70)))
+    for _ in range(count):
+        x = GRID_START_X + rng.uniform(0, width)
+        y = rng.uniform(SHIELD_Y, GROUND_Y)
+        combat.projectiles.append(Projectile(x=x, y=y, vx=rng.uniform(-50, 50), vy=-300, damage=25,
+                                             target=rng.choice(combat.enemies)))
+
+class Fixtures:
+    """Fixture states are built once; benchmarks that mutate get fresh copies"""
+
+    def __init__(self):
+        self.grid_snapshots = {fill: make_grid_state(fill).snapshot() for fill in GRID_FILLS}
+
+    def grid_state(self, fill: str) -> GameState:
+        state = GameState()
+        state.restore(self.grid_snapshots[fill])
+        return state
+
+    def combat_state(self, fill: str, count: int) -> GameState:
+        state = self.grid_state(fill)
+        add_entities(state, count)
+        return state
+
+# --- Benchmarks ---
+# Each one is (name, setup(fixtures) -> context, run(context), calls per timing).
+# setup runs untimed before every timing, so run may mutate its context.
+
+def can_place_benchmarks():
+    def probes(state):
+        grid = state.grid
+        return [(STACKS[(column + row) % len(STACKS)], column, row)
+                for column in range(0, grid.max_columns, 3) for row in range(0, grid.rows, 2)]
+
+    def run(context):
+        grid, cells = context
+        for building_type, column, row in cells:
+            grid.can_place(building_type, column, row)
+
+    for fill in GRID_FILLS:
+        def setup(fixtures, fill=fill):
+            state = fixtures.grid_state(fill)
+            return state.grid, probes(state)
+        yield f"grid.can_place[{fill}]", setup, run, 5
+
+def get_building_at_benchmarks():
+    def run(grid):
+        for column in range(grid.max_columns):
+            for row in range(grid.rows):
+                grid.get_building_at(column, row)
+
+    for fill in GRID_FILLS:
+        yield f"grid.get_building_at[{fill}, all cells]", (lambda f, fill=fill: f.grid_state(fill).grid), run, 1
+
+def destroy_building_benchmarks():
+    def setup(fixtures, fill):
+        grid = fixtures.grid_state(fill).grid
+        # Ground-floor buildings: everything stacked above them cascades
+        return grid, [b.id for b in grid.buildings if b.row == 0][::4]
+
+    def run(context):
+        grid, ids = context
+        for building_id in ids:
+            grid.destroy_building(building_id)
+
+    for fill in ('half', 'full'):
+        yield f"grid.destroy_building[{fill}, cascade]", (lambda f, fill=fill: setup(f, fill)), run, 1
+
+def combat_benchmarks():
+    def run_update(state):
+        state.combat.update(SIM_DT)
+
+    def run_nearest(context):
+        combat, points = context
+        for x, y in points:
+            combat.find_nearest_enemy(x, y)
+
+    def nearest_setup(fixtures, count):
+        state = fixtures.combat_state('empty', count)
+        points = [(GRID_START_X + column * GRID_SLOT_WIDTH, GROUND_Y) for column in range(state.grid.max_columns)]
+        return state.combat, points
+
+    for count in ENTITY_COUNTS:
+        yield (f"combat.update[full, {count} enemies+projectiles]",
+               (lambda f, count=count: f.combat_state('full', count)), run_update, 1)
+        yield (f"combat.find_nearest_enemy[{count} enemies, 32 queries]",
+               (lambda f, count=count: nearest_setup(f, count)), run_nearest, 1)
+        yield (f"combat.check_collisions[{count} enemies+projectiles]",
+               (lambda f, count=count: f.combat_state('half', count).combat), lambda c: c.check_collisions(), 1)
+
+def economy_benchmarks():
+    for fill in GRID_FILLS:
+        yield (f"state.update_economy[{fill}]", (lambda f, fill=fill: f.grid_state(fill)),
+               lambda state: state.update_economy(), 10)
+
+def all_benchmarks():
+    for group in (can_place_benchmarks, get_building_at_benchmarks, destroy_building_benchmarks,
+                  combat_benchmarks, economy_benchmarks):
+        yield from group()
+
+def measure(fixtures, setup, run, calls: int, repeat: int) -> dict:
+    """Time run(context) `calls` times per sample; returns per-call microseconds"""
+    samples = []
+    for _ in range(repeat):
+        context = setup(fixtures)
+        started = time.perf_counter()
+        for _ in range(calls):
+            run(context)
+        samples.append((time.perf_counter() - started) / calls * 1e6)
+    return {'min_us': min(samples), 'median_us': statistics.median(samples), 'samples': repeat}
+
+# --- Reporting ---
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_us: float = 1.0) -> int:
+    """Print per-benchmark change against the baseline. Returns the number of regressions."""
+    regressions = 0
+    print(f"\n{'benchmark':<56}{'baseline':>11}{'now':>11}{'change':>9}")
+    for name, result in results['benchmarks'].items():
+        old = baseline['benchmarks'].get(name)
+        if old is None:
+            print(f"{name:<56}{'-':>11}{result['median_us']:>11.1f}{'new':>9}")
+            continue
+        change = result['median_us'] / old['median_us'] - 1 if old['median_us'] else 0.0
+        flag = ""
+        # Sub-microsecond benchmarks swing by large fractions on timer noise alone
+        if change > threshold and result['median_us'] - old['median_us'] >= min_delta_us:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:<56}{old['median_us']:>11.1f}{result['median_us']:>11.1f}{change:>+9.1%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7, help="samples per benchmark (median is reported)")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains TEXT")
+    parser.add_argument("--output", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown (fraction of the baseline median) reported as a regression")
+    parser.add_argument("--min-delta-us", type=float, default=1.0,
+                        help="smallest slowdown in microseconds reported as a regression")
+    args = parser.parse_args()
+
+    fixtures = Fixtures()
+    results = {
+        'version': RESULTS_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'benchmarks': {},
+    }
+    print(f"{'benchmark':<56}{'median us':>12}{'min us':>12}")
+    for name, setup, run, calls in all_benchmarks():
+        if args.filter not in name:
+            continue
+        result = measure(fixtures, setup, run, calls, args.repeat)
+        results['benchmarks'][name] = result
+        print(f"{name:<56}{result['median_us']:>12.1f}{result['min_us']:>12.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_us)
+        print(f"\n{regressions} regression(s) over {args.threshold:.0%} and {args.min_delta_us:g} us")
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
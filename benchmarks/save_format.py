@@ -0,0 +1,93 @@
+"""Compare the versioned save format against the legacy pickle saves.
+
+Usage: python benchmarks/save_format.py [--repeat N]
+"""
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+# Add the project root to the python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core_data import GameState, BuildingType
+from src.savegame import atomic_write, encode_save, decode_save, write_save, read_save, state_from_snapshot
+
+BUILD_ORDER = [BuildingType.POWER_PLANT, BuildingType.TURRET, BuildingType.DATACENTER,
+               BuildingType.TURRET, BuildingType.CAPACITOR, BuildingType.BARRACKS]
+
+def make_state(rows: int) -> GameState:
+    """A late-game base: every unlocked column filled up to `rows` high"""
+    state = GameState(credits=100000, wave=25)
+    grid = state.grid
+    while grid.unlock_column("left") or grid.unlock_column("right"):
+        pass
+    start, end = grid.unlocked_range
+    for row in range(rows):
+        for column in range(start, end):
+            grid.place_building(BUILD_ORDER[(column + row) % len(BUILD_ORDER)], column, row)
+    for i in range(50):
+        state.add_log(f"Enemy detected at sector {i % 32}!")
+    state.update_economy()
+    return state
+
+def timed(fn, repeat: int) -> float:
+    """Best-of time in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def bench(state: GameState, repeat: int, directory: str):
+    snapshot = state.snapshot()
+    path = os.path.join(directory, "bench.dat")
+    results = []
+
+    def pickle_save():
+        # Same temp file + fsync + rename as write_save, so only the format differs
+        atomic_write(path, pickle.dumps(state))
+
+    def pickle_load():
+        with open(path, "rb") as f:
+            pickle.load(f)
+
+    save_ms = timed(pickle_save, repeat)
+    load_ms = timed(pickle_load, repeat)
+    results.append(("pickle (legacy)", save_ms, load_ms, os.path.getsize(path)))
+
+    for compress in (False, True):
+        save_ms = timed(lambda: write_save(path, state.snapshot(), compress), repeat)
+        load_ms = timed(lambda: state_from_snapshot(read_save(path)), repeat)
+        name = "versioned + zlib" if compress else "versioned"
+        results.append((name, save_ms, load_ms, os.path.getsize(path)))
+
+    # Serialization alone (no disk, no fsync)
+    blob = pickle.dumps(state)
+    encode_ms = timed(lambda: pickle.dumps(state), repeat)
+    decode_ms = timed(lambda: pickle.loads(blob), repeat)
+    results.append(("pickle (in memory)", encode_ms, decode_ms, len(blob)))
+    blob = encode_save(snapshot)
+    encode_ms = timed(lambda: encode_save(snapshot), repeat)
+    decode_ms = timed(lambda: decode_save(blob), repeat)
+    results.append(("versioned + zlib (in memory)", encode_ms, decode_ms, len(blob)))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in (1, 4, 12):
+            state = make_state(rows)
+            print(f"\n{len(state.grid.buildings)} buildings")
+            print(f"{'format':<30}{'save ms':>10}{'load ms':>10}{'bytes':>10}")
+            for name, save_ms, load_ms, size in bench(state, args.repeat, directory):
+                print(f"{name:<30}{save_ms:>10.3f}{load_ms:>10.3f}{size:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,72 @@
+import argparse
 import sys
 import os
 
 # Add the project root to the python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.main import Game
+def play_replay_headless(path, telemetry=None, telemetry_every=1, results_db=None):
+    """Re-run a replay without a window and report the outcome"""
+    from src.replay import read_replay, play_headless
+    from src.results import WaveResults
+    from src.telemetry import TelemetrySink
+
+    replay = read_replay(path)
+    listeners = []
+    if telemetry:
+        listeners.append(TelemetrySink(telemetry, telemetry_every))
+    if results_db:
+        listeners.append(WaveResults(results_db))
+    outcome, seconds = play_headless(replay, listeners)
+    for listener in listeners:
+        listener.stop()
+    print(f"{replay.ticks} ticks in {seconds:.2f}s ({replay.ticks / max(seconds, 1e-9):.0f} ticks/s)")
+    print(f"Outcome: wave {outcome.wave} ({outcome.phase}), {outcome.credits} credits, "
+          f"{outcome.buildings} buildings{', game over' if outcome.game_over else ''}")
+    if replay.outcome is not None:
+        print("Matches recording" if outcome == replay.outcome else f"DIVERGED from recording: {replay.outcome}")
 
 if __name__ == "__main__":
-    game = Game()
+    from src.hitches import HITCH_LOG, HITCH_THRESHOLD_MS # No pygame
+
+    parser = argparse.ArgumentParser(description="Skyguard: Cell Defense")
+    parser.add_argument("--record-replay", metavar="PATH", help="record each game session's commands to its own replay file "
+                             "(PATH with the session's start time added, e.g. session-20260101-120000.rpl)")
+    parser.add_argument("--replay", metavar="PATH", help="play back a replay file")
+    parser.add_argument("--headless", action="store_true", help="with --replay: no window, run as fast as possible")
+    parser.add_argument("--profile-wave", choices=["combat", "frame"],
+                        help="cProfile every wave (combat updates or the whole frame loop) into profiles/")
+    parser.add_argument("--hitch-log", nargs="?", const=HITCH_LOG, metavar="PATH",
+                        help="log slow frames (timings, entity counts, GC, stacks) to a rotating JSONL file")
+    parser.add_argument("--hitch-ms", type=float, default=HITCH_THRESHOLD_MS,
+                        help=f"with --hitch-log: slow frame threshold (default {HITCH_THRESHOLD_MS:g})")
+    parser.add_argument("--memory-monitor", action="store_true",
+                        help="trace allocations and log memory growth per wave to profiles/memory.log")
+    parser.add_argument("--gc-tuning", action="store_true",
+                        help="freeze long-lived objects and collect less during waves, collect in the build phase")
+    parser.add_argument("--telemetry", metavar="PATH",
+                        help="stream combat telemetry (counts, shield, credits, damage by source) to PATH (.csv or JSONL)")
+    parser.add_argument("--telemetry-every", type=int, default=1, metavar="N",
+                        help="with --telemetry: record every Nth tick (default 1)")
+    parser.add_argument("--results-db", nargs="?", const="results.db", metavar="PATH",
+                        help="record a summary row per wave (rewards, losses, kills per building) in SQLite")
+    parser.add_argument("--speed", type=float, default=1.0, help="with --replay: playback speed (default 1.0)")
+    args = parser.parse_args()
+
+    if args.replay and args.headless:
+        play_replay_headless(args.replay, args.telemetry, args.telemetry_every, args.results_db)
+        sys.exit()
+
+    from src.main import Game
+
+    # Diagnostics, all off by default
+    options = dict(profile_mode=args.profile_wave, hitch_log=args.hitch_log, hitch_ms=args.hitch_ms,
+                   memory_monitor=args.memory_monitor, gc_tuning=args.gc_tuning,
+                   telemetry=args.telemetry, telemetry_every=args.telemetry_every, results_db=args.results_db)
+    if args.replay:
+        from src.replay import read_replay
+        game = Game(threaded_sim=False, **options)
+        game.start_replay(read_replay(args.replay), args.speed)
+    else:
+        game = Game(record_replay=args.record_replay, **options)
     game.run()
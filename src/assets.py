@@ -0,0 +1,220 @@
+import json
+import os
+import threading
+
+import pygame
+
+from src.core_data import BuildingType, get_building_template, GRID_SLOT_WIDTH, GRID_CELL_HEIGHT
+
+ASSET_DIR = "assets"
+ATLAS_IMAGE = os.path.join(ASSET_DIR, "atlas.png")
+ATLAS_LAYOUT = os.path.join(ASSET_DIR, "atlas.json") # {"sprites": {"turret_t1": [x, y, w, h], ...}}
+
+BUILDING_COLORS = {
+    BuildingType.POWER_PLANT: (0, 100, 255),
+    BuildingType.DATACENTER: (0, 255, 0),
+    BuildingType.CAPACITOR: (0, 255, 255),
+    BuildingType.TURRET: (255, 0, 0),
+    BuildingType.DRONE_FACTORY: (255, 255, 255),
+    BuildingType.BARRACKS: (139, 69, 19), # Saddle Brown
+}
+TIER_LEVELS = {1: 1, 2: 4, 3: 7} # First level of each tier
+
+# Entity sprites and the on-screen sizes they are pre-scaled to
+ENTITY_SIZES = {
+    'enemy': [41],
+    'boss': [121],
+    'drone': [17],
+    'invader': [10],
+    'defender': [10],
+}
+
+ART_SCALE = 2 # Atlas art is drawn at twice the on-screen size
+ENTITY_ART_SIZE = 64
+SHEET_WIDTH = 1024
+
+def building_sprite_name(building_type: BuildingType, tier: int) -> str:
+    return f"{building_type.value}_t{tier}"
+
+def building_sprite_size(footprint) -> tuple:
+    """On-screen size of a building body (matches the 2px cell inset)"""
+    return (footprint[0] * GRID_SLOT_WIDTH - 4, footprint[1] * GRID_CELL_HEIGHT - 4)
+
+def shade(color, factor):
+    return tuple(max(0, min(255, int(c * factor))) for c in color)
+
+def draw_building_art(surf, building_type: BuildingType, tier: int):
+    """Procedural building art used when no atlas image is shipped"""
+    color = BUILDING_COLORS[building_type]
+    rect = surf.get_rect()
+    surf.fill(shade(color, 0.55))
+    pygame.draw.rect(surf, shade(color, 0.85), rect.inflate(-8, -8))
+
+    # Window rows, one more per tier
+    window = shade(color, 1.3) if color != (255, 255, 255) else (180, 180, 180)
+    step = 24
+    for wy in range(16, rect.height - 12, step):
+        for wx in range(14, rect.width - 14, step):
+            pygame.draw.rect(surf, window, (wx, wy, 10, 8 + tier * 2))
+
+    if building_type == BuildingType.TURRET:
+        center = rect.center
+        pygame.draw.circle(surf, shade(color, 0.4), center, rect.width // 4)
+        pygame.draw.line(surf, (230, 230, 230), center, (center[0], 6), 6)
+    elif building_type == BuildingType.POWER_PLANT:
+        cx, cy = rect.center
+        bolt = [(cx + 6, cy - 22), (cx - 10, cy + 4), (cx, cy + 4), (cx - 6, cy + 22), (cx + 10, cy - 4), (cx, cy - 4)]
+        pygame.draw.polygon(surf, (255, 230, 0), bolt)
+
+    pygame.draw.rect(surf, (255, 255, 255), rect, 2)
+
+def draw_entity_art(surf, name: str):
+    """Procedural unit art used when no atlas image is shipped"""
+    size = surf.get_width()
+    center = (size // 2, size // 2)
+    if name in ('enemy', 'boss'):
+        color = (148, 0, 211) if name == 'boss' else (255, 0, 0)
+        pygame.draw.circle(surf, color, center, size // 2)
+        pygame.draw.circle(surf, shade(color, 0.6), center, size // 2, 4)
+        pygame.draw.circle(surf, (255, 220, 0), center, size // 8)
+    elif name == 'drone':
+        pygame.draw.polygon(surf, (0, 255, 255), [(size // 2, 0), (0, size - 1), (size - 1, size - 1)])
+        pygame.draw.polygon(surf, (0, 120, 140), [(size // 2, size // 3), (size // 4, size - 1), (size * 3 // 4, size - 1)])
+    else:
+        color = (255, 0, 0) if name == 'invader' else (0, 100, 255)
+        surf.fill(color)
+        pygame.draw.rect(surf, shade(color, 0.5), surf.get_rect(), 6)
+
+def build_procedural_atlas():
+    """Draw every sprite into one atlas surface and return (surface, layout)"""
+    pieces = []
+    for building_type in BuildingType:
+        for tier, level in TIER_LEVELS.items():
+            width, height = get_building_template(building_type, level).footprint
+            pieces.append((building_sprite_name(building_type, tier),
+                           (width * GRID_SLOT_WIDTH * ART_SCALE, height * GRID_CELL_HEIGHT * ART_SCALE),
+                           lambda s, t=building_type, tr=tier: draw_building_art(s, t, tr)))
+    for name in ENTITY_SIZES:
+        pieces.append((name, (ENTITY_ART_SIZE, ENTITY_ART_SIZE), lambda s, n=name: draw_entity_art(s, n)))
+
+    layout = pack([(name, size) for name, size, _ in pieces])
+    atlas = pygame.Surface((SHEET_WIDTH, max(y + h for x, y, w, h in layout.values())), pygame.SRCALPHA)
+    for name, size, draw in pieces:
+        piece = pygame.Surface(size, pygame.SRCALPHA)
+        draw(piece)
+        atlas.blit(piece, layout[name][:2])
+    return atlas, layout
+
+def pack(sizes):
+    """Simple shelf packer: {name: (x, y, w, h)} within SHEET_WIDTH"""
+    layout = {}
+    x = y = shelf = 0
+    for name, (w, h) in sorted(sizes, key=lambda item: -item[1][1]):
+        if x + w > SHEET_WIDTH:
+            x, y, shelf = 0, y + shelf, 0
+        layout[name] = (x, y, w, h)
+        x += w
+        shelf = max(shelf, h)
+    return layout
+
+class AssetManager:
+    """Loads the sprite atlas once and hands out pre-scaled views of it.
+
+    The atlas (``assets/atlas.png`` + ``assets/atlas.json``, or a procedurally
+    drawn stand-in when those are missing) is loaded on a background thread so
+    the main menu comes up immediately. The first time sprites are requested
+    after loading, ``prepare()`` converts the atlas for the display and scales
+    every building (per type and tier footprint) and unit sprite to its final
+    on-screen size into one sheet. Callers receive subsurfaces of that sheet,
+    so nothing is loaded or scaled while drawing.
+    """
+
+    def __init__(self, atlas_path=ATLAS_IMAGE, layout_path=ATLAS_LAYOUT):
+        self.atlas_path = atlas_path
+        self.layout_path = layout_path
+        self.loaded = threading.Event()
+        self.thread = None
+        self.atlas = None # Unscaled source art
+        self.layout = {}
+        self.sheet = None # Converted, pre-scaled sprites
+        self.views = {} # (name, size) -> subsurface of sheet
+        self.source = None # "file" or "procedural"
+
+    def start_loading(self):
+        """Begin loading the atlas on a worker thread"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.load, name="assets", daemon=True)
+            self.thread.start()
+
+    def load(self):
+        try:
+            atlas = pygame.image.load(self.atlas_path)
+            with open(self.layout_path) as f:
+                layout = {name: tuple(rect) for name, rect in json.load(f)["sprites"].items()}
+            self.source = "file"
+        except (OSError, pygame.error, ValueError, KeyError):
+            atlas, layout = build_procedural_atlas()
+            self.source = "procedural"
+        self.atlas, self.layout = atlas, layout
+        self.loaded.set()
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.views)
+
+    def prepare(self) -> bool:
+        """Build the scaled sheet once the atlas has loaded. Call from the main thread."""
+        if self.views:
+            return True
+        if not self.loaded.is_set():
+            return False
+
+        atlas = self.atlas
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+
+        # Final size for every sprite we will hand out
+        targets = []
+        for building_type in BuildingType:
+            for tier, level in TIER_LEVELS.items():
+                name = building_sprite_name(building_type, tier)
+                footprint = get_building_template(building_type, level).footprint
+                targets.append((name, building_sprite_size(footprint)))
+        for name, sizes in ENTITY_SIZES.items():
+            targets.extend((name, (size, size)) for size in sizes)
+        targets = [(name, size) for name, size in targets if name in self.layout]
+
+        layout = pack([((name, size), size) for name, size in targets])
+        sheet_height = max((y + h for x, y, w, h in layout.values()), default=1)
+        sheet = pygame.Surface((SHEET_WIDTH, sheet_height), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            sheet = sheet.convert_alpha()
+        sheet.fill((0, 0, 0, 0))
+
+        views = {}
+        for key, rect in layout.items():
+            name, size = key
+            source = atlas.subsurface(self.layout[name])
+            target = sheet.subsurface(rect)
+            pygame.transform.smoothscale(source, size, target)
+            views[key] = target
+
+        self.sheet = sheet
+        self.views = views
+        return True
+
+    def get(self, name: str, size) -> pygame.Surface:
+        """Pre-scaled sprite view, or None if assets are not ready yet"""
+        if not self.prepare():
+            return None
+        view = self.views.get((name, tuple(size)))
+        if view is None and name in self.layout:
+            # Unexpected size: scale once and keep it
+            view = pygame.transform.smoothscale(self.atlas.subsurface(self.layout[name]), size)
+            if pygame.display.get_surface() is not None:
+                view = view.convert_alpha()
+            self.views[(name, tuple(size))] = view
+        return view
+
+    def building(self, building_type: BuildingType, tier: int, footprint) -> pygame.Surface:
+        return self.get(building_sprite_name(building_type, tier), building_sprite_size(footprint))
@@ -0,0 +1,77 @@
+import os
+import queue
+import threading
+
+from src.core_data import StateSnapshot
+from src.savegame import write_save
+
+class AutosaveService:
+    """Writes saves on a background thread so the game never waits on disk.
+
+    Callers hand over an immutable StateSnapshot (cheap to take at a tick
+    boundary); encoding, compression, the write and fsync all happen on the
+    worker. A pending save is replaced by a newer one to the same file, since
+    the newer snapshot supersedes it; saves to other files are never dropped.
+    At most ``max_pending`` files wait at once: beyond that a save is refused.
+    Results are reported through ``report(text, ok)`` from the worker thread,
+    and successful saves are recorded in the slot index, if one is given.
+    """
+
+    def __init__(self, report, index=None, max_pending: int = 4, compress: bool = True):
+        self.report = report
+        self.index = index
+        self.compress = compress
+        self.max_pending = max_pending # Three slots plus the autosave never need refusing
+        self.lock = threading.Lock()
+        self.pending = {} # path -> (snapshot, label), newest per file
+        self.jobs = queue.SimpleQueue() # Paths in submit order, None to stop
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="autosave", daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Finish pending saves (up to timeout) and stop the worker"""
+        if self.thread is not None:
+            self.jobs.put(None)
+            self.thread.join(timeout)
+            self.thread = None
+
+    def submit(self, path: str, snapshot: StateSnapshot, label: str = "Autosaved") -> bool:
+        """Queue a save without blocking; ``label`` is reported on success.
+
+        Returns False if the save was refused because ``max_pending`` other
+        files are still waiting to be written.
+        """
+        self.start()
+        with self.lock:
+            if path in self.pending:
+                self.pending[path] = (snapshot, label) # Still queued: write the newer snapshot
+                return True
+            if len(self.pending) >= self.max_pending:
+                return False
+            self.pending[path] = (snapshot, label)
+        self.jobs.put(path)
+        return True
+
+    def run(self):
+        while True:
+            path = self.jobs.get()
+            if path is None:
+                return
+            with self.lock:
+                snapshot, label = self.pending.pop(path)
+            try:
+                write_save(path, snapshot, self.compress)
+            except Exception as e:
+                self.report(f"Save Failed: {e}", False)
+                print(f"Save error: {e}")
+            else:
+                self.report(label, True)
+                if self.index is not None:
+                    try:
+                        self.index.record(os.path.basename(path), snapshot)
+                    except OSError as e:
+                        print(f"Save index error: {e}")
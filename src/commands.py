@@ -0,0 +1,70 @@
+from typing import Tuple
+
+from src.core_data import BuildingType, get_building_template
+
+# Player commands that change the game state.
+# The UI validates and confirms them; these only apply the change. Arguments
+# are plain JSON values so commands can be recorded into replays.
+
+def build(state, building_type: str, column: int, row: int):
+    building_type = BuildingType(building_type)
+    state.credits -= get_building_template(building_type, 1).cost
+    state.grid.place_building(building_type, column, row)
+    state.update_economy()
+
+def upgrade(state, building_id: int) -> Tuple[bool, str]:
+    building = state.grid.get_building(building_id)
+    cost = building.template.upgrade_cost # Read before the template changes
+    success, reason = state.grid.upgrade_building(building_id)
+    if success:
+        state.credits -= cost
+        state.update_economy()
+    return success, reason
+
+def move(state, building_id: int, column: int, row: int) -> Tuple[bool, str]:
+    success, reason = state.grid.move_building(building_id, column, row)
+    if success:
+        state.update_economy()
+    return success, reason
+
+def sell(state, building_id: int) -> int:
+    """Refund 50% of total investment. Returns the refund."""
+    building = state.grid.get_building(building_id)
+    refund = int(building.get_total_investment() * 0.5)
+    state.credits += refund
+    state.grid.destroy_building(building_id)
+    state.update_economy()
+    return refund
+
+def repair(state, building_id: int) -> int:
+    """Repair at 1 credit per HP, partially if credits run short. Returns HP repaired."""
+    building = state.grid.get_building(building_id)
+    amount = min(building.template.max_hp - building.current_hp, state.credits)
+    building.current_hp += amount
+    state.credits -= amount
+    state.update_economy()
+    return amount
+
+def unlock(state, side: str, cost: int) -> bool:
+    if not state.grid.unlock_column(side):
+        return False
+    state.credits -= cost
+    return True
+
+def start_wave(state):
+    state.phase = "combat"
+    state.wave += 1
+    state.combat.start_wave()
+
+COMMANDS = {
+    'build': build,
+    'upgrade': upgrade,
+    'move': move,
+    'sell': sell,
+    'repair': repair,
+    'unlock': unlock,
+    'start_wave': start_wave,
+}
+
+def apply_command(state, name: str, args: tuple):
+    return COMMANDS[name](state, *args)
@@ -1,9 +1,12 @@
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple, Set, Dict
+from functools import lru_cache
+from typing import List, Optional, Tuple, Set, Dict, NamedTuple
 from enum import Enum
 import random
 import math
 
+from src.profiler import PROFILER
+
 class BuildingType(Enum):
     POWER_PLANT = "power_plant"
     DATACENTER = "datacenter"
@@ -18,7 +21,7 @@ class BuildingCategory(Enum):
     DEFENSE = "Defense"
     MILITARY = "Military"
 
-@dataclass
+@dataclass(frozen=True)
 class BuildingTemplate:
     type: BuildingType
     category: BuildingCategory
@@ -80,7 +83,8 @@ class BuildingTemplate:
         else:  # Defense buildings
             return (1, 1)
 
-# Building stat templates by type and level
+# Building stat templates by type and level (shared, immutable)
+@lru_cache(maxsize=None)
 def get_building_template(building_type: BuildingType, level: int) -> BuildingTemplate:
     """Generate building stats for given type and level"""
     
@@ -559,6 +563,7 @@ class CityGrid:
         building = next((b for b in self.buildings if b.id == building_id), None)
         if not building:
             return
+        PROFILER.count('destroy_building')
         
         cascade_damage = building.template.max_hp * 0.25
         destroyed_cells = building.cells
@@ -578,6 +583,7 @@ class CityGrid:
         
         # Destroy unsupported buildings
         for other in unsupported:
+            PROFILER.count('cascade')
             self.destroy_building(other.id)
         
         # Apply cascade damage to buildings below
@@ -589,6 +595,7 @@ class CityGrid:
                     if below_cell in other.cells:
                         other.current_hp -= cascade_damage
                         if other.current_hp <= 0:
+                            PROFILER.count('cascade')
                             self.destroy_building(other.id)
                         break
 
@@ -599,6 +606,10 @@ class CityGrid:
                 return building
         return None
 
+    def get_building(self, building_id: int) -> Optional[Building]:
+        """Get building by ID"""
+        return next((b for b in self.buildings if b.id == building_id), None)
+
 # --- Constants ---
 SCREEN_WIDTH = 1600
 SCREEN_HEIGHT = 720
@@ -615,8 +626,20 @@ GRID_START_X = (PLAYABLE_WIDTH - GRID_WIDTH) // 2  # Should be 10
 GROUND_Y = 620  # Moved down to make room for log
 SHIELD_Y = 300  # Lowered slightly
 
+class Interpolated:
+    """Mixin for moving entities: position at the start of the current tick (render interpolation).
+
+    Plain attributes rather than dataclass fields, so they stay out of the
+    constructor, comparisons and rewind frames.
+    """
+    prev_x: Optional[float] = None # Class defaults cover entities pickled before it existed
+    prev_y: Optional[float] = None
+
+    def __post_init__(self):
+        self.prev_x, self.prev_y = self.x, self.y
+
 @dataclass
-class GroundUnit:
+class GroundUnit(Interpolated):
     x: float
     y: float
     team: str  # "invader" or "defender"
@@ -627,9 +650,10 @@ class GroundUnit:
     target: Optional[object] = None # Building or GroundUnit
     attack_cooldown: float = 0.0
     alive: bool = True
+    source_id: Optional[int] = None # Barracks that spawned a defender
 
 @dataclass
-class Drone:
+class Drone(Interpolated):
     x: float
     y: float
     vx: float
@@ -644,9 +668,10 @@ class Drone:
     target: Optional['Enemy'] = None
     cooldown: float = 0.0
     alive: bool = True
+    source_id: Optional[int] = None # Drone factory that launched it
 
 @dataclass
-class Enemy:
+class Enemy(Interpolated):
     x: float
     y: float  # starts above shield
     vx: float = 0
@@ -660,7 +685,7 @@ class Enemy:
     is_boss: bool = False
 
 @dataclass
-class Projectile:
+class Projectile(Interpolated):
     x: float
     y: float
     vx: float
@@ -670,6 +695,7 @@ class Projectile:
     alive: bool = True
     source: str = "turret"  # or "enemy"
     target: Optional[Enemy] = None
+    source_id: Optional[int] = None # Building credited with kills (drone shots: the drone's factory)
     max_range: float = 0
     distance_traveled: float = 0
 
@@ -684,6 +710,9 @@ class Wave:
         """Calculate enemies for this wave"""
         return 5 + (self.wave_number * 2)  # scales with wave number
 
+# Who deals damage to enemies and invaders (CombatManager.damage_dealt)
+DAMAGE_SOURCES = ('turret', 'drone', 'defender')
+
 class CombatManager:
     def __init__(self, game_state):
         self.state = game_state
@@ -694,10 +723,25 @@ class CombatManager:
         self.current_wave: Optional[Wave] = None
         self.wave_complete_timer: float = 0
         self.damage_taken_this_wave: bool = False
+        self.damage_dealt: Dict[str, int] = dict.fromkeys(DAMAGE_SOURCES, 0) # This wave, by source
+        self.kills: Dict[int, int] = {} # This wave: building id -> enemies and invaders killed
+        self.invaders_spawned: int = 0 # This wave
+        self.effects: List[Tuple[str, float, float, float]] = [] # Visual events (kind, x, y, size) for this tick
+        
+    def __setstate__(self, state):
+        # Older saves predate the effects list
+        self.__dict__.update(state)
+        self.__dict__.setdefault('effects', [])
+        self.__dict__.setdefault('damage_dealt', dict.fromkeys(DAMAGE_SOURCES, 0))
+        self.__dict__.setdefault('kills', {})
+        self.__dict__.setdefault('invaders_spawned', 0)
         
     def start_wave(self):
         """Initialize new wave"""
         self.damage_taken_this_wave = False
+        self.damage_dealt = dict.fromkeys(DAMAGE_SOURCES, 0)
+        self.kills = {}
+        self.invaders_spawned = 0
         self.current_wave = Wave(
             wave_number=self.state.wave,
             enemies_remaining=0
@@ -748,7 +792,7 @@ class CombatManager:
         spawn_start = max(0, start - 2)
         spawn_end = min(self.state.grid.max_columns, end + 2)
         
-        slot = random.randint(spawn_start, spawn_end - 1)
+        slot = self.state.rng.randint(spawn_start, spawn_end - 1)
         x = GRID_START_X + slot * GRID_SLOT_WIDTH + GRID_SLOT_WIDTH / 2
         
         # Scale HP with wave number
@@ -767,6 +811,10 @@ class CombatManager:
         """Main combat update loop"""
         if not self.current_wave:
             return
+        
+        PROFILER.begin('tick')
+        # Remember where everything was so the renderer can interpolate
+        self.store_previous_positions()
             
         # Spawn enemies
         if self.current_wave.enemies_remaining > 0:
@@ -780,33 +828,43 @@ class CombatManager:
                     
                 self.current_wave.enemies_remaining -= 1
                 self.current_wave.spawn_timer = 0
+        PROFILER.lap('tick', 'spawning')
         
         # Update enemies
         self.update_enemies(dt)
+        PROFILER.lap('tick', 'enemies')
         
         # Update ground units
         self.update_ground_units(dt)
+        PROFILER.lap('tick', 'ground_units')
         
         # Turrets fire
         self.update_turrets(dt)
+        PROFILER.lap('tick', 'turrets')
         
         # Barracks produce
         self.update_barracks(dt)
+        PROFILER.lap('tick', 'barracks')
 
         # Drone Factories produce and Drones act
         self.update_drones(dt)
+        PROFILER.lap('tick', 'drones')
         
         # Update projectiles
         self.update_projectiles(dt)
+        PROFILER.lap('tick', 'projectiles')
         
         # Check collisions
         self.check_collisions()
+        PROFILER.lap('tick', 'collisions')
         
         # Clean up dead entities
         self.enemies = [e for e in self.enemies if e.alive]
         self.projectiles = [p for p in self.projectiles if p.alive]
         self.ground_units = [u for u in self.ground_units if u.alive]
         self.drones = [d for d in self.drones if d.alive]
+        PROFILER.lap('tick', 'cleanup')
+        PROFILER.end('tick')
         
         # Check wave completion
         invaders_alive = any(u.team == "invader" and u.alive for u in self.ground_units)
@@ -819,6 +877,13 @@ class CombatManager:
             if self.wave_complete_timer >= 2.0:  # 2 second delay before build phase
                 self.end_wave()
     
+    def store_previous_positions(self):
+        """Record current positions as the previous simulation state"""
+        for entities in (self.enemies, self.projectiles, self.drones, self.ground_units):
+            for entity in entities:
+                entity.prev_x = entity.x
+                entity.prev_y = entity.y
+
     def explode_enemy(self, enemy, x, y):
         """Handle enemy explosion with AOE damage"""
         blast_radius = 50  # Approx 50-100 range diameter
@@ -854,6 +919,7 @@ class CombatManager:
                     self.state.grid.destroy_building(building.id)
             self.state.update_economy()
         
+        self.effects.append(('explosion', x, y, blast_radius))
         enemy.alive = False
 
     def update_enemies(self, dt):
@@ -905,7 +971,7 @@ class CombatManager:
         """Spawn invader ground units"""
         for _ in range(count):
             # Add slight offset so they don't stack perfectly
-            offset = random.randint(-15, 15)
+            offset = self.state.rng.randint(-15, 15)
             invader = GroundUnit(
                 x=x + offset,
                 y=GROUND_Y,
@@ -916,6 +982,7 @@ class CombatManager:
                 speed=45
             )
             self.ground_units.append(invader)
+        self.invaders_spawned += count
         self.state.add_log(f"{count} Ground Invaders Spawned!")
 
     def update_ground_units(self, dt):
@@ -1064,8 +1131,10 @@ class CombatManager:
                                 pass # Defenders don't attack buildings
                             else:
                                 target.hp -= unit.damage
+                                self.damage_dealt['defender'] += unit.damage
                                 if target.hp <= 0:
                                     target.alive = False
+                                    self.credit_kill(unit.source_id)
                                     self.state.add_log("Invader neutralized.")
                             unit.attack_cooldown = 1.0
                 else:
@@ -1143,7 +1212,8 @@ class CombatManager:
                             range=building.template.range,
                             speed=150,
                             home_x=bx,
-                            home_y=by - 50 # Hover point
+                            home_y=by - 50, # Hover point
+                            source_id=building.id
                         )
                         self.drones.append(drone)
                         current_drones += 1
@@ -1199,7 +1269,8 @@ class CombatManager:
                                            damage=drone.damage, 
                                            max_range=drone.range * 1.5,
                                            speed=400,
-                                           source="drone") # Fast drone shots
+                                           source="drone", # Fast drone shots
+                                           source_id=drone.source_id)
                         drone.cooldown = 0.8
             else:
                 # Return home
@@ -1253,7 +1324,8 @@ class CombatManager:
                             hp=40 * building.template.level,
                             max_hp=40 * building.template.level,
                             damage=8 * building.template.level,
-                            speed=60
+                            speed=60,
+                            source_id=building.id
                         )
                         self.ground_units.append(defender)
                         current_defenders += 1 # Increment local count to prevent overspawn in same frame
@@ -1282,7 +1354,8 @@ class CombatManager:
                         self.fire_projectile(turret_x, turret_y, target, 
                                              damage=building.template.damage, 
                                              max_range=building.template.ammo_range,
-                                             speed=building.template.projectile_speed)
+                                             speed=building.template.projectile_speed,
+                                             source_id=building.id)
                         building.cooldown = building.template.cooldown
     
     def find_nearest_enemy(self, x, y, max_range=600):
@@ -1298,7 +1371,8 @@ class CombatManager:
         
         return nearest
     
-    def fire_projectile(self, from_x, from_y, target, damage=25, max_range=0, speed=300, source="turret"):
+    def fire_projectile(self, from_x, from_y, target, damage=25, max_range=0, speed=300, source="turret",
+                        source_id=None):
         """Create projectile aimed at target"""
         dx = target.x - from_x
         dy = target.y - from_y
@@ -1319,7 +1393,8 @@ class CombatManager:
             damage=damage,
             target=target,
             max_range=max_range,
-            source=source
+            source=source,
+            source_id=source_id
         )
         self.projectiles.append(projectile)
     
@@ -1353,6 +1428,7 @@ class CombatManager:
                 dist = ((proj.x - enemy.x)**2 + (proj.y - enemy.y)**2)**0.5
                 if dist < (proj.radius + enemy.radius):
                     enemy.current_hp -= proj.damage
+                    self.damage_dealt[proj.source] += proj.damage
                     proj.alive = False
                     
                     if proj.source == "drone":
@@ -1361,6 +1437,8 @@ class CombatManager:
 
                     if enemy.current_hp <= 0:
                         enemy.alive = False
+                        self.credit_kill(proj.source_id)
+                        self.effects.append(('explosion', enemy.x, enemy.y, enemy.radius))
                         self.state.credits += 10
                         self.state.add_log(f"Enemy destroyed! +10 Credits")
                     break
@@ -1383,6 +1461,7 @@ class CombatManager:
                     if self.state.shield_current_hp > 0:
                         self.state.shield_current_hp -= enemy.damage
                         self.state.add_log(f"Shield hit! -{enemy.damage} HP")
+                        self.effects.append(('shield_hit', enemy.x, SHIELD_Y, enemy.radius))
                         enemy.alive = False
                         
                         if self.state.shield_current_hp <= 0:
@@ -1415,6 +1494,10 @@ class CombatManager:
             if hit_any:
                 self.explode_enemy(enemy, enemy.x, enemy.y)
     
+    def credit_kill(self, building_id: Optional[int]):
+        if building_id is not None:
+            self.kills[building_id] = self.kills.get(building_id, 0) + 1
+
     def end_wave(self):
         """Transition back to build phase"""
         base_reward = 100 + (self.current_wave.wave_number * 25)
@@ -1450,6 +1533,33 @@ class WaveRewards:
     repair_cost: int
     total: int
 
+class BuildingRecord(NamedTuple):
+    id: int
+    type: BuildingType
+    level: int
+    current_hp: int
+    column: int
+    row: int
+    spawn_timer: float
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    """Compact, immutable copy of the persistent parts of a GameState (retry points)"""
+    credits: int
+    wave: int
+    phase: str
+    unlocked_start: int
+    unlocked_width: int
+    next_building_id: int
+    buildings: Tuple[BuildingRecord, ...]
+    shield_current_hp: float
+    shield_is_active: bool
+    selected_column: int
+    selected_row: int
+    last_wave_rewards: Optional[WaveRewards]
+    rng_state: tuple
+    playtime: float = 0.0
+
 @dataclass
 class GameState:
     credits: int = 300
@@ -1467,6 +1577,8 @@ class GameState:
     last_wave_rewards: Optional[WaveRewards] = None
     logs: List[str] = field(default_factory=list)
     shield_is_active: bool = True
+    playtime: float = 0.0 # Seconds of unpaused play
+    rng: random.Random = field(default_factory=random.Random, repr=False, compare=False) # All gameplay randomness
     
     def __post_init__(self):
         if self.grid is None:
@@ -1474,6 +1586,61 @@ class GameState:
         if self.combat is None:
             self.combat = CombatManager(self)
     
+    def __setstate__(self, state):
+        # Older saves predate the per-game RNG and playtime
+        self.__dict__.update(state)
+        if 'rng' not in state:
+            self.rng = random.Random()
+        self.__dict__.setdefault('playtime', 0.0)
+    
+    def snapshot(self) -> StateSnapshot:
+        """Capture a retry point. Derived stats (energy, shield max) are recomputed on restore."""
+        grid = self.grid
+        return StateSnapshot(
+            credits=self.credits,
+            wave=self.wave,
+            phase=self.phase,
+            unlocked_start=grid.unlocked_start,
+            unlocked_width=grid.unlocked_width,
+            next_building_id=grid.next_building_id,
+            buildings=tuple(
+                BuildingRecord(b.id, b.template.type, b.template.level, b.current_hp, b.column, b.row, b.spawn_timer)
+                for b in grid.buildings
+            ),
+            shield_current_hp=self.shield_current_hp,
+            shield_is_active=self.shield_is_active,
+            selected_column=self.selected_column,
+            selected_row=self.selected_row,
+            last_wave_rewards=self.last_wave_rewards,
+            rng_state=self.rng.getstate(),
+            playtime=self.playtime
+        )
+    
+    def restore(self, snapshot: StateSnapshot):
+        """Rewind to a retry point. Combat is reset; the message log and playtime are kept."""
+        self.credits = snapshot.credits
+        self.wave = snapshot.wave
+        self.phase = snapshot.phase
+        self.selected_column = snapshot.selected_column
+        self.selected_row = snapshot.selected_row
+        self.last_wave_rewards = snapshot.last_wave_rewards
+        self.rng.setstate(snapshot.rng_state)
+        
+        grid = self.grid
+        grid.unlocked_start = snapshot.unlocked_start
+        grid.unlocked_width = snapshot.unlocked_width
+        grid.next_building_id = snapshot.next_building_id
+        grid.buildings = [
+            Building(id=r.id, template=get_building_template(r.type, r.level), current_hp=r.current_hp,
+                     column=r.column, row=r.row, spawn_timer=r.spawn_timer)
+            for r in snapshot.buildings
+        ]
+        self.combat = CombatManager(self)
+        
+        self.update_economy()
+        self.shield_current_hp = min(snapshot.shield_current_hp, self.shield_max_hp)
+        self.shield_is_active = snapshot.shield_is_active
+    
     def add_log(self, message: str):
         """Add a message to the persistent log"""
         self.logs.append(message)
@@ -1486,6 +1653,7 @@ class GameState:
     
     def update_economy(self):
         """Recalculate energy and shield stats"""
+        PROFILER.count('update_economy')
         self.energy_production = 0
         self.energy_consumption = 0
         self.shield_max_hp = 0
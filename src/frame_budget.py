@@ -0,0 +1,54 @@
+class FrameBudget:
+    """Steps visual detail down when frames run over budget and back up when there is headroom.
+
+    Levels are cumulative: each one keeps the savings of the levels below it.
+    """
+
+    FULL = 0
+    NO_HP_BARS = 1 # Skip HP bars on regular enemies, drones and ground units
+    THIN_PROJECTILES = 2 # Draw every other projectile (alternating each frame)
+    FROZEN_LOG = 3 # Stop re-rendering the message log
+    LEVEL_NAMES = ["Full", "No HP Bars", "Thin Projectiles", "Frozen Log"]
+
+    def __init__(self, budget_ms: float, downgrade_after: int = 15, upgrade_after: int = 120,
+                 headroom: float = 0.6, smoothing: float = 0.1):
+        self.budget_ms = budget_ms
+        self.downgrade_after = downgrade_after # Consecutive slow frames before stepping down
+        self.upgrade_after = upgrade_after # Consecutive fast frames before stepping back up
+        self.headroom = headroom # Fraction of the budget that counts as "fast"
+        self.smoothing = smoothing
+        self.level = self.FULL
+        self.update_ms = 0.0 # Smoothed per-frame costs
+        self.draw_ms = 0.0
+        self.over_frames = 0
+        self.under_frames = 0
+
+    @property
+    def frame_ms(self) -> float:
+        return self.update_ms + self.draw_ms
+
+    @property
+    def level_name(self) -> str:
+        return self.LEVEL_NAMES[self.level]
+
+    def record(self, update_ms: float, draw_ms: float):
+        """Feed one frame's measured costs and adjust the quality level"""
+        self.update_ms += (update_ms - self.update_ms) * self.smoothing
+        self.draw_ms += (draw_ms - self.draw_ms) * self.smoothing
+        total = self.frame_ms
+
+        if total > self.budget_ms:
+            self.over_frames += 1
+            self.under_frames = 0
+            if self.over_frames >= self.downgrade_after and self.level < self.FROZEN_LOG:
+                self.level += 1
+                self.over_frames = 0
+        elif total < self.budget_ms * self.headroom:
+            self.under_frames += 1
+            self.over_frames = 0
+            if self.under_frames >= self.upgrade_after and self.level > self.FULL:
+                self.level -= 1
+                self.under_frames = 0
+        else:
+            self.over_frames = 0
+            self.under_frames = 0
@@ -0,0 +1,105 @@
+import gc
+import time
+
+from src.profiler import PROFILER
+
+# Thresholds while a wave runs: young collections a few times less often, so
+# the per-shot dataclass churn doesn't trigger a collection every few ticks
+COMBAT_THRESHOLDS = (5000, 20, 100)
+
+class GCMonitor:
+    """Times every garbage collection through gc.callbacks.
+
+    Keeps running totals per generation (collections, pause ms, longest
+    pause) and, while the profiler is enabled, adds each pause to its 'gc'
+    task so the F4 overlay shows them.
+    """
+
+    def __init__(self):
+        self.started = 0.0
+        self.collections = [0, 0, 0]
+        self.pause_ms = [0.0, 0.0, 0.0] # Total per generation
+        self.longest_ms = [0.0, 0.0, 0.0]
+
+    def install(self):
+        if self.callback not in gc.callbacks:
+            gc.callbacks.append(self.callback)
+
+    def uninstall(self):
+        if self.callback in gc.callbacks:
+            gc.callbacks.remove(self.callback)
+
+    def callback(self, phase: str, info: dict):
+        if phase == 'start':
+            self.started = time.perf_counter()
+            return
+        ms = (time.perf_counter() - self.started) * 1000
+        generation = info['generation']
+        self.collections[generation] += 1
+        self.pause_ms[generation] += ms
+        self.longest_ms[generation] = max(self.longest_ms[generation], ms)
+        if PROFILER.enabled:
+            PROFILER.add('gc', f"gen{generation}", ms)
+
+# Shared instance, installed by the game
+GC_MONITOR = GCMonitor()
+
+class GCPolicy:
+    """Opt-in collection schedule (--gc-tuning), registered as a simulation listener.
+
+    Waves start with a full collection, after which everything alive (the
+    city, templates, assets) is frozen out of the collector's reach and the
+    thresholds are raised, so collections during combat only scan combat-era
+    objects and run less often. When the wave ends (or the base falls) the
+    thresholds are restored, everything is unfrozen and collected in the
+    build phase, where a pause goes unnoticed. Going back to the main menu
+    or starting a new game does the same; loading one also freezes the
+    loaded city. MemoryMonitor's object counts thaw frozen objects for the
+    walk and refreeze everything after it.
+    """
+
+    def __init__(self, combat_thresholds=COMBAT_THRESHOLDS):
+        self.combat_thresholds = combat_thresholds
+        self.normal_thresholds = gc.get_threshold()
+        self.in_combat = False
+        self.frozen = False # Objects were frozen by this policy
+
+    def after_load(self):
+        """Leave any wave the previous game was in, then collect and freeze the loaded city"""
+        collected = self.frozen # end_combat collects after unfreezing
+        self.end_combat()
+        if not collected:
+            gc.collect()
+        self.freeze()
+
+    def on_wave_start(self, state):
+        if not self.in_combat:
+            self.normal_thresholds = gc.get_threshold()
+        self.in_combat = True
+        gc.collect()
+        self.freeze()
+        gc.set_threshold(*self.combat_thresholds)
+
+    def on_wave_complete(self, state):
+        self.end_combat()
+
+    def on_game_over(self, state):
+        self.end_combat()
+
+    def on_rewind(self, state, ticks: int):
+        if not self.in_combat: # Rewound from the Game Over screen
+            self.on_wave_start(state)
+
+    def freeze(self):
+        gc.freeze()
+        self.frozen = True
+
+    def end_combat(self):
+        """Restore the thresholds, unfreeze and collect; does nothing if already done"""
+        if self.in_combat:
+            self.in_combat = False
+            gc.set_threshold(*self.normal_thresholds)
+        if self.frozen:
+            self.frozen = False
+            gc.unfreeze()
+            gc.collect()
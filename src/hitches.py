@@ -0,0 +1,155 @@
+import gc
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from src.gc_control import GC_MONITOR
+from src.profiler import PROFILER, PROFILE_DIR
+
+HITCH_LOG = os.path.join(PROFILE_DIR, "hitches.jsonl")
+HITCH_THRESHOLD_MS = 50.0
+HITCH_LOG_BYTES = 1024 * 1024 # Rotate the log past this size
+HITCH_LOG_BACKUPS = 3 # hitches.jsonl.1 ... .3
+
+class HitchWatchdog:
+    """Records frames that take longer than ``threshold_ms`` to a JSONL log.
+
+    The game calls frame_started() and frame_finished() around every active
+    frame. A watchdog thread waits for each frame to finish; if it is still
+    running after the threshold, the thread grabs every thread's stack right
+    then, so the record shows what the frame was stuck in. Slow frames are
+    logged with the profiler's section timings, entity counts, building
+    cascades, economy updates and garbage collections of that frame. The
+    watchdog thread also does the (rotating) log writes.
+    """
+
+    def __init__(self, path: str = HITCH_LOG, threshold_ms: float = HITCH_THRESHOLD_MS,
+                 max_bytes: int = HITCH_LOG_BYTES, backups: int = HITCH_LOG_BACKUPS):
+        self.path = path
+        self.threshold_ms = threshold_ms
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.jobs = queue.SimpleQueue() # Frame ids to watch, records to write, None to stop
+        self.done = threading.Event() # Set when the watched frame finishes
+        self.frame_id = 0
+        self.stacks = None # (frame id, {thread name: stack lines}) grabbed by the watchdog
+        self.started_at = 0.0
+        self.start_tick = 0
+        self.gc_stats = None
+        self.gc_pause_ms = None
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            PROFILER.set_enabled(True) # Section timings and event counts for the records
+            self.thread = threading.Thread(target=self.run, name="hitch-watchdog", daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Write pending records and stop the watchdog"""
+        if self.thread is not None:
+            self.done.set()
+            self.jobs.put(None)
+            self.thread.join(timeout)
+            self.thread = None
+
+    def frame_started(self, tick: int):
+        self.frame_id += 1
+        self.done.clear()
+        self.started_at = time.perf_counter()
+        self.start_tick = tick
+        self.gc_stats = gc.get_stats()
+        self.gc_pause_ms = list(GC_MONITOR.pause_ms)
+        PROFILER.take_events()
+        self.jobs.put(self.frame_id)
+
+    def frame_finished(self, game, update_ms: float, draw_ms: float) -> Optional[dict]:
+        """Log the frame if it was slow. Returns the record, if any."""
+        self.done.set()
+        frame_ms = (time.perf_counter() - self.started_at) * 1000
+        if frame_ms < self.threshold_ms:
+            return None
+        stacks = self.stacks
+        snap = game.sim.snapshot
+        ticks = game.sim.tick - self.start_tick
+        record = {
+            'time': round(time.time(), 3),
+            'frame': game.frame_count,
+            'ticks': ticks, # Simulation ticks during the frame
+            'frame_ms': round(frame_ms, 2),
+            'update_ms': round(update_ms, 2),
+            'draw_ms': round(draw_ms, 2),
+            'threshold_ms': self.threshold_ms,
+            'quality': game.frame_budget.level_name,
+            'sections': {
+                'tick': _rounded(PROFILER.recent('tick', max(1, ticks))), # Slowest of this frame's ticks
+                'draw': _rounded(PROFILER.recent('draw')),
+            },
+            'events': PROFILER.take_events(), # destroy_building, cascade, update_economy
+            'gc': self.gc_activity(),
+            'stacks': stacks[1] if stacks and stacks[0] == self.frame_id else None,
+        }
+        if snap is not None:
+            record.update(
+                tick=snap.tick, phase=snap.phase, wave=snap.wave,
+                entities={'enemies': len(snap.enemies), 'projectiles': len(snap.projectiles),
+                          'ground_units': len(snap.ground_units), 'drones': len(snap.drones),
+                          'buildings': len(snap.buildings)})
+        self.jobs.put(record)
+        return record
+
+    def gc_activity(self) -> dict:
+        """Collections and pause time per generation during the frame, and what they freed"""
+        before, after = self.gc_stats, gc.get_stats()
+        return {
+            'collections': [a['collections'] - b['collections'] for a, b in zip(after, before)],
+            'collected': sum(a['collected'] - b['collected'] for a, b in zip(after, before)),
+            'pause_ms': [round(a - b, 3) for a, b in zip(GC_MONITOR.pause_ms, self.gc_pause_ms)],
+            'uncollectable': sum(a['uncollectable'] - b['uncollectable'] for a, b in zip(after, before)),
+            'pending': gc.get_count(),
+        }
+
+    # --- Watchdog thread ---
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            if isinstance(job, dict):
+                self.write(job)
+            elif job == self.frame_id and not self.done.wait(self.threshold_ms / 1000):
+                self.stacks = (job, self.grab_stacks())
+
+    def grab_stacks(self) -> dict:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        own = threading.get_ident()
+        return {names.get(ident, str(ident)): traceback.format_stack(frame)
+                for ident, frame in sys._current_frames().items() if ident != own}
+
+    def write(self, record: dict):
+        line = json.dumps(record) + "\n"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if os.path.exists(self.path) and os.path.getsize(self.path) + len(line) > self.max_bytes:
+                self.rotate()
+            with open(self.path, "a") as f:
+                f.write(line)
+        except OSError as e:
+            print(f"Hitch log error: {e}")
+
+    def rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+def _rounded(sections: dict) -> dict:
+    return {name: round(ms, 3) for name, ms in sections.items()}
@@ -2,13 +2,36 @@ import pygame
 import sys
 import random
 import math
-import copy
-import pickle
 import os
+import queue
+import threading
+import time
+from contextlib import nullcontext
 from src.core_data import GameState, BuildingType, BuildingCategory, get_building_template, Building, Enemy, Projectile, GRID_START_X, GRID_SLOT_WIDTH, GRID_CELL_HEIGHT, GROUND_Y, SHIELD_Y, SCREEN_WIDTH, SCREEN_HEIGHT, UI_WIDTH, MAX_COLS
+from src.presentation import Presenter
+from src.sprites import SpriteCache
+from src.assets import AssetManager, BUILDING_COLORS
+from src.simulation import Simulation, ThreadedSimulation
+from src.frame_budget import FrameBudget
+from src.particles import ParticleSystem
+from src.overlays import OverlayPool
+from src.profiler import PROFILER, BUCKETS, CAPTURE_MODES
+from src.hitches import HitchWatchdog, HITCH_THRESHOLD_MS
+from src.memory import MemoryMonitor, COUNT_INTERVAL
+from src.gc_control import GC_MONITOR, GCPolicy
+from src.telemetry import TelemetrySink
+from src.results import WaveResults
+from src.savegame import read_save, state_from_snapshot
+from src.autosave import AutosaveService
+from src.saveslots import SaveIndex, SAVE_DIR, SLOT_FILES, AUTOSAVE_FILE, THUMBNAIL_CODES
+from src.commands import apply_command
+from src.replay import ReplayPlayer, ReplayRecorder, session_replay_path, write_replay
 
 # Constants
 FPS = 60
+SIM_RATE = 30 # Fixed simulation ticks per second (rendering interpolates in between)
+SIM_DT = 1.0 / SIM_RATE
+MAX_SIM_STEPS = 5 # Cap catch-up ticks per frame so a slow frame can't snowball
 
 # Layout Constants
 # We use constants from core_data
@@ -16,6 +39,10 @@ GRID_WIDTH = GRID_SLOT_WIDTH * MAX_COLS
 PLAYABLE_WIDTH = SCREEN_WIDTH - UI_WIDTH
 UI_START_X = PLAYABLE_WIDTH
 
+# Presentation regions (virtual screen coordinates)
+PLAYFIELD_RECT = pygame.Rect(0, 0, PLAYABLE_WIDTH, SCREEN_HEIGHT)
+HUD_RECT = pygame.Rect(UI_START_X, 0, UI_WIDTH, SCREEN_HEIGHT)
+
 # Colors
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -26,13 +53,44 @@ BLUE = (0, 100, 255)
 YELLOW = (255, 255, 0)
 DARK_GRAY = (50, 50, 50)
 
+IDLE_TIMEOUT_MS = 1000 # Longest an idle frame waits for input
+REWIND_STEP = 5.0 # Seconds of combat undone per rewind key press
+PROFILER_REFRESH_FRAMES = 15 # Profiler overlay numbers update every N frames
+
+# Posted from other threads (new snapshot, message) to wake the idle loop
+WAKE_EVENT = pygame.event.custom_type()
+
+# Message colors for simulation notifications
+TONE_COLORS = {'success': GREEN, 'alert': RED, 'warning': YELLOW}
+
 class Game:
-    def __init__(self):
+    def __init__(self, threaded_sim=True, record_replay=None, profile_mode=None, hitch_log=None,
+                 hitch_ms=HITCH_THRESHOLD_MS, memory_monitor=False, gc_tuning=False,
+                 telemetry=None, telemetry_every=1, results_db=None):
         pygame.init()
         # Create the actual display window (resizable)
         self.display_surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
-        # Create the virtual screen surface (fixed resolution)
-        self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        # Virtual screen (fixed resolution). At 1:1 this is a view into the window itself.
+        self.presenter = Presenter(self.display_surface)
+        self.screen = self.presenter.screen
+        self.presented_keys = None # Region keys of the last presented frame
+        self.assets = AssetManager() # Sprite atlas, loaded in the background
+        self.assets.start_loading()
+        self.sprites = SpriteCache(self.assets) # Pre-rendered entity sprites
+        self.particles = ParticleSystem(sprites=self.sprites) # Explosions and shield impacts
+        self.pending_effects = queue.SimpleQueue() # Effect batches posted by the simulation
+        self.frame_budget = FrameBudget(1000.0 / FPS) # Adaptive visual quality
+        self.frame_count = 0
+        self.frozen_log = None # Cached message log while the log is frozen
+        self.show_debug = False # F3 debug overlay
+        self.debug_lines = []
+        self.show_profiler = False # F4 tick/draw profiler overlay
+        self.profiler_lines = [] # (text, histogram) rows, refreshed a few times per second
+        self.hitches = None # Slow frame log (--hitch-log)
+        if hitch_log:
+            self.hitches = HitchWatchdog(hitch_log, hitch_ms)
+        self.idle = False # Waiting for events instead of running the frame loop
+        self.render_alpha = 1.0 # Blend factor between previous and current sim state
         
         pygame.display.set_caption("Skyguard: Cell Defense")
         self.clock = pygame.time.Clock()
@@ -40,6 +98,34 @@ class Game:
         self.fullscreen = False
         
         self.menu_state = "MAIN_MENU" # MAIN_MENU, PLAYING, PAUSED
+        
+        # The simulation owns the GameState; the renderer reads its snapshots
+        sim_class = ThreadedSimulation if threaded_sim else Simulation
+        self.sim = sim_class(SIM_DT, MAX_SIM_STEPS, notify=self.notify,
+                             is_active=lambda: self.menu_state == "PLAYING")
+        # Playtime follows the wall clock: an idle build phase doesn't tick at all
+        self.sim.tick_playtime = False
+        self.sim.add_listener(self)
+        self.sim.profile_mode = profile_mode # --profile-wave: cProfile every wave
+        self.memory = None # tracemalloc checkpoints per wave (--memory-monitor)
+        if memory_monitor:
+            self.memory = MemoryMonitor()
+            self.memory.start()
+            self.sim.add_listener(self.memory)
+        GC_MONITOR.install() # Collection pauses for the F4 overlay and hitch log
+        self.gc_policy = None # Freeze/collect around waves (--gc-tuning)
+        if gc_tuning:
+            self.gc_policy = GCPolicy()
+            self.sim.add_listener(self.gc_policy)
+        self.telemetry = None # Per-tick combat stats stream (--telemetry)
+        if telemetry:
+            self.telemetry = TelemetrySink(telemetry, telemetry_every)
+            self.sim.add_listener(self.telemetry)
+        self.results = None # Per-wave summary rows in SQLite (--results-db)
+        if results_db:
+            self.results = WaveResults(results_db)
+            self.sim.add_listener(self.results)
+        self.snapshot = None # Snapshot being drawn this frame
         self.state = None # Initialized on New Game
         
         self.main_menu_selection = 0 # Index for main menu navigation
@@ -49,130 +135,328 @@ class Game:
         self.building_menu_selection = 0
         self.build_menu_selection = 0 # Index of selected building in build menu
         self.messages = [] # List of (text, color, timer)
+        self.pending_messages = queue.SimpleQueue() # Filled from any thread, drained each frame
         self.moving_building_id = None
         self.unlock_cost = 1000
         self.confirm_upgrade_id = None # ID of building waiting for upgrade confirmation
         self.confirm_build_type = None # Type of building waiting for build confirmation
         self.confirm_wave_start = False # Waiting for wave start confirmation
-        self.game_over = False
-        self.saved_state = None # Save initial state for retry
-        
-        self.font = pygame.font.Font(None, 24)
-        self.font_large = pygame.font.Font(None, 36)
-        self.font_title = pygame.font.Font(None, 72)
+        self.saved_state = None # StateSnapshot at the start of the build phase (for retry)
+        self.save_index = SaveIndex() # Slot metadata for the load menu
+        self.autosave = AutosaveService(self.report_save, self.save_index) # Writes saves off the main thread
+        self.current_slot = SLOT_FILES[0] # Slot that [S] saves to
+        self.show_load_menu = False
+        self.load_menu_selection = 0
+        self.save_slots = [] # (filename, metadata or None), read from the index when the menu opens
+        self.thumbnails = {} # (filename, timestamp) -> rendered grid thumbnail
+        self.record_replay = record_replay # Replay file path, if sessions are being recorded
+        self.recorder = None # ReplayRecorder for the current session
+        self.replay_paths = [] # Replay file of each recorded session, latest last
+        self.replay_player = None # ReplayPlayer when watching a replay
+        self.replay_speed = 1.0
+        self.replay_reported = False
+        
+        self.overlays = OverlayPool() # Reused overlay surfaces and cached text
+        self.font = self.overlays.font(24)
+        self.font_large = self.overlays.font(36)
+        self.font_title = self.overlays.font(72)
+
+    @property
+    def state(self):
+        return self.sim.state
+
+    @state.setter
+    def state(self, value):
+        self.sim.state = value
+
+    @property
+    def game_over(self):
+        return self.sim.game_over
+
+    @game_over.setter
+    def game_over(self, value):
+        self.sim.game_over = value
 
     def new_game(self):
         """Start a fresh game"""
+        self.stop_recording() # Finish the previous session against its own state
         self.state = GameState()
         # Ensure grid is initialized
         if self.state.grid is None:
             from src.core_data import CityGrid
             self.state.grid = CityGrid()
+        seed = random.randrange(2 ** 32)
+        self.state.rng.seed(seed)
         
         self.menu_state = "PLAYING"
         self.game_over = False
-        self.messages = []
-        self.saved_state = copy.deepcopy(self.state)
+        self.clear_messages()
+        self.saved_state = self.state.snapshot()
+        self.start_recording(seed)
+        if self.results is not None:
+            self.results.new_run()
+        if self.gc_policy is not None:
+            self.gc_policy.end_combat() # The menu can abandon a wave mid-combat
         self.add_message("System Online. Good luck, Commander.", GREEN)
 
-    def save_game(self, filename="savegame.dat"):
-        """Save current state to file"""
+    def save_game(self, filename=None):
+        """Save current state to a slot (default: the current slot)"""
         try:
-            path = os.path.join("saves", filename)
-            with open(path, "wb") as f:
-                pickle.dump(self.state, f)
-            self.add_message("Game Saved", GREEN)
+            filename = filename or self.current_slot
+            self.current_slot = filename
+            path = os.path.join(SAVE_DIR, filename)
+            label = f"Game Saved (Slot {SLOT_FILES.index(filename) + 1})"
+            if self.state.phase == "build" or self.saved_state is None:
+                queued = self.autosave.submit(path, self.state.snapshot(), label)
+            else:
+                # Combat entities are not saved: store the start of this wave
+                queued = self.autosave.submit(path, self.saved_state, f"{label} - start of wave")
+            if not queued:
+                self.add_message("Save Failed: still writing earlier saves, try again", RED)
         except Exception as e:
             self.add_message(f"Save Failed: {e}", RED)
             print(f"Save error: {e}")
 
-    def load_game(self, filename="savegame.dat"):
+    def load_game(self, filename=SLOT_FILES[0]):
         """Load state from file"""
         try:
-            path = os.path.join("saves", filename)
+            path = os.path.join(SAVE_DIR, filename)
             if not os.path.exists(path):
                 return False
                 
-            with open(path, "rb") as f:
-                self.state = pickle.load(f)
+            snapshot = read_save(path)
+            self.stop_recording() # Finish the previous session against its own state
+            self.state = state_from_snapshot(snapshot)
             
             self.menu_state = "PLAYING"
             self.game_over = False
-            self.messages = []
-            self.saved_state = copy.deepcopy(self.state) # Update retry point? Or keep original?
+            self.clear_messages()
+            if filename in SLOT_FILES:
+                self.current_slot = filename
+            self.saved_state = snapshot # Update retry point? Or keep original?
             # Actually, loading a save should probably not reset the retry point unless we save that too.
             # But for now, let's just let it be.
+            self.start_recording()
+            if self.results is not None:
+                self.results.new_run()
+            if self.gc_policy is not None:
+                self.gc_policy.after_load()
             self.add_message("Game Loaded", GREEN)
             return True
         except Exception as e:
             print(f"Load error: {e}")
             return False
+
+    def start_recording(self, seed=None):
+        """Begin recording a new session's commands (if --record-replay was given)"""
+        self.stop_recording()
+        if self.record_replay:
+            self.recorder = ReplayRecorder(self.state.snapshot(), SIM_DT, self.sim.tick, seed)
+            self.replay_paths.append(session_replay_path(self.record_replay, self.replay_paths))
+
+    def stop_recording(self):
+        """Finish the current session's replay and write it in the background"""
+        if self.recorder is None:
+            return
+        replay = self.recorder.finish(self.state, self.sim.tick, self.game_over)
+        self.recorder = None
+        # Not daemonic: the interpreter waits for the write before exiting
+        threading.Thread(target=self.write_session_replay, args=(self.replay_paths[-1], replay),
+                         name="replay-writer").start()
+
+    @staticmethod
+    def write_session_replay(path, replay):
+        try:
+            write_replay(path, replay)
+            print(f"Replay saved to {path} ({replay.ticks} ticks, {len(replay.commands)} commands)")
+        except OSError as e:
+            print(f"Replay error: {e}")
+
+    def perform(self, name, *args):
+        """Apply a player command to the game state (see src/commands.py) and record it"""
+        result = apply_command(self.state, name, args)
+        self.record_command(name, *args)
+        return result
+
+    def record_command(self, name, *args):
+        if self.recorder is not None:
+            self.recorder.record(self.sim.tick, name, args)
+
+    def start_replay(self, replay, speed=1.0):
+        """Watch a recorded session. Needs a non-threaded simulation; input is ignored (Esc quits)."""
+        self.state = state_from_snapshot(replay.start)
+        self.menu_state = "PLAYING"
+        self.game_over = False
+        self.clear_messages()
+        self.saved_state = replay.start
+        self.replay_player = ReplayPlayer(replay, self.sim, self.sim.tick)
+        self.sim.add_listener(self.replay_player)
+        self.replay_speed = speed
+        # Enough catch-up ticks per frame for the chosen speed
+        self.sim.max_steps = max(MAX_SIM_STEPS, math.ceil(speed * SIM_RATE / FPS) + 1)
+        self.add_message(f"Replay ({speed:g}x) - Esc to quit", YELLOW, duration=5.0)
         
     def add_message(self, text, color=WHITE, duration=3.0):
-        self.messages.append({'text': text, 'color': color, 'timer': duration})
+        self.pending_messages.put({'text': text, 'color': color, 'timer': duration})
+        if self.idle:
+            # Posted from another thread while the main loop sleeps
+            pygame.event.post(pygame.event.Event(WAKE_EVENT))
+
+    def report_save(self, text, ok):
+        """Autosave service callback (background thread)"""
+        self.add_message(text, GREEN if ok else RED)
+
+    def clear_messages(self):
+        self.pending_messages.put(None)
+
+    def notify(self, text, tone):
+        """Message callback for the simulation"""
+        self.add_message(text, TONE_COLORS.get(tone, WHITE))
+
+    def update_messages(self, dt):
+        """Collect newly posted messages and age the visible ones"""
+        while True:
+            try:
+                msg = self.pending_messages.get_nowait()
+            except queue.Empty:
+                break
+            if msg is None:
+                self.messages = []
+            else:
+                self.messages.append(msg)
+
+        for msg in self.messages:
+            msg['timer'] -= dt
+        self.messages = [m for m in self.messages if m['timer'] > 0]
+
+    def on_effects(self, effects):
+        """Simulation hook: visual effects produced by the last tick"""
+        self.pending_effects.put(effects)
+
+    def update_particles(self, dt):
+        """Spawn queued effects and advance the particles"""
+        while True:
+            try:
+                effects = self.pending_effects.get_nowait()
+            except queue.Empty:
+                break
+            for kind, x, y, size in effects:
+                self.particles.emit(kind, x, y, size)
+
+        if self.menu_state == "PLAYING":
+            self.particles.update(dt)
+
+    def on_publish(self):
+        """Simulation hook (worker thread): wake the idle loop for the new snapshot"""
+        if self.idle:
+            pygame.event.post(pygame.event.Event(WAKE_EVENT))
+
+    def on_wave_complete(self, state):
+        """Simulation hook: save state at the start of the build phase (for retry)"""
+        self.saved_state = state.snapshot()
+        if self.replay_player is not None:
+            return # Watching a replay: keep the player's autosave
+        self.autosave.submit(os.path.join(SAVE_DIR, AUTOSAVE_FILE), self.saved_state,
+                             f"Autosaved (Wave {state.wave})")
     
-    def handle_input(self):
-        for event in pygame.event.get():
+    def handle_input(self, events=None):
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
             
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                self.presenter.invalidate()
+
             elif event.type == pygame.VIDEORESIZE:
                 if not self.fullscreen:
                     self.display_surface = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
+                    self.configure_display()
 
             if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    self.show_debug = not self.show_debug
+                    continue
+
+                if event.key == pygame.K_F4:
+                    self.show_profiler = not self.show_profiler
+                    PROFILER.set_enabled(self.show_profiler or self.hitches is not None)
+                    self.profiler_lines = []
+                    continue
+
+                if event.key == pygame.K_F5:
+                    self.sim.submit(self.arm_wave_profile)
+                    continue
+
                 if event.key == pygame.K_F11:
                     self.fullscreen = not self.fullscreen
                     if self.fullscreen:
                         self.display_surface = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
                     else:
                         self.display_surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+                    self.configure_display()
                 
-                if self.menu_state == "MAIN_MENU":
-                    self.handle_main_menu_input(event.key)
-                elif self.menu_state == "PAUSED":
-                    self.handle_pause_menu_input(event.key)
-                elif self.menu_state == "PLAYING":
-                    if self.show_help:
-                        if event.key == pygame.K_ESCAPE or event.key == pygame.K_h:
-                            self.show_help = False
-                        return
-
+                if self.replay_player is not None:
+                    # Commands come from the replay
                     if event.key == pygame.K_ESCAPE:
-                        if self.moving_building_id is not None:
-                            self.moving_building_id = None
-                            self.add_message("Move Cancelled", YELLOW)
-                        elif self.show_menu:
-                            self.show_menu = False
-                        elif self.show_building_menu:
-                            self.show_building_menu = False
-                        elif self.state.last_wave_rewards:
-                            self.state.last_wave_rewards = None
-                        else:
-                            self.menu_state = "PAUSED"
-                        return
-
-                    if self.game_over:
-                        if event.key == pygame.K_r:
-                            self.restart_game()
-                        elif event.key == pygame.K_t and self.saved_state:
-                            self.retry_wave()
-                        elif event.key == pygame.K_q:
-                            self.menu_state = "MAIN_MENU"
-                        return
-
-                    # Check for reward popup first
-                    if self.state.last_wave_rewards:
-                        if event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                            self.state.last_wave_rewards = None # Dismiss
-                        return # Block other input while popup is up
-
-                    if event.key == pygame.K_h:
-                        self.show_help = not self.show_help
-                        return
-
-                    if self.state.phase == "build":
-                        self.handle_build_input(event.key)
+                        self.running = False
+                    continue
+                
+                # Game logic runs on the simulation (possibly another thread)
+                self.sim.submit(self.handle_key, event.key)
+
+    def handle_key(self, key):
+        """Apply a key press to the game (runs at a simulation tick boundary)"""
+        if self.menu_state == "MAIN_MENU":
+            self.handle_main_menu_input(key)
+        elif self.menu_state == "PAUSED":
+            self.handle_pause_menu_input(key)
+        elif self.menu_state == "PLAYING":
+            if self.show_help:
+                if key == pygame.K_ESCAPE or key == pygame.K_h:
+                    self.show_help = False
+                return
+
+            if key == pygame.K_ESCAPE:
+                if self.moving_building_id is not None:
+                    self.moving_building_id = None
+                    self.add_message("Move Cancelled", YELLOW)
+                elif self.show_menu:
+                    self.show_menu = False
+                elif self.show_building_menu:
+                    self.show_building_menu = False
+                elif self.state.last_wave_rewards:
+                    self.state.last_wave_rewards = None
+                else:
+                    self.menu_state = "PAUSED"
+                return
+
+            if self.game_over:
+                if key == pygame.K_r:
+                    self.restart_game()
+                elif key == pygame.K_t and self.saved_state:
+                    self.retry_wave()
+                elif key == pygame.K_b:
+                    self.rewind_combat()
+                elif key == pygame.K_q:
+                    self.leave_to_main_menu()
+                return
+
+            # Check for reward popup first
+            if self.state.last_wave_rewards:
+                if key in (pygame.K_RETURN, pygame.K_SPACE):
+                    self.state.last_wave_rewards = None # Dismiss
+                return # Block other input while popup is up
+
+            if key == pygame.K_h:
+                self.show_help = not self.show_help
+                return
+
+            if self.state.phase == "build":
+                self.handle_build_input(key)
+            elif key == pygame.K_b:
+                self.rewind_combat()
 
     def handle_main_menu_input(self, key):
         if self.show_help:
@@ -180,6 +464,10 @@ class Game:
                 self.show_help = False
             return
 
+        if self.show_load_menu:
+            self.handle_load_menu_input(key)
+            return
+
         # Menu Navigation
         if key == pygame.K_UP:
             self.main_menu_selection = (self.main_menu_selection - 1) % 4
@@ -189,8 +477,7 @@ class Game:
             if self.main_menu_selection == 0: # New Game
                 self.new_game()
             elif self.main_menu_selection == 1: # Load Game
-                if not self.load_game():
-                    print("No save file found")
+                self.open_load_menu()
             elif self.main_menu_selection == 2: # Help
                 self.show_help = True
             elif self.main_menu_selection == 3: # Quit
@@ -200,26 +487,55 @@ class Game:
         if key == pygame.K_n:
             self.new_game()
         elif key == pygame.K_l:
-            if not self.load_game():
-                # Show error somehow? For now just print
-                print("No save file found")
+            self.open_load_menu()
         elif key == pygame.K_h:
             self.show_help = True
         elif key == pygame.K_q or key == pygame.K_ESCAPE:
             self.running = False
 
+    def open_load_menu(self):
+        """Show the save slots (metadata only, no save files are read)"""
+        self.save_slots = self.save_index.list_slots()
+        self.load_menu_selection = 0
+        self.show_load_menu = True
+
+    def handle_load_menu_input(self, key):
+        if key == pygame.K_ESCAPE:
+            self.show_load_menu = False
+        elif key == pygame.K_UP:
+            self.load_menu_selection = (self.load_menu_selection - 1) % len(self.save_slots)
+        elif key == pygame.K_DOWN:
+            self.load_menu_selection = (self.load_menu_selection + 1) % len(self.save_slots)
+        elif key in (pygame.K_RETURN, pygame.K_SPACE):
+            filename, meta = self.save_slots[self.load_menu_selection]
+            if meta is None:
+                self.add_message("Slot is empty", YELLOW)
+            elif self.load_game(filename):
+                self.show_load_menu = False
+            else:
+                self.add_message("Load Failed", RED)
+
     def handle_pause_menu_input(self, key):
         if key == pygame.K_ESCAPE:
             self.menu_state = "PLAYING"
         elif key == pygame.K_s:
             self.save_game()
             self.menu_state = "PLAYING"
+        elif key in (pygame.K_1, pygame.K_2, pygame.K_3):
+            self.save_game(SLOT_FILES[key - pygame.K_1])
+            self.menu_state = "PLAYING"
         elif key == pygame.K_m:
-            self.menu_state = "MAIN_MENU"
+            self.stop_recording()
+            self.leave_to_main_menu()
             self.state = None # Clear state
         elif key == pygame.K_q:
             self.running = False
     
+    def leave_to_main_menu(self):
+        self.menu_state = "MAIN_MENU"
+        if self.gc_policy is not None:
+            self.gc_policy.end_combat() # No wave runs behind the menu
+    
     def handle_build_input(self, key):
         # 1. Handle Confirmation State
         if self.confirm_build_type:
@@ -370,8 +686,7 @@ class Game:
         start, end = self.state.grid.unlocked_range
         side = "left" if col < start else "right"
         
-        if self.state.grid.unlock_column(side):
-            self.state.credits -= self.unlock_cost
+        if self.perform('unlock', side, self.unlock_cost):
             self.add_message("Column Unlocked!", GREEN)
         else:
             self.add_message("Cannot unlock this column", RED)
@@ -390,7 +705,8 @@ class Game:
         if self.moving_building_id is None:
             return
             
-        success, reason = self.state.grid.move_building(
+        success, reason = self.perform(
+            'move',
             self.moving_building_id, 
             self.state.selected_column, 
             self.state.selected_row
@@ -399,7 +715,6 @@ class Game:
         if success:
             self.add_message("Building Moved", GREEN)
             self.moving_building_id = None
-            self.state.update_economy()
         else:
             self.add_message(f"Cannot move here: {reason}", RED)
     
@@ -448,9 +763,7 @@ class Game:
             self.confirm_build_type = None
             return
 
-        self.state.credits -= template.cost
-        self.state.grid.place_building(building_type, col, row)
-        self.state.update_economy()
+        self.perform('build', building_type.value, col, row)
         self.add_message(f"Built {building_type.value}", GREEN)
         self.confirm_build_type = None
 
@@ -489,14 +802,9 @@ class Game:
         
         # Reset confirmation if we proceed or if it wasn't needed
         self.confirm_upgrade_id = None
-            
-        # Store cost before upgrading (because upgrade changes the template)
-        cost = building.template.upgrade_cost
         
-        success, reason = self.state.grid.upgrade_building(building.id)
+        success, reason = self.perform('upgrade', building.id)
         if success:
-            self.state.credits -= cost
-            self.state.update_economy()
             self.add_message(f"{reason} to Level {building.template.level}", GREEN)
             print(f"Upgraded to Level {building.template.level}")
         else:
@@ -507,12 +815,7 @@ class Game:
         """Sell building at selected position"""
         building = self.state.grid.get_building_at(self.state.selected_column, self.state.selected_row)
         if building:
-            # Refund 50% of total investment
-            total_value = building.get_total_investment()
-            refund = int(total_value * 0.5)
-            self.state.credits += refund
-            self.state.grid.destroy_building(building.id)
-            self.state.update_economy()
+            refund = self.perform('sell', building.id)
             self.add_message(f"Sold {building.template.type.value}. Refund: ${refund}", YELLOW)
 
     def try_repair(self):
@@ -532,18 +835,13 @@ class Game:
         if self.state.credits < cost:
             # Partial repair if they have at least 1 credit
             if self.state.credits > 0:
-                repair_amount = self.state.credits
-                building.current_hp += repair_amount
-                self.state.credits = 0
+                repair_amount = self.perform('repair', building.id)
                 self.add_message(f"Partial Repair: +{repair_amount} HP", YELLOW)
-                self.state.update_economy()
             else:
                 self.add_message(f"Need ${cost} to repair", RED)
         else:
-            self.state.credits -= cost
-            building.current_hp = building.template.max_hp
+            self.perform('repair', building.id)
             self.add_message(f"Repaired for ${cost}", GREEN)
-            self.state.update_economy()
     
     def start_wave(self):
         if self.state.energy_surplus < 0:
@@ -560,69 +858,23 @@ class Game:
                 return
         
         self.confirm_wave_start = False
-        self.state.phase = "combat"
-        self.state.wave += 1
-        self.state.combat.start_wave()
+        self.perform('start_wave')
         self.add_message(f"Wave {self.state.wave} Started!", RED)
     
     def update(self, dt):
-        if self.menu_state != "PLAYING":
-            return
-
-        prev_phase = self.state.phase
-        
-        if self.state.phase == "combat":
-            self.state.combat.update(dt)
-        
-        # Detect phase change to build
-        if prev_phase == "combat" and self.state.phase == "build":
-            self.add_message("Wave Complete!", GREEN)
-            # Save state at the start of the build phase (for retry)
-            self.saved_state = copy.deepcopy(self.state)
-            
-        # Energy Deficit Penalty (Credit Drain)
-        if self.state.energy_surplus < 0:
-            # Drain 1 credit per unit of deficit per second
-            drain_rate = abs(self.state.energy_surplus) * 1.0
-            drain_amount = drain_rate * dt
-            
-            if self.state.credits > 0:
-                self.state.credits = max(0, self.state.credits - drain_amount)
-                # Round for display occasionally? No, float is fine for internal logic
-                self.state.credits = int(self.state.credits) # Keep it int for simplicity in UI
-            else:
-                # If no credits, shield fails to recharge (handled below)
-                pass
-
-        # Shield recharge (always active)
-        # If energy is negative, shield only recharges if we have credits to burn
-        can_recharge = self.state.energy_surplus >= 0 or self.state.credits > 0
-        
-        if self.state.shield_current_hp < self.state.shield_max_hp and can_recharge:
-            recharge = self.state.shield_recharge_rate * dt
-            self.state.shield_current_hp = min(
-                self.state.shield_max_hp,
-                self.state.shield_current_hp + recharge
-            )
-            
-            # Check for reactivation (25% threshold)
-            if not self.state.shield_is_active:
-                threshold = self.state.shield_max_hp * 0.25
-                if self.state.shield_current_hp >= threshold:
-                    self.state.shield_is_active = True
-                    self.add_message("SHIELD ONLINE", GREEN)
-                    self.state.add_log("Shield Systems Restored")
-        
-        # Update messages
-        for msg in self.messages:
-            msg['timer'] -= dt
-        self.messages = [m for m in self.messages if m['timer'] > 0]
-        
-        # Check loss condition
-        if not self.state.grid.buildings and self.state.wave > 0 and self.state.phase == "combat":  # No buildings left
-             if not self.game_over:
-                 self.game_over = True
-                 self.add_message("CRITICAL FAILURE: BASE DESTROYED", RED)
+        """Per-frame update on the main thread"""
+        if self.menu_state == "PLAYING" and self.state is not None:
+            self.state.playtime += dt
+        self.update_messages(dt)
+        self.update_particles(dt)
+        # Runs the fixed-rate ticks (no-op when the simulation has its own thread)
+        if self.replay_player is None:
+            self.sim.advance(dt)
+        elif not self.replay_player.finished:
+            self.sim.advance(dt * self.replay_speed)
+        elif not self.replay_reported:
+            self.replay_reported = True
+            self.add_message("Replay Finished", GREEN, duration=10.0)
 
     def restart_game(self):
         """Reset game state to initial values"""
@@ -631,11 +883,23 @@ class Game:
     def retry_wave(self):
         """Restore state to beginning of last wave"""
         if self.saved_state:
-            self.state = copy.deepcopy(self.saved_state)
+            self.state.restore(self.saved_state)
+            self.record_command('retry')
             self.game_over = False
-            self.messages = []
+            self.clear_messages()
             self.add_message("Time Rewound. Ready to try again.", GREEN)
 
+    def rewind_combat(self):
+        """Step the current wave back a few seconds (runs on the simulation)"""
+        rewind = self.sim.rewind
+        frame = rewind.seek(self.state, REWIND_STEP)
+        if frame is None:
+            self.add_message("Nothing to Rewind", YELLOW)
+            return
+        self.sim.rewind_to(frame)
+        self.record_command('rewind', REWIND_STEP)
+        self.add_message(f"Rewound to {frame.time:.0f}s into the wave", GREEN)
+
     def get_building_menu_options(self):
         """Get available actions for the currently selected building"""
         building = self.state.grid.get_building_at(self.state.selected_column, self.state.selected_row)
@@ -732,64 +996,146 @@ class Game:
             text = self.font.render(opt['label'], True, color)
             self.screen.blit(text, (menu_x + 10, menu_y + 10 + i*item_height))
 
-    def draw(self):
+    def draw(self, alpha=1.0):
+        PROFILER.begin('draw')
+        self.snapshot = snap = self.sim.snapshot
+        # Moving entities are drawn between the last two simulation states
+        self.render_alpha = alpha if self.menu_state == "PLAYING" else 1.0
+        
+        # Combat frames are drawn purely from the snapshot, overlapping the next
+        # tick. Other screens query the live state, so hold the simulation lock.
+        in_combat = snap is not None and snap.phase == "combat" and self.menu_state == "PLAYING"
+        with nullcontext() if in_combat else self.sim.lock:
+            self.draw_frame(self.sim.snapshot if not in_combat else snap)
+        self.present()
+        PROFILER.lap('draw', 'present')
+        PROFILER.end('draw')
+
+    def draw_frame(self, snap):
+        self.snapshot = snap
         self.screen.fill(BLACK)
         
-        if self.menu_state == "MAIN_MENU":
+        if self.menu_state == "MAIN_MENU" or snap is None:
             self.draw_main_menu()
+            if self.show_load_menu:
+                self.draw_load_menu()
             if self.show_help:
                 self.draw_help_menu()
+            PROFILER.lap('draw', 'menu')
         else:
             # Draw Game
             self.draw_grid()
+            PROFILER.lap('draw', 'grid')
             self.draw_buildings()
+            PROFILER.lap('draw', 'buildings')
             self.draw_shield()
+            PROFILER.lap('draw', 'shield')
             
-            if self.state.phase == "combat":
+            if snap.phase == "combat":
                 self.draw_enemies()
                 self.draw_ground_units()
                 self.draw_drones()
                 self.draw_projectiles()
+                PROFILER.lap('draw', 'entities')
             
+            self.draw_particles()
+            PROFILER.lap('draw', 'particles')
             self.draw_hud()
+            PROFILER.lap('draw', 'hud')
             self.draw_messages()
             self.draw_message_log()
+            PROFILER.lap('draw', 'messages')
             
-            if self.show_menu and self.state.phase == "build":
+            if self.show_menu and snap.phase == "build":
                 self.draw_build_menu()
             
-            if self.show_building_menu and self.state.phase == "build":
+            if self.show_building_menu and snap.phase == "build":
                 self.draw_building_menu()
             
             if self.show_help:
                 self.draw_help_menu()
             
-            if self.state.last_wave_rewards and not self.game_over:
+            if snap.last_wave_rewards and not snap.game_over:
                 self.draw_wave_complete_popup()
                 
-            if self.game_over:
+            if snap.game_over:
                 self.draw_game_over()
                 
             if self.menu_state == "PAUSED":
                 self.draw_pause_menu()
+            PROFILER.lap('draw', 'popups')
 
-        # Scale and draw to display surface
-        window_w, window_h = self.display_surface.get_size()
-        scale_w = window_w / SCREEN_WIDTH
-        scale_h = window_h / SCREEN_HEIGHT
-        scale = min(scale_w, scale_h)
-        
-        new_w = int(SCREEN_WIDTH * scale)
-        new_h = int(SCREEN_HEIGHT * scale)
-        
-        offset_x = (window_w - new_w) // 2
-        offset_y = (window_h - new_h) // 2
-        
-        scaled_surf = pygame.transform.scale(self.screen, (new_w, new_h))
-        self.display_surface.fill(BLACK) # Clear borders
-        self.display_surface.blit(scaled_surf, (offset_x, offset_y))
-        
-        pygame.display.flip()
+        if self.show_debug:
+            self.draw_debug_overlay()
+        if self.show_profiler:
+            self.draw_profiler_overlay()
+        PROFILER.lap('draw', 'debug')
+
+    def configure_display(self):
+        """Rebind the virtual screen after the window mode changed"""
+        self.presenter.configure(self.display_surface)
+        self.screen = self.presenter.screen
+        self.presented_keys = None
+
+    def get_presentation_keys(self):
+        """Cheap per-region signatures of everything that is drawn.
+
+        A region whose key matches the last presented frame is left alone. A key
+        of None means the region always changes (e.g. the playfield in combat).
+        """
+        overlay_key = (
+            self.menu_state, self.main_menu_selection, self.show_help,
+            self.show_load_menu, self.load_menu_selection, self.current_slot,
+            self.show_menu, self.build_menu_selection,
+            self.show_building_menu, self.building_menu_selection,
+            self.confirm_build_type, self.moving_building_id,
+            tuple((m['text'], m['color']) for m in self.messages)
+        )
+        debug_key = (tuple(self.debug_lines) if self.show_debug else None,
+                     self.frame_count if self.show_profiler else None) # Profiler timings change every frame
+        snap = self.snapshot
+        if self.menu_state == "MAIN_MENU" or snap is None:
+            return overlay_key + (debug_key,), (), ()
+
+        hud_key = (
+            snap.phase, snap.credits, snap.wave, snap.energy_production, snap.energy_consumption,
+            snap.shield_recharge_rate, snap.selected, snap.unlocked_range, snap.buildings
+        )
+        overlay_key += (snap.phase, snap.last_wave_rewards is not None, snap.game_over)
+
+        if self.menu_state == "PLAYING" and snap.phase == "combat":
+            # Entities move every frame; the HUD only changes when its numbers do
+            playfield_key = None
+            hud_key += (
+                len(snap.enemies), len(snap.drones), snap.invaders, snap.defenders,
+                snap.enemies_remaining, int(snap.shield_current_hp)
+            )
+        else:
+            # Build phase menus and popups depend on credits and the selected cell
+            overlay_key += hud_key
+            playfield_key = (
+                int(snap.shield_current_hp), snap.shield_max_hp, snap.shield_is_active, snap.logs,
+                debug_key, self.particles.count and self.frame_count # Fading particles after a wave
+            )
+        return overlay_key, playfield_key, hud_key
+
+    def present(self):
+        """Push only the regions that changed since the last presented frame"""
+        keys = self.get_presentation_keys()
+        previous = self.presented_keys
+        self.presented_keys = keys
+
+        if previous is None or keys[0] != previous[0]:
+            # Overlays can span both regions
+            self.presenter.present([self.screen.get_rect()])
+            return
+
+        dirty_rects = []
+        if keys[1] is None or keys[1] != previous[1]:
+            dirty_rects.append(PLAYFIELD_RECT)
+        if keys[2] != previous[2]:
+            dirty_rects.append(HUD_RECT)
+        self.presenter.present(dirty_rects)
 
     def draw_main_menu(self):
         """Draw Main Menu"""
@@ -831,12 +1177,70 @@ class Game:
         footer = self.font.render("v0.3.0 - 2025", True, GRAY)
         self.screen.blit(footer, (10, SCREEN_HEIGHT - 30))
 
+    def draw_load_menu(self):
+        """Draw the save slot list from the slot index"""
+        width = 900
+        height = 560
+        x = (SCREEN_WIDTH - width) // 2
+        y = (SCREEN_HEIGHT - height) // 2
+        
+        pygame.draw.rect(self.screen, (20, 20, 30), (x, y, width, height))
+        pygame.draw.rect(self.screen, WHITE, (x, y, width, height), 2)
+        
+        title = self.font_large.render("LOAD GAME", True, GREEN)
+        self.screen.blit(title, title.get_rect(center=(x + width // 2, y + 35)))
+        
+        row_y = y + 70
+        row_height = 110
+        for i, (filename, meta) in enumerate(self.save_slots):
+            selected = i == self.load_menu_selection
+            if selected:
+                pygame.draw.rect(self.screen, (50, 50, 70), (x + 10, row_y, width - 20, row_height - 10))
+            
+            name = "Autosave" if filename == AUTOSAVE_FILE else f"Slot {SLOT_FILES.index(filename) + 1}"
+            color = YELLOW if selected else WHITE
+            self.screen.blit(self.font_large.render(f"{'> ' if selected else ''}{name}", True, color), (x + 25, row_y + 10))
+            
+            if meta is None:
+                self.screen.blit(self.font.render("-- Empty --", True, GRAY), (x + 25, row_y + 50))
+            else:
+                playtime = int(meta['playtime'])
+                saved = time.strftime("%Y-%m-%d %H:%M", time.localtime(meta['timestamp']))
+                details = [
+                    f"Wave {meta['wave']}   Credits {meta['credits']}   Buildings {meta['buildings']}",
+                    f"Playtime {playtime // 3600}:{playtime // 60 % 60:02d}:{playtime % 60:02d}   Saved {saved}",
+                ]
+                for j, line in enumerate(details):
+                    self.screen.blit(self.font.render(line, True, WHITE), (x + 25, row_y + 45 + j * 22))
+                
+                thumb = self.get_thumbnail(filename, meta)
+                self.screen.blit(thumb, (x + width - thumb.get_width() - 30, row_y + 5))
+            row_y += row_height
+        
+        footer = self.font.render("UP/DOWN Select   ENTER Load   ESC Back", True, GRAY)
+        self.screen.blit(footer, footer.get_rect(center=(x + width // 2, y + height - 20)))
+
+    def get_thumbnail(self, filename, meta):
+        """Render (once) a slot's grid thumbnail"""
+        key = (filename, meta['timestamp'])
+        thumb = self.thumbnails.get(key)
+        if thumb is None:
+            colors = {code: BUILDING_COLORS[building_type] for building_type, code in THUMBNAIL_CODES.items()}
+            cell = 3
+            rows = meta['thumbnail']
+            thumb = pygame.Surface((len(rows[0]) * cell, len(rows) * cell))
+            thumb.fill(DARK_GRAY)
+            for r, line in enumerate(rows):
+                for c, code in enumerate(line):
+                    if code in colors:
+                        thumb.fill(colors[code], (c * cell, r * cell, cell, cell))
+            thumb = pygame.transform.scale(thumb, (thumb.get_width() * 2, thumb.get_height() * 2))
+            self.thumbnails[key] = thumb
+        return thumb
+
     def draw_pause_menu(self):
         """Draw Pause Menu Overlay"""
-        s = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        s.set_alpha(200)
-        s.fill(BLACK)
-        self.screen.blit(s, (0, 0))
+        self.overlays.fill(self.screen, (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT), BLACK, 200)
         
         title = self.font_title.render("PAUSED", True, YELLOW)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 200))
@@ -844,7 +1248,8 @@ class Game:
         
         options = [
             "[ESC] Resume",
-            "[S] Save Game",
+            f"[S] Save Game (Slot {SLOT_FILES.index(self.current_slot) + 1})",
+            "[1-3] Save to Slot",
             "[M] Main Menu",
             "[Q] Quit Desktop"
         ]
@@ -856,77 +1261,93 @@ class Game:
             self.screen.blit(text, rect)
             y += 50
 
+    def interpolate(self, entity):
+        """Render position of a moving entity at the current interpolation alpha"""
+        alpha = self.render_alpha
+        return (int(entity.prev_x + (entity.x - entity.prev_x) * alpha),
+                int(entity.prev_y + (entity.y - entity.prev_y) * alpha))
+
     def draw_enemies(self):
         """Draw all active enemies"""
-        for enemy in self.state.combat.enemies:
-            if not enemy.alive:
-                continue
-                
+        show_bars = self.frame_budget.level < FrameBudget.NO_HP_BARS
+        batch = []
+        damaged = []
+        for enemy in self.snapshot.enemies:
             # Main body
-            color = RED
-            if enemy.is_boss:
-                color = (148, 0, 211) # Dark Violet for Boss
-                
-            pygame.draw.circle(self.screen, color, (int(enemy.x), int(enemy.y)), enemy.radius)
-            
-            # HP bar
-            hp_ratio = enemy.current_hp / enemy.max_hp
+            x, y = self.interpolate(enemy)
+            surf, (ox, oy) = self.sprites.enemy(enemy)
+            batch.append((surf, (x + ox, y + oy)))
+            if enemy.hp_ratio < 1 and (show_bars or enemy.is_boss):
+                damaged.append((enemy, x, y))
+        self.screen.blits(batch, False)
+            
+        # HP bars (damaged only)
+        for enemy, x, y in damaged:
+            hp_ratio = enemy.hp_ratio
             bar_width = enemy.radius * 2
             bar_height = 4
             if enemy.is_boss:
                 bar_height = 8 # Thicker bar for boss
-                
-            pygame.draw.rect(self.screen, (50, 50, 50),
-                           (enemy.x - enemy.radius, enemy.y - enemy.radius - (bar_height + 4), bar_width, bar_height))
-            pygame.draw.rect(self.screen, GREEN,
-                           (enemy.x - enemy.radius, enemy.y - enemy.radius - (bar_height + 4), bar_width * hp_ratio, bar_height))
+            bar_x = x - enemy.radius
+            bar_y = y - enemy.radius - (bar_height + 4)
+            self.screen.fill((50, 50, 50), (bar_x, bar_y, bar_width, bar_height))
+            self.screen.fill(GREEN, (bar_x, bar_y, bar_width * hp_ratio, bar_height))
     
     def draw_drones(self):
         """Draw active drones"""
-        for drone in self.state.combat.drones:
-            if not drone.alive:
-                continue
-            
-            # Draw Drone body (Cyan Triangle)
-            # Points: Top, BottomLeft, BottomRight
-            size = 8
-            points = [
-                (drone.x, drone.y - size),
-                (drone.x - size, drone.y + size),
-                (drone.x + size, drone.y + size)
-            ]
-            pygame.draw.polygon(self.screen, (0, 255, 255), points)
-            
-            # HP Bar (Tiny)
-            hp_ratio = drone.hp / drone.max_hp
-            pygame.draw.rect(self.screen, GREEN, (drone.x - 8, drone.y - 12, 16 * hp_ratio, 2))
+        show_bars = self.frame_budget.level < FrameBudget.NO_HP_BARS
+        surf, (ox, oy) = self.sprites.drone()
+        batch = []
+        damaged = []
+        for drone in self.snapshot.drones:
+            x, y = self.interpolate(drone)
+            batch.append((surf, (x + ox, y + oy)))
+            if show_bars and drone.hp_ratio < 1:
+                damaged.append((drone, x, y))
+        self.screen.blits(batch, False)
+            
+        # HP Bar (Tiny)
+        for drone, x, y in damaged:
+            self.screen.fill(GREEN, (x - 8, y - 12, 16 * drone.hp_ratio, 2))
 
     def draw_projectiles(self):
         """Draw all active projectiles"""
-        for proj in self.state.combat.projectiles:
-            if not proj.alive:
-                continue
-            
-            color = YELLOW if proj.source == "turret" else RED
-            pygame.draw.circle(self.screen, color, (int(proj.x), int(proj.y)), proj.radius)
+        projectiles = self.snapshot.projectiles
+        if self.frame_budget.level >= FrameBudget.THIN_PROJECTILES:
+            # Alternate halves each frame so every shot stays visible
+            projectiles = projectiles[self.frame_count % 2::2]
+        batch = []
+        for proj in projectiles:
+            x, y = self.interpolate(proj)
+            surf, (ox, oy) = self.sprites.projectile(proj)
+            batch.append((surf, (x + ox, y + oy)))
+        self.screen.blits(batch, False)
     
+    def draw_particles(self):
+        """Draw explosion and shield impact particles"""
+        self.particles.draw(self.screen)
+
     def draw_ground_units(self):
         """Draw ground invaders and defenders"""
-        for unit in self.state.combat.ground_units:
-            if not unit.alive:
-                continue
-            
-            color = RED if unit.team == "invader" else BLUE
+        show_bars = self.frame_budget.level < FrameBudget.NO_HP_BARS
+        batch = []
+        damaged = []
+        for unit in self.snapshot.ground_units:
             # Draw as small rectangles on the ground
-            rect = pygame.Rect(unit.x - 5, unit.y - 10, 10, 10)
-            pygame.draw.rect(self.screen, color, rect)
-            
-            # HP Bar
-            hp_ratio = unit.hp / unit.max_hp
-            pygame.draw.rect(self.screen, GREEN, (unit.x - 5, unit.y - 14, 10 * hp_ratio, 2))
+            x, y = self.interpolate(unit)
+            surf, (ox, oy) = self.sprites.ground_unit(unit.team)
+            batch.append((surf, (x + ox, y + oy)))
+            if show_bars and unit.hp_ratio < 1:
+                damaged.append((unit, x, y))
+        self.screen.blits(batch, False)
+            
+        # HP Bar
+        for unit, x, y in damaged:
+            self.screen.fill(GREEN, (x - 5, y - 14, 10 * unit.hp_ratio, 2))
     
     def draw_hud(self):
         """Draw UI elements in the right-side panel"""
+        snap = self.snapshot
         # Draw Panel Background
         pygame.draw.rect(self.screen, (30, 30, 30), 
                         (UI_START_X, 0, UI_WIDTH, SCREEN_HEIGHT))
@@ -937,18 +1358,18 @@ class Game:
         x = UI_START_X + 20
         
         # Credits
-        credits_text = self.font_large.render(f"Credits: {self.state.credits}", True, GREEN)
+        credits_text = self.font_large.render(f"Credits: {snap.credits}", True, GREEN)
         self.screen.blit(credits_text, (x, y))
         y += 40
         
         # Wave Info
-        wave_text = self.font.render(f"Wave: {self.state.wave}", True, WHITE)
+        wave_text = self.font.render(f"Wave: {snap.wave}", True, WHITE)
         self.screen.blit(wave_text, (x, y))
         y += 30
         
         # Phase
-        phase_color = YELLOW if self.state.phase == "build" else RED
-        phase_text = self.font.render(f"Phase: {self.state.phase.upper()}", True, phase_color)
+        phase_color = YELLOW if snap.phase == "build" else RED
+        phase_text = self.font.render(f"Phase: {snap.phase.upper()}", True, phase_color)
         self.screen.blit(phase_text, (x, y))
         y += 40
         
@@ -957,16 +1378,16 @@ class Game:
         y += 20
 
         # 2. Economy Section
-        energy_color = GREEN if self.state.energy_surplus >= 0 else RED
+        energy_color = GREEN if snap.energy_surplus >= 0 else RED
         self.screen.blit(self.font.render("Energy Grid:", True, WHITE), (x, y))
         y += 25
-        self.screen.blit(self.font.render(f"Prod: {self.state.energy_production}", True, GREEN), (x, y))
+        self.screen.blit(self.font.render(f"Prod: {snap.energy_production}", True, GREEN), (x, y))
         y += 20
-        self.screen.blit(self.font.render(f"Cons: {self.state.energy_consumption}", True, RED), (x, y))
+        self.screen.blit(self.font.render(f"Cons: {snap.energy_consumption}", True, RED), (x, y))
         y += 20
-        self.screen.blit(self.font.render(f"Net:  {self.state.energy_surplus}", True, energy_color), (x, y))
+        self.screen.blit(self.font.render(f"Net:  {snap.energy_surplus}", True, energy_color), (x, y))
         y += 20
-        self.screen.blit(self.font.render(f"S.Regen: {self.state.shield_recharge_rate:.1f}/s", True, (0, 200, 255)), (x, y))
+        self.screen.blit(self.font.render(f"S.Regen: {snap.shield_recharge_rate:.1f}/s", True, (0, 200, 255)), (x, y))
         y += 40
 
         # Separator
@@ -974,20 +1395,18 @@ class Game:
         y += 20
 
         # 3. Context Section (Combat Stats or Build Info)
-        if self.state.phase == "combat" and self.state.combat.current_wave:
+        if snap.phase == "combat" and snap.enemies_remaining is not None:
             self.screen.blit(self.font.render("Combat Status:", True, RED), (x, y))
             y += 30
             
-            # Count ground units
-            invaders = sum(1 for u in self.state.combat.ground_units if u.team == "invader" and u.alive)
-            defenders = sum(1 for u in self.state.combat.ground_units if u.team == "defender" and u.alive)
-            drones = len(self.state.combat.drones)
-            
-            # Calculate capacities
-            drone_cap = sum(b.template.capacity for b in self.state.grid.buildings if b.template.type == BuildingType.DRONE_FACTORY)
-            barracks_cap = sum(b.template.capacity for b in self.state.grid.buildings if b.template.type == BuildingType.BARRACKS)
+            # Unit counts and capacities
+            invaders = snap.invaders
+            defenders = snap.defenders
+            drones = len(snap.drones)
+            drone_cap = snap.drone_capacity
+            barracks_cap = snap.barracks_capacity
             
-            self.screen.blit(self.font.render(f"Aerial Enemies: {len(self.state.combat.enemies)}", True, WHITE), (x, y))
+            self.screen.blit(self.font.render(f"Aerial Enemies: {len(snap.enemies)}", True, WHITE), (x, y))
             y += 20
             self.screen.blit(self.font.render(f"Ground Invaders: {invaders}", True, RED), (x, y))
             y += 20
@@ -995,14 +1414,15 @@ class Game:
             y += 20
             self.screen.blit(self.font.render(f"Drones: {drones}/{drone_cap}", True, (0, 255, 255)), (x, y))
             y += 20
-            self.screen.blit(self.font.render(f"Incoming: {self.state.combat.current_wave.enemies_remaining}", True, WHITE), (x, y))
+            self.screen.blit(self.font.render(f"Incoming: {snap.enemies_remaining}", True, WHITE), (x, y))
             y += 20
             
             # Shield Status
-            shield_pct = int((self.state.shield_current_hp / self.state.shield_max_hp) * 100) if self.state.shield_max_hp > 0 else 0
+            shield_pct = int((snap.shield_current_hp / snap.shield_max_hp) * 100) if snap.shield_max_hp > 0 else 0
             self.screen.blit(self.font.render(f"Shield Integrity: {shield_pct}%", True, (0, 200, 255)), (x, y))
             
-        elif self.state.phase == "build":
+        elif snap.phase == "build":
+            # Build phase frames hold the simulation lock, so the live state is safe to query
             self.screen.blit(self.font.render("Build Mode:", True, YELLOW), (x, y))
             y += 30
             self.screen.blit(self.font.render("Controls:", True, GRAY), (x, y))
@@ -1046,7 +1466,7 @@ class Game:
                 
                 # Category
                 cat_name = building.template.category.value
-                self.screen.blit(pygame.font.Font(None, 20).render(f"Type: {cat_name}", True, GRAY), (x, y))
+                self.screen.blit(self.overlays.font(20).render(f"Type: {cat_name}", True, GRAY), (x, y))
                 y += 20
                 
                 self.screen.blit(self.font.render(f"Level: {building.template.level}", True, WHITE), (x, y))
@@ -1140,7 +1560,7 @@ class Game:
         self.screen.blit(title, (menu_x + 20, menu_y + 20))
         
         # Footer
-        footer = pygame.font.Font(None, 24).render("ESC = CANCEL/BACK", True, GRAY)
+        footer = self.overlays.font(24).render("ESC = CANCEL/BACK", True, GRAY)
         footer_rect = footer.get_rect(right=menu_x + menu_width - 20, top=menu_y + 25)
         self.screen.blit(footer, footer_rect)
         
@@ -1200,26 +1620,27 @@ class Game:
             elif template.category == BuildingCategory.MILITARY: cat_color = (139, 69, 19)
             elif template.category == BuildingCategory.UTILITY: cat_color = (0, 255, 255)
             
-            cat_surf = pygame.font.Font(None, 20).render(cat_text, True, cat_color)
+            cat_surf = self.overlays.font(20).render(cat_text, True, cat_color)
             # Align right
             cat_rect = cat_surf.get_rect(right=menu_x + menu_width - 20, centery=y_offset + 10)
             self.screen.blit(cat_surf, cat_rect)
             
             # Draw stats below
-            stats_surf = pygame.font.Font(None, 20).render(stats_text, True, (200, 200, 200))
+            stats_surf = self.overlays.font(20).render(stats_text, True, (200, 200, 200))
             self.screen.blit(stats_surf, (menu_x + 20, y_offset + 20))
             
             # Show reason if selected but invalid
             if not can_place:
-                reason_surf = pygame.font.Font(None, 18).render(f"  ({reason})", True, RED)
+                reason_surf = self.overlays.font(18).render(f"  ({reason})", True, RED)
                 self.screen.blit(reason_surf, (menu_x + 300, y_offset))
                 
             y_offset += 50
     
     def draw_grid(self):
         """Draw the city grid"""
-        cols = self.state.grid.max_columns
-        rows = self.state.grid.rows
+        snap = self.snapshot
+        cols = snap.max_columns
+        rows = snap.rows
         
         # Draw vertical lines
         for i in range(cols + 1):
@@ -1237,7 +1658,7 @@ class Game:
                         (GRID_START_X + cols * GRID_SLOT_WIDTH, GROUND_Y), 3)
         
         # Highlight unlocked area
-        start, end = self.state.grid.unlocked_range
+        start, end = snap.unlocked_range
         unlocked_x = GRID_START_X + start * GRID_SLOT_WIDTH
         unlocked_width = (end - start) * GRID_SLOT_WIDTH
         
@@ -1247,13 +1668,11 @@ class Game:
                         (unlocked_x + unlocked_width, GROUND_Y), 3)
         
         # Draw faint background for unlocked area
-        s = pygame.Surface((unlocked_width, rows * GRID_CELL_HEIGHT))
-        s.set_alpha(30)
-        s.fill(WHITE)
-        self.screen.blit(s, (unlocked_x, GROUND_Y - rows * GRID_CELL_HEIGHT))
+        self.overlays.fill(self.screen, (unlocked_x, GROUND_Y - rows * GRID_CELL_HEIGHT,
+                                         unlocked_width, rows * GRID_CELL_HEIGHT), WHITE, 30)
             
-        # Selection highlight
-        if self.state.phase == "build":
+        # Selection highlight (build phase: live state under the simulation lock)
+        if snap.phase == "build":
             sel_x = GRID_START_X + self.state.selected_column * GRID_SLOT_WIDTH
             sel_y = GROUND_Y - (self.state.selected_row + 1) * GRID_CELL_HEIGHT
             
@@ -1281,9 +1700,10 @@ class Game:
     
     def draw_buildings(self):
         """Draw all buildings in the grid"""
+        snap = self.snapshot
         moving_building = None
         
-        for building in self.state.grid.buildings:
+        for building in snap.buildings:
             if building.id == self.moving_building_id:
                 moving_building = building
                 # Draw original position semi-transparent
@@ -1292,90 +1712,77 @@ class Game:
                 alpha = 255
                 
             x = GRID_START_X + building.column * GRID_SLOT_WIDTH
-            height_px = building.template.footprint[1] * GRID_CELL_HEIGHT
-            width_px = building.template.footprint[0] * GRID_SLOT_WIDTH
+            height_px = building.height * GRID_CELL_HEIGHT
             y = GROUND_Y - (building.row * GRID_CELL_HEIGHT) - height_px
             
-            self.draw_single_building(building, x, y, alpha)
+            self.draw_single_building(building.type, building.tier, (building.width, building.height),
+                                      building.current_hp / building.max_hp, x, y, alpha)
+        
+        if snap.phase != "build":
+            return
+        sel_col, sel_row = snap.selected
             
         # Draw ghost of moving building at cursor
         if moving_building:
-            x = GRID_START_X + self.state.selected_column * GRID_SLOT_WIDTH
-            height_px = moving_building.template.footprint[1] * GRID_CELL_HEIGHT
-            width_px = moving_building.template.footprint[0] * GRID_SLOT_WIDTH
-            y = GROUND_Y - (self.state.selected_row * GRID_CELL_HEIGHT) - height_px
-            
-            # Check validity for color tint
-            can_place, _ = self.state.grid.move_building(moving_building.id, self.state.selected_column, self.state.selected_row)
-            # Note: move_building actually moves it if true, so we can't use it for checking without side effects unless we revert.
-            # Actually, move_building in my implementation DOES move it.
-            # I should use can_place directly, but I need to temporarily remove the building to check.
-            # This is expensive to do every frame.
-            # Let's just draw it.
-            
-            self.draw_single_building(moving_building, x, y, 180, ghost=True)
+            x = GRID_START_X + sel_col * GRID_SLOT_WIDTH
+            height_px = moving_building.height * GRID_CELL_HEIGHT
+            y = GROUND_Y - (sel_row * GRID_CELL_HEIGHT) - height_px
+            self.draw_single_building(moving_building.type, moving_building.tier,
+                                      (moving_building.width, moving_building.height), 1.0, x, y, 180, ghost=True)
 
         # Draw ghost of pending build
         if self.confirm_build_type:
-             template = get_building_template(self.confirm_build_type, 1)
-             x = GRID_START_X + self.state.selected_column * GRID_SLOT_WIDTH
-             height_px = template.footprint[1] * GRID_CELL_HEIGHT
-             y = GROUND_Y - (self.state.selected_row * GRID_CELL_HEIGHT) - height_px
-             
-             # Create dummy building for drawing
-             dummy = Building(id=-1, template=template, current_hp=template.max_hp, column=self.state.selected_column, row=self.state.selected_row)
-             self.draw_single_building(dummy, x, y, 180, ghost=True)
-
-    def draw_single_building(self, building, x, y, alpha, ghost=False):
-        # Color based on type
-        if building.template.type == BuildingType.POWER_PLANT:
-            color = BLUE
-        elif building.template.type == BuildingType.DATACENTER:
-            color = GREEN
-        elif building.template.type == BuildingType.CAPACITOR:
-            color = (0, 255, 255)  # Cyan
-        elif building.template.type == BuildingType.TURRET:
-            color = RED
-        elif building.template.type == BuildingType.BARRACKS:
-            color = (139, 69, 19) # Saddle Brown
+            template = get_building_template(self.confirm_build_type, 1)
+            x = GRID_START_X + sel_col * GRID_SLOT_WIDTH
+            height_px = template.footprint[1] * GRID_CELL_HEIGHT
+            y = GROUND_Y - (sel_row * GRID_CELL_HEIGHT) - height_px
+            self.draw_single_building(template.type, template.tier, template.footprint, 1.0, x, y, 180, ghost=True)
+
+    def draw_single_building(self, building_type, tier, footprint, hp_ratio, x, y, alpha, ghost=False):
+        width_px = footprint[0] * GRID_SLOT_WIDTH
+        height_px = footprint[1] * GRID_CELL_HEIGHT
+        
+        sprite = self.assets.building(building_type, tier, footprint)
+        if sprite is not None:
+            if alpha < 255:
+                sprite.set_alpha(alpha)
+                self.screen.blit(sprite, (x + 2, y + 2))
+                sprite.set_alpha(None)
+            else:
+                self.screen.blit(sprite, (x + 2, y + 2))
         else:
-            color = WHITE
-        
-        width_px = building.template.footprint[0] * GRID_SLOT_WIDTH
-        height_px = building.template.footprint[1] * GRID_CELL_HEIGHT
-        
-        s = pygame.Surface((width_px - 4, height_px - 4))
-        s.set_alpha(alpha)
-        s.fill(color)
-        self.screen.blit(s, (x + 2, y + 2))
+            # Atlas still loading: plain colored block
+            self.overlays.fill(self.screen, (x + 2, y + 2, width_px - 4, height_px - 4),
+                               BUILDING_COLORS.get(building_type, WHITE), alpha)
         
         if not ghost:
-            # Draw border/details
-            pygame.draw.rect(self.screen, WHITE, 
-                           (x + 2, y + 2, width_px - 4, height_px - 4), 1)
+            if sprite is None:
+                # Draw border/details
+                pygame.draw.rect(self.screen, WHITE, 
+                               (x + 2, y + 2, width_px - 4, height_px - 4), 1)
             
             # HP bar
-            hp_ratio = building.current_hp / building.template.max_hp
             hp_bar_width = (width_px - 10) * hp_ratio
             pygame.draw.rect(self.screen, GREEN, 
                            (x + 5, y + 5, hp_bar_width, 4))
     
     def draw_shield(self):
         """Draw shield line with variable thickness based on HP"""
-        if self.state.shield_max_hp <= 0:
+        snap = self.snapshot
+        if snap.shield_max_hp <= 0:
             return
 
         # If broken, draw offline state
-        if not self.state.shield_is_active:
+        if not snap.shield_is_active:
              # Draw faint red line to show where it is
              pygame.draw.line(self.screen, (50, 0, 0), 
                         (GRID_START_X, SHIELD_Y), 
-                        (GRID_START_X + self.state.grid.max_columns * GRID_SLOT_WIDTH, SHIELD_Y), 1)
+                        (GRID_START_X + snap.max_columns * GRID_SLOT_WIDTH, SHIELD_Y), 1)
              
              # Show reboot progress
-             threshold = self.state.shield_max_hp * 0.25
+             threshold = snap.shield_max_hp * 0.25
              if threshold > 0:
-                 pct = int((self.state.shield_current_hp / threshold) * 100)
+                 pct = int((snap.shield_current_hp / threshold) * 100)
              else:
                  pct = 0
              text = f"SHIELD OFFLINE: {pct}% REBOOT"
@@ -1384,16 +1791,16 @@ class Game:
              return
 
         # Calculate thickness based on current HP
-        thickness = max(2, min(50, int(self.state.shield_current_hp / 5)))
+        thickness = max(2, min(50, int(snap.shield_current_hp / 5)))
         
         # Draw the shield
-        cols = self.state.grid.max_columns
+        cols = snap.max_columns
         pygame.draw.line(self.screen, (0, 200, 255), 
                         (GRID_START_X, SHIELD_Y), 
                         (GRID_START_X + cols * GRID_SLOT_WIDTH, SHIELD_Y), thickness)
         
         # Shield HP text
-        shield_text = f"Shield: {int(self.state.shield_current_hp)}/{self.state.shield_max_hp}"
+        shield_text = f"Shield: {int(snap.shield_current_hp)}/{snap.shield_max_hp}"
         text_surf = self.font.render(shield_text, True, WHITE)
         self.screen.blit(text_surf, (GRID_START_X, SHIELD_Y - 30))
     
@@ -1407,10 +1814,7 @@ class Game:
             
             # Draw background for readability
             bg_rect = rect.inflate(20, 10)
-            s = pygame.Surface((bg_rect.width, bg_rect.height))
-            s.set_alpha(200)
-            s.fill(BLACK)
-            self.screen.blit(s, bg_rect)
+            self.overlays.fill(self.screen, bg_rect, BLACK, 200)
             
             self.screen.blit(text_surf, rect)
             y += 40
@@ -1422,17 +1826,22 @@ class Game:
         log_width = PLAYABLE_WIDTH - 40
         log_x = 20
         
+        # Under heavy load, keep showing the last rendered log
+        frozen = self.frame_budget.level >= FrameBudget.FROZEN_LOG
+        if not frozen:
+            self.frozen_log = None
+        elif self.frozen_log is not None:
+            self.screen.blit(self.frozen_log, (log_x, log_y))
+            return
+        
         # Background
-        s = pygame.Surface((log_width, log_height))
-        s.set_alpha(100)
-        s.fill(BLACK)
-        self.screen.blit(s, (log_x, log_y))
+        self.overlays.fill(self.screen, (log_x, log_y, log_width, log_height), BLACK, 100)
         
         # Draw logs (last 5)
         font_height = 20
         max_lines = log_height // font_height
         
-        recent_logs = self.state.logs[-max_lines:]
+        recent_logs = self.snapshot.logs[-max_lines:]
         
         for i, log in enumerate(recent_logs):
             color = WHITE
@@ -1445,9 +1854,14 @@ class Game:
                 
             text = self.font.render(f"> {log}", True, color)
             self.screen.blit(text, (log_x + 10, log_y + i * font_height))
+        
+        if frozen:
+            if self.frozen_log is None:
+                self.frozen_log = pygame.Surface((log_width, log_height))
+            self.frozen_log.blit(self.screen, (0, 0), (log_x, log_y, log_width, log_height))
     
     def draw_wave_complete_popup(self):
-        rewards = self.state.last_wave_rewards
+        rewards = self.snapshot.last_wave_rewards
         if not rewards:
             return
 
@@ -1504,10 +1918,7 @@ class Game:
     def draw_game_over(self):
         """Draw Game Over overlay"""
         # Semi-transparent background
-        s = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        s.set_alpha(200)
-        s.fill((20, 0, 0))
-        self.screen.blit(s, (0, 0))
+        self.overlays.fill(self.screen, (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT), (20, 0, 0), 200)
         
         # Game Over Text
         title = self.font_large.render("GAME OVER", True, RED)
@@ -1515,7 +1926,7 @@ class Game:
         self.screen.blit(title, title_rect)
         
         # Stats
-        stats_text = f"Waves Survived: {self.state.wave - 1}"
+        stats_text = f"Waves Survived: {self.snapshot.wave - 1}"
         stats = self.font.render(stats_text, True, WHITE)
         stats_rect = stats.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         self.screen.blit(stats, stats_rect)
@@ -1530,7 +1941,79 @@ class Game:
             retry = self.font.render("Press T to Retry Wave", True, GREEN)
             retry_rect = retry.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80))
             self.screen.blit(retry, retry_rect)
+
+        # Rewind Prompt
+        if len(self.sim.rewind):
+            rewind = self.font.render("Press B to Rewind", True, GREEN)
+            rewind_rect = rewind.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 110))
+            self.screen.blit(rewind, rewind_rect)
     
+    def draw_debug_overlay(self):
+        """Draw frame timing and quality level (F3)"""
+        budget = self.frame_budget
+        self.debug_lines = [
+            f"FPS: {int(self.clock.get_fps())}",
+            f"Quality: {budget.level_name} ({budget.level})",
+            f"Update: {budget.update_ms:.1f} ms | Draw: {budget.draw_ms:.1f} ms",
+            f"Sim tick: {self.sim.last_step_time * 1000:.1f} ms | Budget: {budget.budget_ms:.1f} ms",
+        ]
+        if self.memory is not None and self.snapshot is not None:
+            # Live instances vs. entities in play: a growing gap is a leak
+            snap = self.snapshot
+            in_play = {'Enemy': len(snap.enemies), 'Projectile': len(snap.projectiles), 'Drone': len(snap.drones),
+                       'GroundUnit': len(snap.ground_units), 'Building': len(snap.buildings)}
+            self.debug_lines.append("Live objects (in play):")
+            self.debug_lines += [f"  {name}: {count} ({in_play[name]})"
+                                 for name, count in self.memory.refresh_counts(COUNT_INTERVAL).items()]
+        
+        x, y = 10, 10
+        width = 300
+        height = len(self.debug_lines) * 20 + 10
+        pygame.draw.rect(self.screen, (20, 20, 20), (x, y, width, height))
+        pygame.draw.rect(self.screen, GRAY, (x, y, width, height), 1)
+        for i, line in enumerate(self.debug_lines):
+            self.screen.blit(self.font.render(line, True, YELLOW), (x + 8, y + 6 + i * 20))
+
+    def draw_profiler_overlay(self):
+        """Draw per-section tick and draw timings with rolling histograms (F4)"""
+        font = self.overlays.font(18)
+        snap = self.snapshot
+        if not self.profiler_lines or self.frame_count % PROFILER_REFRESH_FRAMES == 0:
+            # Rendering changing text is costly, so the numbers only update periodically
+            counts = "no game"
+            if snap is not None:
+                counts = (f"Enemies {len(snap.enemies)} | Projectiles {len(snap.projectiles)} | "
+                          f"Drones {len(snap.drones)} | Units {len(snap.ground_units)} | Buildings {len(snap.buildings)}")
+            lines = [(f"FPS: {int(self.clock.get_fps())}", None), (counts, None)]
+            for task in ('tick', 'draw', 'gc'):
+                rows = PROFILER.summary(task)
+                if not rows:
+                    continue # e.g. no collections yet
+                lines.append((f"{task} (ms)        mean    max   histogram", None))
+                for section, mean, peak, histogram in rows:
+                    lines.append((f"  {section:<13}{mean:>6.2f}{peak:>7.2f}", histogram))
+            self.profiler_lines = lines
+        lines = self.profiler_lines
+
+        x = 10
+        y = 10 + (len(self.debug_lines) * 20 + 20 if self.show_debug else 0)
+        width, line_height = 400, 16
+        height = len(lines) * line_height + 10
+        self.overlays.fill(self.screen, (x, y, width, height), (20, 20, 20), 220)
+        pygame.draw.rect(self.screen, GRAY, (x, y, width, height), 1)
+        bar_x = x + 260
+        for i, (text, histogram) in enumerate(lines):
+            line_y = y + 5 + i * line_height
+            self.screen.blit(font.render(text, True, YELLOW), (x + 8, line_y))
+            if histogram:
+                # One bar per bucket (<=0.1 ms ... >16 ms), scaled to the busiest bucket
+                tallest = max(histogram)
+                for b, count in enumerate(histogram):
+                    if count:
+                        bar = max(1, count * (line_height - 4) // tallest)
+                        color = GREEN if BUCKETS[b] <= 2.0 else YELLOW if BUCKETS[b] <= 8.0 else RED
+                        pygame.draw.rect(self.screen, color, (bar_x + b * 13, line_y + line_height - 3 - bar, 10, bar))
+
     def draw_help_menu(self):
         """Draw Help Screen Overlay"""
         # Dimensions
@@ -1590,7 +2073,7 @@ class Game:
         ]
         
         for tip in tips:
-            tip_surf = pygame.font.Font(None, 22).render(tip, True, WHITE)
+            tip_surf = self.overlays.font(22).render(tip, True, WHITE)
             self.screen.blit(tip_surf, (col1_x, current_y))
             current_y += 25
 
@@ -1611,7 +2094,7 @@ class Game:
             self.screen.blit(cat_surf, (col2_x, current_y))
             current_y += 25
             
-            desc_surf = pygame.font.Font(None, 20).render(desc, True, GRAY)
+            desc_surf = self.overlays.font(20).render(desc, True, GRAY)
             self.screen.blit(desc_surf, (col2_x, current_y))
             current_y += 35
             
@@ -1630,11 +2113,11 @@ class Game:
             self.screen.blit(t_surf, (col2_x, current_y))
             current_y += 20
             
-            r_surf = pygame.font.Font(None, 20).render(f"Rule: {rule}", True, (255, 200, 200))
+            r_surf = self.overlays.font(20).render(f"Rule: {rule}", True, (255, 200, 200))
             self.screen.blit(r_surf, (col2_x, current_y))
             current_y += 18
             
-            e_surf = pygame.font.Font(None, 20).render(f"Effect: {effect}", True, (200, 255, 200))
+            e_surf = self.overlays.font(20).render(f"Effect: {effect}", True, (200, 255, 200))
             self.screen.blit(e_surf, (col2_x, current_y))
             current_y += 30
 
@@ -1643,14 +2126,104 @@ class Game:
         footer_rect = footer.get_rect(center=(x + width//2, y + height - 30))
         self.screen.blit(footer, footer_rect)
 
+    def arm_wave_profile(self):
+        """F5: cProfile the next wave (runs on the simulation thread)"""
+        if self.sim.capture is not None and not self.sim.capture.finished:
+            self.notify("Already profiling this wave", "warning")
+            return
+        mode = self.sim.profile_mode or CAPTURE_MODES[0]
+        self.sim.profile_next = mode
+        self.notify(f"Profiling next wave ({mode})", None)
+
+    def save_finished_capture(self):
+        """Write a finished wave profile here, off the simulation thread"""
+        capture = self.sim.capture
+        if capture is not None and capture.finished:
+            self.sim.capture = None
+            self.sim.save_capture(capture)
+
+    def wants_idle(self) -> bool:
+        """True when nothing on screen moves on its own (menus, a settled build phase)"""
+        snap = self.snapshot
+        if self.menu_state == "PLAYING" and snap is not None and snap.phase == "combat":
+            return False
+        if self.replay_player is not None and not self.replay_player.finished:
+            return False
+        if self.particles.count or self.presented_keys is None or self.show_profiler:
+            return False
+        return self.sim.is_idle()
+
+    def run_idle_frame(self):
+        """Block until input, a message expiry or a new snapshot, then redraw if needed"""
+        timeout = IDLE_TIMEOUT_MS
+        if self.messages:
+            expires = min(m['timer'] for m in self.messages)
+            timeout = max(1, min(timeout, int(expires * 1000) + 1))
+
+        self.idle = True
+        if self.sim.snapshot is not self.snapshot:
+            # Published before we started waiting
+            timeout = 0
+        event = pygame.event.wait(timeout) if timeout else pygame.event.Event(pygame.NOEVENT)
+        self.idle = False
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events += pygame.event.get()
+        dt = self.clock.tick() / 1000.0
+
+        message_count = len(self.messages)
+        self.handle_input(events)
+        self.update(dt)
+        if events or len(self.messages) != message_count or self.sim.snapshot is not self.snapshot:
+            self.draw(self.sim.alpha())
+
     def run(self):
+        self.sim.start()
+        if self.hitches is not None:
+            self.hitches.start()
         while self.running:
+            self.save_finished_capture()
+            if self.wants_idle():
+                self.run_idle_frame()
+                continue
+            
             dt = self.clock.tick(FPS) / 1000.0  # Delta time in seconds
             
+            # F5 / --profile-wave frame mode: profile the whole frame while the wave runs
+            capture = self.sim.capture
+            if capture is not None and (capture.mode != 'frame' or capture.finished):
+                capture = None
+            if capture is not None:
+                capture.profile.enable()
+            if self.hitches is not None:
+                self.hitches.frame_started(self.sim.tick)
+            
             self.handle_input()
+            
+            update_start = time.perf_counter()
             self.update(dt)
-            self.draw()
-        
+            draw_start = time.perf_counter()
+            self.draw(self.sim.alpha())
+            draw_end = time.perf_counter()
+            if capture is not None:
+                capture.profile.disable()
+            if self.hitches is not None:
+                self.hitches.frame_finished(self, (draw_start - update_start) * 1000, (draw_end - draw_start) * 1000)
+            
+            # Ticks on the worker thread still compete for the CPU, so count them per frame
+            update_ms = (draw_start - update_start + self.sim.concurrent_step_time * SIM_RATE / FPS) * 1000
+            self.frame_budget.record(update_ms, (draw_end - draw_start) * 1000)
+            self.frame_count += 1
+        
+        self.sim.stop()
+        self.save_finished_capture()
+        if self.hitches is not None:
+            self.hitches.stop()
+        if self.telemetry is not None:
+            self.telemetry.stop()
+        if self.results is not None:
+            self.results.stop()
+        self.stop_recording()
+        self.autosave.stop()
         pygame.quit()
         sys.exit()
 
@@ -0,0 +1,132 @@
+import gc
+import os
+import time
+import tracemalloc
+from typing import Dict
+
+from src.core_data import Building, Drone, Enemy, GroundUnit, Projectile
+from src.profiler import PROFILE_DIR
+
+MEMORY_LOG = os.path.join(PROFILE_DIR, "memory.log")
+MEMORY_TOP = 15 # Allocation sites listed per checkpoint
+COUNT_INTERVAL = 2.0 # Seconds between live object counts (walking the heap is slow)
+ENTITY_CLASSES = (Enemy, Projectile, Drone, GroundUnit, Building)
+
+# Allocations made by the monitor itself and the import system aren't interesting
+TRACE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+class MemoryMonitor:
+    """Leak hunting aid (--memory-monitor): tracemalloc checkpoints per wave.
+
+    Registered as a simulation listener, it takes a tracemalloc snapshot when
+    a wave starts and when it ends, and appends to the memory log the top
+    allocation sites, the growth since the same checkpoint of the previous
+    wave, live instances of each entity class and stale targets (projectiles,
+    drones and ground units aiming at something no longer in play).
+    """
+
+    def __init__(self, path: str = MEMORY_LOG, top: int = MEMORY_TOP):
+        self.path = path
+        self.top = top
+        self.previous: Dict[str, tuple] = {} # 'start'/'end' -> (label, snapshot)
+        self.live_counts: Dict[str, int] = {} # Class name -> live instances
+        self.counted_at = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def on_wave_start(self, state):
+        self.checkpoint(state, 'start')
+
+    def on_wave_complete(self, state):
+        self.checkpoint(state, 'end')
+
+    def checkpoint(self, state, kind: str):
+        """Append a checkpoint to the memory log.
+
+        Runs on the simulation thread with the simulation lock held: the
+        tracemalloc snapshot, compare_to and the object walk stall ticks.
+        """
+        label = f"wave {state.wave} {kind}"
+        snapshot = tracemalloc.take_snapshot().filter_traces(TRACE_FILTERS)
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"=== {time.strftime('%Y-%m-%d %H:%M:%S')} {label}: "
+                 f"{current / 2**20:.1f} MB traced (peak {peak / 2**20:.1f} MB)"]
+
+        lines.append("Top allocation sites:")
+        lines += [f"  {stat}" for stat in snapshot.statistics('lineno')[:self.top]]
+
+        previous = self.previous.get(kind)
+        if previous is not None:
+            diffs = snapshot.compare_to(previous[1], 'lineno')
+            total = sum(stat.size_diff for stat in diffs)
+            lines.append(f"Growth since {previous[0]}: {total / 1024:+.1f} KiB")
+            lines += [f"  {stat}" for stat in diffs if stat.size_diff > 0][:self.top]
+        self.previous[kind] = (label, snapshot)
+
+        self.refresh_counts()
+        in_play = entities_in_play(state)
+        lines.append("Live objects (in play): " + ", ".join(
+            f"{name} {count} ({in_play[name]})" for name, count in self.live_counts.items()))
+        stale = stale_targets(state)
+        lines.append("Stale targets: " + (", ".join(f"{kind} {n}" for kind, n in stale.items() if n) or "none"))
+
+        self.write(lines)
+
+    def refresh_counts(self, interval: float = 0.0) -> Dict[str, int]:
+        """Count live entity instances (at most every `interval` seconds)"""
+        now = time.perf_counter()
+        if self.counted_at is None or now - self.counted_at >= interval:
+            self.counted_at = now
+            self.live_counts = count_instances(ENTITY_CLASSES)
+        return self.live_counts
+
+    def write(self, lines):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write("\n".join(lines) + "\n\n")
+        except OSError as e:
+            print(f"Memory log error: {e}")
+
+def count_instances(classes) -> Dict[str, int]:
+    """Live instances of each class, including ones no longer in play"""
+    counts = {cls: 0 for cls in classes}
+    # gc.get_objects() skips frozen objects (GCPolicy freezes the city during
+    # waves), so thaw them for the walk and freeze everything back after
+    frozen = gc.get_freeze_count()
+    if frozen:
+        gc.unfreeze()
+    try:
+        objects = gc.get_objects()
+    finally:
+        if frozen:
+            gc.freeze()
+    for obj in objects:
+        cls = type(obj)
+        if cls in counts:
+            counts[cls] += 1
+    return {cls.__name__: count for cls, count in counts.items()}
+
+def entities_in_play(state) -> Dict[str, int]:
+    combat = state.combat
+    return {'Enemy': len(combat.enemies), 'Projectile': len(combat.projectiles), 'Drone': len(combat.drones),
+            'GroundUnit': len(combat.ground_units), 'Building': len(state.grid.buildings)}
+
+def stale_targets(state) -> Dict[str, int]:
+    """Entities whose target has left play (killed, destroyed or cleaned up)"""
+    combat = state.combat
+    in_play = {id(e) for e in combat.enemies if e.alive}
+    in_play.update(id(u) for u in combat.ground_units if u.alive)
+    in_play.update(id(b) for b in state.grid.buildings)
+    return {kind: sum(1 for e in entities if e.target is not None and id(e.target) not in in_play)
+            for kind, entities in (('projectile', combat.projectiles), ('drone', combat.drones),
+                                   ('ground_unit', combat.ground_units))}
@@ -0,0 +1,71 @@
+import pygame
+
+from src.core_data import SCREEN_WIDTH, SCREEN_HEIGHT
+
+TEXT_CACHE_SIZE = 512 # Rendered strings kept per font
+
+class CachedFont:
+    """pygame Font whose render() results are reused while the text stays the same.
+
+    Returned surfaces are shared between calls, so callers must only blit them.
+    """
+
+    def __init__(self, font: pygame.font.Font):
+        self.font = font
+        self.cache = {}
+
+    def render(self, text, antialias, color, background=None) -> pygame.Surface:
+        key = (text, antialias, tuple(color), background and tuple(background))
+        surf = self.cache.pop(key, None)
+        if surf is None:
+            surf = self.font.render(text, antialias, color, background)
+            if len(self.cache) >= TEXT_CACHE_SIZE:
+                # Evict the least recently used string
+                del self.cache[next(iter(self.cache))]
+        self.cache[key] = surf # Re-insert as most recently used
+        return surf
+
+    def __getattr__(self, name):
+        return getattr(self.font, name)
+
+class OverlayPool:
+    """Reusable surfaces for translucent overlays and cached fonts.
+
+    Each (color, alpha) shade is one pre-sized translucent surface. Any
+    rectangle of that shade is drawn by blitting the matching area of it, so
+    full-screen dimming, message backgrounds and panels allocate nothing per
+    frame.
+    """
+
+    def __init__(self):
+        self.shades = {}
+        self.fonts = {}
+
+    def font(self, size: int) -> CachedFont:
+        """Default font at the given size, created once"""
+        font = self.fonts.get(size)
+        if font is None:
+            font = CachedFont(pygame.font.Font(None, size))
+            self.fonts[size] = font
+        return font
+
+    def shade(self, color, alpha: int, size=(SCREEN_WIDTH, SCREEN_HEIGHT)) -> pygame.Surface:
+        """Translucent fill surface at least ``size`` big"""
+        key = (tuple(color), alpha)
+        surf = self.shades.get(key)
+        if surf is None or surf.get_width() < size[0] or surf.get_height() < size[1]:
+            width = max(size[0], surf.get_width() if surf else 0)
+            height = max(size[1], surf.get_height() if surf else 0)
+            surf = pygame.Surface((width, height))
+            surf.fill(color)
+            surf.set_alpha(alpha)
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert()
+                surf.set_alpha(alpha)
+            self.shades[key] = surf
+        return surf
+
+    def fill(self, target: pygame.Surface, rect, color, alpha: int):
+        """Blend a translucent rectangle onto target"""
+        rect = pygame.Rect(rect)
+        target.blit(self.shade(color, alpha, rect.size), rect, (0, 0, rect.width, rect.height))
@@ -0,0 +1,138 @@
+import numpy as np
+import pygame
+
+from src.sprites import SpriteCache
+
+# Palettes per effect kind (color indices point into PALETTE)
+PALETTE = [
+    (255, 230, 120), # Flash
+    (255, 150, 0),   # Fire
+    (200, 50, 0),    # Embers
+    (0, 200, 255),   # Shield
+    (190, 245, 255), # Shield spark
+]
+EFFECT_COLORS = {
+    'explosion': np.array([0, 1, 1, 2]),
+    'shield_hit': np.array([3, 3, 4]),
+}
+
+# Particles shrink through these radii as they age
+STAGE_RADII = [1, 2, 3]
+
+GRAVITY = 120.0 # px/s^2
+DRAG = 1.5 # Fraction of velocity lost per second
+
+class ParticleSystem:
+    """Fixed-capacity particle pool stored as NumPy arrays.
+
+    Live particles are kept packed at the front of the arrays in spawn order,
+    so index 0 is always the oldest. Updates and culling are vectorized, and
+    the whole pool is drawn with one ``blits()`` call from pre-rendered dots.
+    When the pool is full, the oldest particles are recycled.
+    """
+
+    def __init__(self, capacity: int = 4000, sprites: SpriteCache = None):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32) # Seconds left
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.int16)
+        self.count = 0
+        self.rng = np.random.default_rng()
+        self.sprites = sprites or SpriteCache()
+        self.stage_sprites = None # Built on first draw (needs a display for convert)
+        self.stage_offsets = None
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, kind: str, x: float, y: float, size: float):
+        """Spawn a burst for a combat effect event"""
+        if kind == 'shield_hit':
+            # Sparks spray sideways and upward along the shield
+            n = int(min(80, 20 + size))
+            angle = self.rng.uniform(np.pi, 2 * np.pi, n)
+            speed = self.rng.uniform(40, 160, n)
+            life = self.rng.uniform(0.3, 0.7, n)
+            spread = size * 0.5
+        else:
+            n = int(min(300, 15 + size * 1.2))
+            angle = self.rng.uniform(0, 2 * np.pi, n)
+            speed = self.rng.uniform(20, 40 + size * 2.5, n)
+            life = self.rng.uniform(0.4, 0.9 + size / 200, n)
+            spread = size * 0.2
+
+        colors = EFFECT_COLORS.get(kind, EFFECT_COLORS['explosion'])
+        self.spawn(
+            np.column_stack((x + self.rng.uniform(-spread, spread, n), np.full(n, y))),
+            np.column_stack((np.cos(angle) * speed, np.sin(angle) * speed)),
+            life,
+            colors[self.rng.integers(0, len(colors), n)]
+        )
+
+    def spawn(self, pos, vel, life, color):
+        """Append particles, recycling the oldest ones if the pool is full"""
+        n = min(len(life), self.capacity)
+        pos, vel, life, color = pos[-n:], vel[-n:], life[-n:], color[-n:]
+
+        overflow = self.count + n - self.capacity
+        if overflow > 0:
+            keep = self.count - overflow
+            for arr in (self.pos, self.vel, self.life, self.max_life, self.color):
+                arr[:keep] = arr[overflow:self.count]
+            self.count = keep
+
+        end = self.count + n
+        self.pos[self.count:end] = pos
+        self.vel[self.count:end] = vel
+        self.life[self.count:end] = life
+        self.max_life[self.count:end] = life
+        self.color[self.count:end] = color
+        self.count = end
+
+    def update(self, dt: float):
+        """Integrate motion and drop expired particles"""
+        n = self.count
+        if n == 0:
+            return
+        vel = self.vel[:n]
+        vel[:, 1] += GRAVITY * dt
+        vel *= max(0.0, 1.0 - DRAG * dt)
+        self.pos[:n] += vel * dt
+        self.life[:n] -= dt
+
+        alive = self.life[:n] > 0
+        if alive.all():
+            return
+        # Compact survivors to the front, preserving spawn order
+        live = np.flatnonzero(alive)
+        self.count = len(live)
+        for arr in (self.pos, self.vel, self.life, self.max_life, self.color):
+            arr[:self.count] = arr[live]
+
+    def build_sprites(self):
+        """One pre-rendered dot per (color, stage)"""
+        self.stage_sprites = []
+        offsets = []
+        for color in PALETTE:
+            for radius in STAGE_RADII:
+                surf, offset = self.sprites.circle(color, radius)
+                self.stage_sprites.append(surf)
+                offsets.append(offset)
+        self.stage_offsets = np.array(offsets, dtype=np.float32)
+
+    def draw(self, surface: pygame.Surface):
+        n = self.count
+        if n == 0:
+            return
+        if self.stage_sprites is None:
+            self.build_sprites()
+
+        stages = len(STAGE_RADII)
+        stage = np.minimum((self.life[:n] / self.max_life[:n] * stages).astype(np.intp), stages - 1)
+        index = self.color[:n].astype(np.intp) * stages + stage
+        corners = (self.pos[:n] + self.stage_offsets[index]).astype(np.int32)
+
+        sprites = self.stage_sprites
+        surface.blits(list(zip([sprites[i] for i in index.tolist()], corners.tolist())), False)
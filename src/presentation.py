@@ -0,0 +1,95 @@
+import pygame
+
+from src.core_data import SCREEN_WIDTH, SCREEN_HEIGHT
+
+class Presenter:
+    """Pushes the fixed-resolution virtual screen to the (resizable) window.
+
+    Two paths are supported:
+    - 1:1: the window fits exactly one native-scale frame, so the game draws
+      straight into a subsurface of the window. Presenting is just
+      ``display.update(rects)``; nothing is copied or scaled.
+    - Scaled: the game draws into an offscreen surface and each dirty region
+      is scaled directly into a preallocated subsurface of the window.
+    """
+
+    def __init__(self, display_surface: pygame.Surface):
+        self.offscreen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.screen = None
+        self.configure(display_surface)
+
+    def configure(self, display_surface: pygame.Surface):
+        """Recompute scale/offset after the window has been (re)created"""
+        self.display_surface = display_surface
+        window_w, window_h = display_surface.get_size()
+        self.scale = min(window_w / SCREEN_WIDTH, window_h / SCREEN_HEIGHT)
+
+        new_w = int(SCREEN_WIDTH * self.scale)
+        new_h = int(SCREEN_HEIGHT * self.scale)
+        self.frame_rect = pygame.Rect((window_w - new_w) // 2, (window_h - new_h) // 2, new_w, new_h)
+
+        self.native = self.frame_rect.size == (SCREEN_WIDTH, SCREEN_HEIGHT)
+        if self.native:
+            # Draw directly into the window
+            self.screen = display_surface.subsurface(self.frame_rect)
+        else:
+            self.screen = self.offscreen
+
+        # Destination subsurfaces of the window, keyed by virtual rect
+        self.targets = {}
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Force the next present to push the whole window"""
+        self.full_redraw = True
+
+    def window_rect(self, rect: pygame.Rect) -> pygame.Rect:
+        """Map a rect in virtual screen coordinates to window coordinates"""
+        left = int(rect.left * self.scale)
+        top = int(rect.top * self.scale)
+        right = int(rect.right * self.scale)
+        bottom = int(rect.bottom * self.scale)
+        return pygame.Rect(self.frame_rect.x + left, self.frame_rect.y + top, right - left, bottom - top)
+
+    def present(self, dirty_rects):
+        """Push the given virtual-screen regions (or everything) to the window"""
+        if self.full_redraw:
+            self.clear_borders()
+            dirty_rects = [self.screen.get_rect()]
+
+        updates = []
+        bounds = self.screen.get_rect()
+        for rect in dirty_rects:
+            rect = pygame.Rect(rect).clip(bounds)
+            target_rect = self.window_rect(rect)
+            if target_rect.width <= 0 or target_rect.height <= 0:
+                continue
+
+            if not self.native:
+                key = tuple(rect)
+                target = self.targets.get(key)
+                if target is None:
+                    target = self.display_surface.subsurface(target_rect)
+                    self.targets[key] = target
+                pygame.transform.scale(self.screen.subsurface(rect), target_rect.size, target)
+            updates.append(target_rect)
+
+        if self.full_redraw:
+            pygame.display.flip()
+            self.full_redraw = False
+        elif updates:
+            pygame.display.update(updates)
+
+    def clear_borders(self):
+        """Fill the letterbox area around the frame"""
+        window_w, window_h = self.display_surface.get_size()
+        frame = self.frame_rect
+        borders = [
+            (0, 0, window_w, frame.top),
+            (0, frame.bottom, window_w, window_h - frame.bottom),
+            (0, frame.top, frame.left, frame.height),
+            (frame.right, frame.top, window_w - frame.right, frame.height),
+        ]
+        for border in borders:
+            if border[2] > 0 and border[3] > 0:
+                self.display_surface.fill((0, 0, 0), border)
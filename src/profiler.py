@@ -0,0 +1,134 @@
+import cProfile
+import os
+import pstats
+import time
+from collections import deque
+from typing import Dict, List, Tuple
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, float('inf'))
+
+PROFILE_DIR = "profiles" # Where wave captures are written
+PROFILE_TOP = 40 # Functions listed in each capture's text summary
+CAPTURE_MODES = ('combat', 'frame')
+
+class Profiler:
+    """Section timers for repeated tasks ('tick', 'draw') with rolling histories.
+
+    Call begin(task), lap(task, section) after each section, then end(task).
+    Each section keeps its last ``history`` samples (ms). While disabled every
+    call returns straight away, so the calls can stay in the hot paths.
+    Tasks may run on different threads (one thread per task). count(event)
+    tallies notable events (e.g. building cascades) until take_events().
+    """
+
+    def __init__(self, history: int = 240):
+        self.enabled = False
+        self.history = history
+        self.samples: Dict[str, Dict[str, deque]] = {} # task -> section -> ms samples
+        self.started: Dict[str, float] = {} # task -> perf_counter at begin()
+        self.last: Dict[str, float] = {} # task -> perf_counter at the last lap
+        self.events: Dict[str, int] = {} # event -> times counted since take_events()
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = enabled
+        if not enabled:
+            self.samples.clear()
+            self.started.clear()
+            self.last.clear()
+            self.events = {}
+
+    def begin(self, task: str):
+        if self.enabled:
+            self.started[task] = self.last[task] = time.perf_counter()
+
+    def lap(self, task: str, section: str):
+        """Record the time since begin() or the previous lap as `section`"""
+        if self.enabled:
+            now = time.perf_counter()
+            last = self.last.get(task)
+            if last is not None: # Enabled mid-task: wait for the next begin()
+                self.add(task, section, (now - last) * 1000)
+                self.last[task] = now
+
+    def end(self, task: str):
+        """Record the whole task as its 'total' section"""
+        if self.enabled:
+            started = self.started.pop(task, None)
+            self.last.pop(task, None)
+            if started is not None:
+                self.add(task, 'total', (time.perf_counter() - started) * 1000)
+
+    def add(self, task: str, section: str, ms: float):
+        sections = self.samples.setdefault(task, {})
+        samples = sections.get(section)
+        if samples is None:
+            samples = sections[section] = deque(maxlen=self.history)
+        samples.append(ms)
+
+    def count(self, event: str):
+        if self.enabled:
+            self.events[event] = self.events.get(event, 0) + 1
+
+    def take_events(self) -> Dict[str, int]:
+        """Events counted since the last call"""
+        events, self.events = self.events, {}
+        return events
+
+    def recent(self, task: str, samples: int = 1) -> Dict[str, float]:
+        """Slowest of the last `samples` timings (ms) of each section"""
+        recent = {}
+        for section, values in list(self.samples.get(task, {}).items()):
+            values = list(values)[-samples:]
+            if values:
+                recent[section] = max(values)
+        return recent
+
+    def summary(self, task: str) -> List[Tuple[str, float, float, List[int]]]:
+        """(section, mean ms, max ms, histogram counts per BUCKETS) in recording order, total last"""
+        rows = []
+        total = None
+        for section, samples in list(self.samples.get(task, {}).items()):
+            values = list(samples) # Snapshot: the owning thread keeps appending
+            if not values:
+                continue
+            counts = [0] * len(BUCKETS)
+            for value in values:
+                counts[next(i for i, bound in enumerate(BUCKETS) if value <= bound)] += 1
+            row = (section, sum(values) / len(values), max(values), counts)
+            if section == 'total':
+                total = row
+            else:
+                rows.append(row)
+        if total:
+            rows.append(total)
+        return rows
+
+# Shared instance used by the combat update and the renderer
+PROFILER = Profiler()
+
+class WaveCapture:
+    """cProfile recording of one wave.
+
+    In 'combat' mode only CombatManager.update calls are profiled (on the
+    simulation's thread); in 'frame' mode the main thread's whole frame loop
+    is. The owner enables the profile and calls write() when the wave ends.
+    """
+
+    def __init__(self, mode: str, wave: int):
+        self.mode = mode
+        self.wave = wave
+        self.profile = cProfile.Profile()
+        self.finished = False # Wave over; waiting to be written
+
+    def write(self, directory: str = PROFILE_DIR, top: int = PROFILE_TOP) -> str:
+        """Write <name>.pstats and a top-N <name>.txt summary. Returns the .pstats path."""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"wave{self.wave:03d}-{self.mode}-{time.strftime('%Y%m%d-%H%M%S')}")
+        self.profile.dump_stats(base + ".pstats")
+        with open(base + ".txt", "w") as f:
+            f.write(f"Wave {self.wave}, {self.mode} profile\n")
+            stats = pstats.Stats(self.profile, stream=f)
+            stats.sort_stats('cumulative').print_stats(top)
+            stats.sort_stats('tottime').print_stats(top)
+        return base + ".pstats"
@@ -0,0 +1,159 @@
+import json
+import os
+import struct
+import time
+import zlib
+from typing import List, NamedTuple, Optional
+
+from src.commands import apply_command
+from src.core_data import StateSnapshot
+from src.savegame import SaveError, atomic_write, decode_snapshot, encode_snapshot, state_from_snapshot
+from src.simulation import Simulation
+
+# File layout: header (magic, format version) followed by a zlib-compressed JSON payload
+MAGIC = b"SKYR"
+HEADER = struct.Struct(">4sH")
+REPLAY_VERSION = 1
+
+class ReplayCommand(NamedTuple):
+    tick: int # Ticks since the start of the recording; applied before that tick's update
+    name: str # A name from commands.COMMANDS, or 'retry' / 'rewind'
+    args: tuple
+
+class ReplayOutcome(NamedTuple):
+    wave: int
+    phase: str
+    credits: int
+    buildings: int
+    game_over: bool
+
+class Replay(NamedTuple):
+    dt: float # Simulation tick length the session ran at
+    seed: Optional[int] # RNG seed of a new game (None if recorded from a loaded save)
+    start: StateSnapshot
+    commands: List[ReplayCommand]
+    ticks: int # Length of the session in ticks
+    outcome: Optional[ReplayOutcome] # Where the recorded session ended
+
+def outcome_of(state, game_over: bool) -> ReplayOutcome:
+    return ReplayOutcome(state.wave, state.phase, int(state.credits), len(state.grid.buildings), game_over)
+
+class ReplayRecorder:
+    """Collects the commands of one game session (new game or load until the next one)"""
+
+    def __init__(self, start: StateSnapshot, dt: float, start_tick: int, seed: Optional[int] = None):
+        self.start = start
+        self.dt = dt
+        self.seed = seed
+        self.start_tick = start_tick
+        self.commands: List[ReplayCommand] = []
+
+    def record(self, tick: int, name: str, args: tuple = ()):
+        self.commands.append(ReplayCommand(tick - self.start_tick, name, tuple(args)))
+
+    def finish(self, state, tick: int, game_over: bool) -> Replay:
+        return Replay(self.dt, self.seed, self.start, list(self.commands),
+                      tick - self.start_tick, outcome_of(state, game_over))
+
+def encode_replay(replay: Replay) -> bytes:
+    payload = {
+        'dt': replay.dt,
+        'seed': replay.seed,
+        'start': encode_snapshot(replay.start),
+        'commands': [[c.tick, c.name] + list(c.args) for c in replay.commands],
+        'ticks': replay.ticks,
+        'outcome': None if replay.outcome is None else list(replay.outcome),
+    }
+    blob = zlib.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8'), 6)
+    return HEADER.pack(MAGIC, REPLAY_VERSION) + blob
+
+def decode_replay(blob: bytes) -> Replay:
+    if len(blob) < HEADER.size or not blob.startswith(MAGIC):
+        raise SaveError("Not a replay file")
+    _, version = HEADER.unpack_from(blob)
+    if version != REPLAY_VERSION:
+        raise SaveError(f"Unsupported replay version {version}")
+    try:
+        data = json.loads(zlib.decompress(blob[HEADER.size:]).decode('utf-8'))
+        outcome = data['outcome']
+        return Replay(
+            dt=data['dt'],
+            seed=data['seed'],
+            start=decode_snapshot(data['start']),
+            commands=[ReplayCommand(c[0], c[1], tuple(c[2:])) for c in data['commands']],
+            ticks=data['ticks'],
+            outcome=None if outcome is None else ReplayOutcome(*outcome)
+        )
+    except (zlib.error, UnicodeDecodeError, ValueError, KeyError, IndexError, TypeError) as e:
+        raise SaveError(f"Corrupt replay: {e}") from e
+
+def write_replay(path: str, replay: Replay):
+    atomic_write(path, encode_replay(replay))
+
+def session_replay_path(path: str, taken=()) -> str:
+    """'session.rpl' -> 'session-20260101-120000.rpl', a new file for every session"""
+    root, ext = os.path.splitext(path)
+    candidate = f"{root}-{time.strftime('%Y%m%d-%H%M%S')}{ext}"
+    base, n = candidate, 2
+    while candidate in taken or os.path.exists(candidate):
+        candidate = f"{os.path.splitext(base)[0]}-{n}{ext}"
+        n += 1
+    return candidate
+
+def read_replay(path: str) -> Replay:
+    with open(path, "rb") as f:
+        return decode_replay(f.read())
+
+class ReplayPlayer:
+    """Simulation listener that re-issues recorded commands on their ticks.
+
+    Attach to a Simulation whose state was built from ``replay.start`` and
+    whose tick counter matches ``start_tick``.
+    """
+
+    def __init__(self, replay: Replay, sim: Simulation, start_tick: int = 0):
+        self.replay = replay
+        self.sim = sim
+        self.start_tick = start_tick
+        self.next_command = 0
+        self.saved_state = replay.start # Retry point, as kept by the game
+
+    @property
+    def finished(self) -> bool:
+        return self.sim.tick - self.start_tick >= self.replay.ticks
+
+    def on_tick(self, state, tick: int):
+        commands = self.replay.commands
+        tick -= self.start_tick
+        while self.next_command < len(commands) and commands[self.next_command].tick <= tick:
+            command = commands[self.next_command]
+            self.next_command += 1
+            self.apply(state, command)
+
+    def apply(self, state, command: ReplayCommand):
+        if command.name == 'retry':
+            state.restore(self.saved_state)
+            self.sim.game_over = False
+        elif command.name == 'rewind':
+            frame = self.sim.rewind.seek(state, *command.args)
+            if frame is not None:
+                self.sim.rewind_to(frame)
+        else:
+            apply_command(state, command.name, command.args)
+
+    def on_wave_complete(self, state):
+        self.saved_state = state.snapshot()
+
+def play_headless(replay: Replay, listeners=()):
+    """Re-run a replay as fast as possible. Returns (outcome, seconds taken)."""
+    sim = Simulation(replay.dt)
+    sim.state = state_from_snapshot(replay.start)
+    player = ReplayPlayer(replay, sim)
+    sim.add_listener(player)
+    for listener in listeners:
+        sim.add_listener(listener)
+
+    started = time.perf_counter()
+    while not player.finished:
+        sim.step()
+    return outcome_of(sim.state, sim.game_over), time.perf_counter() - started
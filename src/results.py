@@ -0,0 +1,181 @@
+import hashlib
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import List, Tuple
+
+RESULTS_DB = "results.db"
+BATCH_WAVES = 50 # Most waves written in one transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS waves (
+    run TEXT NOT NULL,
+    wave INTEGER NOT NULL,
+    result TEXT NOT NULL,            -- 'complete' or 'game_over'
+    layout_hash TEXT NOT NULL,       -- Buildings (type, level, position) at the start of the wave
+    buildings INTEGER NOT NULL,      -- At the start of the wave
+    buildings_lost INTEGER NOT NULL,
+    shield_min REAL NOT NULL,
+    invaders_spawned INTEGER NOT NULL,
+    kills INTEGER NOT NULL,
+    reward_base INTEGER,             -- WaveRewards (NULL if the base fell)
+    reward_perfect_bonus INTEGER,
+    reward_energy_bonus INTEGER,
+    reward_repair_cost INTEGER,
+    reward_total INTEGER,
+    ticks INTEGER NOT NULL,
+    tick_ms REAL NOT NULL,           -- Total time in combat updates
+    wall_seconds REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS building_kills (
+    run TEXT NOT NULL,
+    wave INTEGER NOT NULL,
+    building_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    column_index INTEGER NOT NULL,
+    row_index INTEGER NOT NULL,
+    kills INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS waves_by_wave ON waves (wave);
+"""
+
+def layout_hash(grid) -> str:
+    cells = sorted((b.template.type.value, b.template.level, b.column, b.row) for b in grid.buildings)
+    return hashlib.blake2b(repr(cells).encode('utf-8'), digest_size=8).hexdigest()
+
+class WaveResults:
+    """Writes one summary row per wave to a SQLite database (--results-db).
+
+    Registered as a simulation listener: it notes the layout, buildings and
+    time when a wave starts, tracks the shield minimum and combat update time
+    each tick, and when the wave ends (or the base falls) queues a row for
+    the `waves` table plus one `building_kills` row per building that killed
+    something. A rewind takes the shield minimum and tick totals back to the
+    restored moment (and resumes a wave the base had already lost). A
+    background thread inserts queued waves in batched transactions. Every
+    game session or headless run gets its own `run` id.
+    """
+
+    def __init__(self, path: str = RESULTS_DB):
+        self.path = path
+        self.run = uuid.uuid4().hex
+        self.jobs = queue.SimpleQueue() # (wave row, kill rows) or None to stop
+        self.thread = None
+        self.wave_start = None # (perf_counter, layout hash, {building id: building}) of the current wave
+        self.last_wave_start = None # Kept after the row is queued, for a rewind past game over
+        self.shield_min = 0.0
+        self.ticks = 0
+        self.tick_seconds = 0.0
+        self.progress: List[Tuple[float, float]] = [] # (shield_min, tick_seconds) after each tick, for rewinds
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run_writer, name="results", daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Write queued waves and stop the writer"""
+        if self.thread is not None:
+            self.jobs.put(None)
+            self.thread.join(timeout)
+            self.thread = None
+
+    def new_run(self):
+        """Start a new run id (e.g. a new game)"""
+        self.run = uuid.uuid4().hex
+        self.wave_start = None
+        self.last_wave_start = None
+
+    # --- Simulation hooks ---
+
+    def on_wave_start(self, state):
+        buildings = {b.id: b for b in state.grid.buildings}
+        self.wave_start = (time.perf_counter(), layout_hash(state.grid), buildings)
+        self.last_wave_start = None
+        self.shield_min = state.shield_current_hp
+        self.ticks = 0
+        self.tick_seconds = 0.0
+        self.progress = []
+
+    def on_combat_tick(self, state, tick: int, seconds: float):
+        self.shield_min = min(self.shield_min, state.shield_current_hp)
+        self.ticks += 1
+        self.tick_seconds += seconds
+        self.progress.append((self.shield_min, self.tick_seconds))
+
+    def on_rewind(self, state, ticks: int):
+        if self.wave_start is None:
+            if self.last_wave_start is None:
+                return
+            self.wave_start, self.last_wave_start = self.last_wave_start, None
+        del self.progress[ticks:]
+        self.ticks = len(self.progress)
+        self.shield_min, self.tick_seconds = self.progress[-1] if self.progress else (state.shield_current_hp, 0.0)
+
+    def on_wave_complete(self, state):
+        self.finish_wave(state, 'complete')
+
+    def on_game_over(self, state):
+        self.finish_wave(state, 'game_over')
+
+    def finish_wave(self, state, result: str):
+        if self.wave_start is None:
+            return # Joined mid-wave (e.g. a save loaded during combat)
+        started, layout, buildings = self.wave_start
+        self.wave_start = None
+        if result == 'game_over':
+            self.last_wave_start = (started, layout, buildings)
+        combat = state.combat
+        alive = {b.id for b in state.grid.buildings}
+        rewards = state.last_wave_rewards if result == 'complete' else None
+        wave_row = (
+            self.run, state.wave, result, layout, len(buildings), len(set(buildings) - alive),
+            round(self.shield_min, 2), combat.invaders_spawned, sum(combat.kills.values()),
+        ) + ((rewards.base, rewards.perfect_bonus, rewards.energy_bonus, rewards.repair_cost, rewards.total)
+             if rewards else (None,) * 5) + (
+            self.ticks, round(self.tick_seconds * 1000, 3), round(time.perf_counter() - started, 3), time.time(),
+        )
+        kill_rows = []
+        for building_id, kills in sorted(combat.kills.items()):
+            building = buildings.get(building_id) or state.grid.get_building(building_id)
+            if building is not None:
+                kill_rows.append((self.run, state.wave, building_id, building.template.type.value,
+                                  building.template.level, building.column, building.row, kills))
+        self.start()
+        self.jobs.put((wave_row, kill_rows))
+
+    # --- Writer thread ---
+
+    def run_writer(self):
+        try:
+            connection = sqlite3.connect(self.path)
+            connection.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            print(f"Results database error: {e}")
+            return
+        stopping = False
+        while not stopping:
+            batch = [self.jobs.get()]
+            while len(batch) < BATCH_WAVES:
+                try:
+                    batch.append(self.jobs.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stopping = True
+                batch = [job for job in batch if job is not None]
+            if not batch:
+                continue
+            try:
+                with connection: # One transaction per batch
+                    connection.executemany(f"INSERT INTO waves VALUES ({', '.join('?' * 18)})",
+                                           [wave_row for wave_row, _ in batch])
+                    connection.executemany("INSERT INTO building_kills VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                           [row for _, kill_rows in batch for row in kill_rows])
+            except sqlite3.Error as e:
+                print(f"Results database error: {e}")
+        connection.close()
@@ -0,0 +1,263 @@
+from array import array
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional, Tuple
+
+from src.core_data import DAMAGE_SOURCES, Building, BuildingRecord, Drone, Enemy, GroundUnit, Projectile, get_building_template
+
+def _saved_fields(cls) -> Tuple[str, ...]:
+    # Targets are object references (stored separately)
+    return tuple(f.name for f in fields(cls) if f.name != 'target')
+
+ENEMY_FIELDS = _saved_fields(Enemy)
+PROJECTILE_FIELDS = _saved_fields(Projectile)
+DRONE_FIELDS = _saved_fields(Drone)
+GROUND_UNIT_FIELDS = _saved_fields(GroundUnit)
+
+@dataclass(frozen=True)
+class RewindFrame:
+    """One recorded moment of a wave.
+
+    Keyframes (``base is None``) hold every building as (BuildingRecord,
+    cooldown). Delta frames hold only buildings whose (hp, spawn_timer,
+    cooldown) differ from their keyframe, plus the ids destroyed since it.
+    Entities and scalars are always stored in full: they change every tick.
+    """
+    time: float # Seconds into the wave
+    base: Optional['RewindFrame']
+    buildings: tuple
+    removed: Tuple[int, ...]
+    credits: int
+    shield_current_hp: float
+    shield_is_active: bool
+    enemies_remaining: int
+    spawn_timer: float
+    wave_complete_timer: float
+    damage_taken_this_wave: bool
+    damage_dealt: Tuple[int, ...] # In DAMAGE_SOURCES order
+    kills: Tuple[Tuple[int, int], ...] # (building id, kills)
+    invaders_spawned: int
+    enemies: tuple
+    projectiles: tuple
+    drones: tuple
+    ground_units: tuple
+    rng_state: bytes # Mersenne Twister state packed as uint32s
+
+    @property
+    def is_keyframe(self) -> bool:
+        return self.base is None
+
+class RewindBuffer:
+    """Bounded history of the current wave for scrubbing backwards.
+
+    A frame is recorded every ``interval`` seconds, with a full keyframe every
+    ``keyframe_every`` frames and deltas in between. When the buffer is full
+    every other delta is dropped and the interval doubles, so the whole wave
+    stays reachable at a coarser resolution and memory stays capped.
+    """
+
+    def __init__(self, capacity: int = 120, interval: float = 1.0, keyframe_every: int = 10):
+        self.capacity = capacity
+        self.base_interval = interval
+        self.keyframe_every = keyframe_every
+        self.clear()
+
+    def clear(self):
+        self.frames: List[RewindFrame] = []
+        self.interval = self.base_interval
+        self.wave = None # Wave object the frames belong to
+        self.clock = 0.0 # Seconds into the wave (moves back on rewind)
+        self.since_keyframe = 0
+
+    def __len__(self):
+        return len(self.frames)
+
+    # --- Recording ---
+
+    def record(self, state, dt: float):
+        """Call once per combat tick; captures a frame when the interval has passed"""
+        combat = state.combat
+        if combat.current_wave is None:
+            return
+        if combat.current_wave is not self.wave:
+            self.clear()
+            self.wave = combat.current_wave
+        else:
+            self.clock += dt
+            if self.clock - self.frames[-1].time < self.interval:
+                return
+
+        if len(self.frames) >= self.capacity:
+            self.decimate()
+
+        keyframe = None
+        if self.frames and self.since_keyframe < self.keyframe_every - 1:
+            last = self.frames[-1]
+            keyframe = last if last.is_keyframe else last.base
+        self.frames.append(capture_frame(state, self.clock, keyframe))
+        self.since_keyframe = 0 if keyframe is None else self.since_keyframe + 1
+
+    def decimate(self):
+        """Halve the history resolution to make room"""
+        deltas = [i for i, frame in enumerate(self.frames) if not frame.is_keyframe]
+        if deltas:
+            drop = set(deltas[1::2]) or set(deltas)
+        else:
+            drop = set(range(1, len(self.frames), 2))
+        self.frames = [frame for i, frame in enumerate(self.frames) if i not in drop]
+        self.interval *= 2
+
+    # --- Scrubbing ---
+
+    def seek(self, state, seconds_back: float) -> Optional[RewindFrame]:
+        """Latest frame at least seconds_back ago (or the oldest one) in state's current wave"""
+        if not self.frames or state.combat.current_wave is not self.wave:
+            return None
+        target = self.clock - seconds_back
+        for frame in reversed(self.frames):
+            if frame.time <= target:
+                return frame
+        return self.frames[0]
+
+    def rewind(self, state, frame: RewindFrame):
+        """Restore a recorded frame and forget everything after it"""
+        restore_frame(state, frame)
+        index = self.frames.index(frame)
+        del self.frames[index + 1:]
+        self.clock = frame.time
+        # Later deltas chain from the restored frame's keyframe again
+        self.since_keyframe = index - self.frames.index(frame.base) if frame.base else 0
+
+def _building_runtime(building) -> tuple:
+    return (building.current_hp, building.spawn_timer, getattr(building, 'cooldown', 0.0))
+
+def capture_frame(state, time: float, keyframe: Optional[RewindFrame]) -> RewindFrame:
+    combat = state.combat
+    buildings = state.grid.buildings
+
+    if keyframe is None:
+        building_data = tuple(
+            (BuildingRecord(b.id, b.template.type, b.template.level, b.current_hp, b.column, b.row, b.spawn_timer),
+             getattr(b, 'cooldown', 0.0))
+            for b in buildings
+        )
+        removed = ()
+    else:
+        base = {record.id: (record.current_hp, record.spawn_timer, cooldown)
+                for record, cooldown in keyframe.buildings}
+        building_data = tuple((b.id,) + _building_runtime(b) for b in buildings
+                              if base.get(b.id) != _building_runtime(b))
+        present = {b.id for b in buildings}
+        removed = tuple(i for i in base if i not in present)
+
+    # Targets are stored as indices so frames hold no live objects
+    enemy_index = {id(e): i for i, e in enumerate(combat.enemies)}
+    unit_index = {id(u): i for i, u in enumerate(combat.ground_units)}
+
+    def enemy_ref(target):
+        return enemy_index.get(id(target)) if target is not None else None
+
+    def unit_target_ref(target):
+        if target is None:
+            return None
+        if isinstance(target, Building):
+            return ('building', target.id)
+        index = unit_index.get(id(target))
+        return None if index is None else ('unit', index)
+
+    wave = combat.current_wave
+    return RewindFrame(
+        time=time,
+        base=keyframe,
+        buildings=building_data,
+        removed=removed,
+        credits=state.credits,
+        shield_current_hp=state.shield_current_hp,
+        shield_is_active=state.shield_is_active,
+        enemies_remaining=wave.enemies_remaining,
+        spawn_timer=wave.spawn_timer,
+        wave_complete_timer=combat.wave_complete_timer,
+        damage_taken_this_wave=combat.damage_taken_this_wave,
+        damage_dealt=tuple(combat.damage_dealt[source] for source in DAMAGE_SOURCES),
+        kills=tuple(combat.kills.items()),
+        invaders_spawned=combat.invaders_spawned,
+        enemies=tuple(tuple(getattr(e, f) for f in ENEMY_FIELDS) for e in combat.enemies),
+        projectiles=tuple(tuple(getattr(p, f) for f in PROJECTILE_FIELDS) + (enemy_ref(p.target),)
+                          for p in combat.projectiles),
+        drones=tuple(tuple(getattr(d, f) for f in DRONE_FIELDS) + (enemy_ref(d.target),)
+                     for d in combat.drones),
+        ground_units=tuple(tuple(getattr(u, f) for f in GROUND_UNIT_FIELDS) + (unit_target_ref(u.target),)
+                           for u in combat.ground_units),
+        rng_state=_pack_rng(state.rng.getstate())
+    )
+
+def restore_frame(state, frame: RewindFrame):
+    combat = state.combat
+    keyframe = frame.base or frame
+
+    # Buildings: keyframe, minus destroyed, with changed runtime values
+    changed: Dict[int, tuple] = {}
+    if frame.base is not None:
+        changed = {entry[0]: entry[1:] for entry in frame.buildings}
+    removed = set(frame.removed)
+    buildings = []
+    for record, cooldown in keyframe.buildings:
+        if record.id in removed:
+            continue
+        hp, spawn_timer, cooldown = changed.get(record.id, (record.current_hp, record.spawn_timer, cooldown))
+        building = Building(id=record.id, template=get_building_template(record.type, record.level),
+                            current_hp=hp, column=record.column, row=record.row, spawn_timer=spawn_timer)
+        building.cooldown = cooldown
+        buildings.append(building)
+    state.grid.buildings = buildings
+    buildings_by_id = {b.id: b for b in buildings}
+
+    enemies = [Enemy(**dict(zip(ENEMY_FIELDS, values))) for values in frame.enemies]
+
+    def enemy_at(index):
+        return enemies[index] if index is not None else None
+
+    projectiles = []
+    for values in frame.projectiles:
+        projectile = Projectile(**dict(zip(PROJECTILE_FIELDS, values)))
+        projectile.target = enemy_at(values[-1])
+        projectiles.append(projectile)
+
+    drones = []
+    for values in frame.drones:
+        drone = Drone(**dict(zip(DRONE_FIELDS, values)))
+        drone.target = enemy_at(values[-1])
+        drones.append(drone)
+
+    units = [GroundUnit(**dict(zip(GROUND_UNIT_FIELDS, values))) for values in frame.ground_units]
+    for unit, values in zip(units, frame.ground_units):
+        ref = values[-1]
+        if ref is not None:
+            kind, key = ref
+            unit.target = buildings_by_id.get(key) if kind == 'building' else units[key]
+
+    combat.enemies = enemies
+    combat.projectiles = projectiles
+    combat.drones = drones
+    combat.ground_units = units
+    combat.current_wave.enemies_remaining = frame.enemies_remaining
+    combat.current_wave.spawn_timer = frame.spawn_timer
+    combat.wave_complete_timer = frame.wave_complete_timer
+    combat.damage_taken_this_wave = frame.damage_taken_this_wave
+    combat.damage_dealt = dict(zip(DAMAGE_SOURCES, frame.damage_dealt))
+    combat.kills = dict(frame.kills)
+    combat.invaders_spawned = frame.invaders_spawned
+    combat.effects.clear()
+
+    state.credits = frame.credits
+    state.rng.setstate(_unpack_rng(frame.rng_state))
+    state.update_economy()
+    state.shield_current_hp = min(frame.shield_current_hp, state.shield_max_hp)
+    state.shield_is_active = frame.shield_is_active
+
+def _pack_rng(rng_state) -> bytes:
+    version, internal, gauss = rng_state
+    # gauss_next is only set by Random.gauss(), which the game never calls
+    return array('I', internal).tobytes()
+
+def _unpack_rng(packed: bytes):
+    return (3, tuple(array('I', packed)), None)
@@ -0,0 +1,159 @@
+import json
+import os
+import pickle
+import struct
+import zlib
+from typing import Callable, Dict
+
+from src.core_data import BuildingRecord, BuildingType, GameState, StateSnapshot, WaveRewards
+
+# File layout: header (magic, schema version, flags) followed by a JSON payload
+MAGIC = b"SKYG"
+HEADER = struct.Struct(">4sHH")
+SAVE_VERSION = 2
+FLAG_ZLIB = 1
+
+class SaveError(Exception):
+    """Unreadable, corrupt or too-new save file"""
+    pass
+
+def _add_playtime(data: dict) -> dict:
+    # v2: total playtime is stored with the game
+    return dict(data, playtime=0.0)
+
+# Schema migrations: MIGRATIONS[n] upgrades a version n payload (dict) to version n + 1
+MIGRATIONS: Dict[int, Callable[[dict], dict]] = {
+    1: _add_playtime,
+}
+
+def encode_snapshot(snapshot: StateSnapshot) -> dict:
+    """StateSnapshot -> JSON-ready payload"""
+    rewards = snapshot.last_wave_rewards
+    rng_version, rng_internal, rng_gauss = snapshot.rng_state
+    return {
+        'credits': snapshot.credits,
+        'wave': snapshot.wave,
+        'phase': snapshot.phase,
+        'unlocked': [snapshot.unlocked_start, snapshot.unlocked_width],
+        'next_building_id': snapshot.next_building_id,
+        # (id, type, level, column, row, hp, spawn_timer)
+        'buildings': [[b.id, b.type.value, b.level, b.column, b.row, b.current_hp, b.spawn_timer]
+                      for b in snapshot.buildings],
+        'shield': [snapshot.shield_current_hp, snapshot.shield_is_active],
+        'selected': [snapshot.selected_column, snapshot.selected_row],
+        'last_wave_rewards': None if rewards is None else [
+            rewards.base, rewards.perfect_bonus, rewards.energy_bonus, rewards.repair_cost, rewards.total
+        ],
+        'rng': [rng_version, list(rng_internal), rng_gauss],
+        'playtime': snapshot.playtime,
+    }
+
+def decode_snapshot(data: dict) -> StateSnapshot:
+    """Current-version payload -> StateSnapshot"""
+    try:
+        rewards = data['last_wave_rewards']
+        rng_version, rng_internal, rng_gauss = data['rng']
+        return StateSnapshot(
+            credits=data['credits'],
+            wave=data['wave'],
+            phase=data['phase'],
+            unlocked_start=data['unlocked'][0],
+            unlocked_width=data['unlocked'][1],
+            next_building_id=data['next_building_id'],
+            buildings=tuple(
+                BuildingRecord(id=b[0], type=BuildingType(b[1]), level=b[2], current_hp=b[5],
+                               column=b[3], row=b[4], spawn_timer=b[6])
+                for b in data['buildings']
+            ),
+            shield_current_hp=data['shield'][0],
+            shield_is_active=data['shield'][1],
+            selected_column=data['selected'][0],
+            selected_row=data['selected'][1],
+            last_wave_rewards=None if rewards is None else WaveRewards(*rewards),
+            rng_state=(rng_version, tuple(rng_internal), rng_gauss),
+            playtime=data['playtime']
+        )
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        raise SaveError(f"Malformed save data: {e}") from e
+
+def migrate(data: dict, version: int) -> dict:
+    """Bring an older payload up to SAVE_VERSION"""
+    if version > SAVE_VERSION:
+        raise SaveError(f"Save version {version} is newer than this game ({SAVE_VERSION})")
+    while version < SAVE_VERSION:
+        step = MIGRATIONS.get(version)
+        if step is None:
+            raise SaveError(f"No migration from save version {version}")
+        data = step(data)
+        version += 1
+    return data
+
+def encode_save(snapshot: StateSnapshot, compress: bool = True) -> bytes:
+    payload = json.dumps(encode_snapshot(snapshot), separators=(',', ':')).encode('utf-8')
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload, 6)
+        flags |= FLAG_ZLIB
+    return HEADER.pack(MAGIC, SAVE_VERSION, flags) + payload
+
+def decode_save(blob: bytes) -> StateSnapshot:
+    """Parse a save file's bytes. Legacy pickled GameState files are converted."""
+    if not blob.startswith(MAGIC):
+        return load_legacy_pickle(blob)
+    if len(blob) < HEADER.size:
+        raise SaveError("Truncated save header")
+
+    _, version, flags = HEADER.unpack_from(blob)
+    payload = blob[HEADER.size:]
+    try:
+        if flags & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        data = json.loads(payload.decode('utf-8'))
+    except (zlib.error, UnicodeDecodeError, ValueError) as e:
+        raise SaveError(f"Corrupt save payload: {e}") from e
+    return decode_snapshot(migrate(data, version))
+
+def load_legacy_pickle(blob: bytes) -> StateSnapshot:
+    """Saves written before the versioned format were a pickled GameState"""
+    try:
+        state = pickle.loads(blob)
+    except Exception as e:
+        raise SaveError(f"Unrecognized save file: {e}") from e
+    if not isinstance(state, GameState):
+        raise SaveError("Unrecognized save file")
+    return state.snapshot()
+
+def write_save(path: str, snapshot: StateSnapshot, compress: bool = True):
+    """Atomically replace path: write a temp file, fsync, then rename over the old save"""
+    atomic_write(path, encode_save(snapshot, compress))
+
+def atomic_write(path: str, blob: bytes):
+    """Write-then-rename so readers only ever see the old or the new file"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    # Persist the rename itself (not supported on every platform)
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def read_save(path: str) -> StateSnapshot:
+    with open(path, "rb") as f:
+        return decode_save(f.read())
+
+def state_from_snapshot(snapshot: StateSnapshot) -> GameState:
+    """Fresh GameState rebuilt from a snapshot"""
+    state = GameState()
+    state.restore(snapshot)
+    state.playtime = snapshot.playtime
+    return state
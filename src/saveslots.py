@@ -0,0 +1,114 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.core_data import BuildingType, StateSnapshot, get_building_template
+from src.savegame import SaveError, atomic_write, read_save
+
+SAVE_DIR = "saves"
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+
+# Manual slots (slot 1 keeps the original single-save filename) plus the autosave
+SLOT_FILES = ["savegame.dat", "slot2.dat", "slot3.dat"]
+AUTOSAVE_FILE = "autosave.dat"
+
+# One character per building type in the thumbnail ('.' = empty)
+THUMBNAIL_CODES = {
+    BuildingType.POWER_PLANT: 'P',
+    BuildingType.DATACENTER: 'D',
+    BuildingType.CAPACITOR: 'C',
+    BuildingType.TURRET: 'T',
+    BuildingType.DRONE_FACTORY: 'F',
+    BuildingType.BARRACKS: 'B',
+}
+THUMBNAIL_COLUMNS = 32
+THUMBNAIL_ROWS = 12
+
+def make_thumbnail(snapshot: StateSnapshot) -> List[str]:
+    """Tiny text picture of the grid, top row first"""
+    cells = [['.'] * THUMBNAIL_COLUMNS for _ in range(THUMBNAIL_ROWS)]
+    for b in snapshot.buildings:
+        width, height = get_building_template(b.type, b.level).footprint
+        code = THUMBNAIL_CODES[b.type]
+        for column in range(b.column, min(b.column + width, THUMBNAIL_COLUMNS)):
+            for row in range(b.row, min(b.row + height, THUMBNAIL_ROWS)):
+                cells[THUMBNAIL_ROWS - 1 - row][column] = code
+    return [''.join(row) for row in cells]
+
+def slot_metadata(snapshot: StateSnapshot, timestamp: Optional[float] = None) -> dict:
+    return {
+        'wave': snapshot.wave,
+        'credits': snapshot.credits,
+        'buildings': len(snapshot.buildings),
+        'playtime': round(snapshot.playtime, 1),
+        'timestamp': time.time() if timestamp is None else timestamp,
+        'thumbnail': make_thumbnail(snapshot),
+    }
+
+class SaveIndex:
+    """Per-slot metadata kept in saves/index.json.
+
+    The index is all the load menu needs, so listing slots never opens a
+    save file. It is updated by whoever writes a save (the autosave thread)
+    and filled in from the save files only for saves it has no entry for.
+    """
+
+    def __init__(self, directory: str = SAVE_DIR):
+        self.directory = directory
+        self.path = os.path.join(directory, INDEX_FILE)
+        self.lock = threading.Lock()
+        self.entries: Dict[str, dict] = None # filename -> metadata, loaded lazily
+
+    def load(self) -> Dict[str, dict]:
+        with self.lock:
+            if self.entries is None:
+                try:
+                    with open(self.path) as f:
+                        data = json.load(f)
+                    self.entries = data['slots'] if data.get('version') == INDEX_VERSION else {}
+                except (OSError, ValueError, KeyError):
+                    self.entries = {}
+            return self.entries
+
+    def record(self, filename: str, snapshot: StateSnapshot):
+        """Update one slot's metadata after its save file was written"""
+        self.load()
+        with self.lock:
+            self.entries[filename] = slot_metadata(snapshot)
+            self.write()
+
+    def write(self):
+        blob = json.dumps({'version': INDEX_VERSION, 'slots': self.entries}, separators=(',', ':'))
+        atomic_write(self.path, blob.encode('utf-8'))
+
+    def list_slots(self) -> List[Tuple[str, Optional[dict]]]:
+        """(filename, metadata or None if empty) for every slot, autosave last"""
+        entries = self.load()
+        missing = []
+        slots = []
+        for filename in SLOT_FILES + [AUTOSAVE_FILE]:
+            exists = os.path.exists(os.path.join(self.directory, filename))
+            meta = entries.get(filename) if exists else None
+            if exists and meta is None:
+                missing.append(filename)
+            slots.append([filename, meta])
+
+        if missing:
+            # Saves written before the index existed: read them once
+            with self.lock:
+                for filename in missing:
+                    path = os.path.join(self.directory, filename)
+                    try:
+                        self.entries[filename] = slot_metadata(read_save(path), os.path.getmtime(path))
+                    except (OSError, SaveError):
+                        continue
+                try:
+                    self.write()
+                except OSError:
+                    pass
+            slots = [[filename, self.entries.get(filename) if filename in missing else meta]
+                     for filename, meta in slots]
+        return [tuple(slot) for slot in slots]
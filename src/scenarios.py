@@ -0,0 +1,196 @@
+import hashlib
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from src.commands import start_wave
+from src.core_data import BuildingType, CityGrid, CombatManager, GameState
+from src.rewind import DRONE_FIELDS, ENEMY_FIELDS, GROUND_UNIT_FIELDS, PROJECTILE_FIELDS
+from src.simulation import Simulation
+
+# Scripted, seeded combat scenarios for checking that optimized code paths
+# play out exactly like the reference ones (see benchmarks/golden.py).
+
+DT = 1.0 / 30 # The game's fixed tick (SIM_RATE in src/main.py)
+MAX_WAVE_TICKS = 30 * 300 # Give up on a wave after five minutes of game time
+DIGEST_PLACES = 6 # Floats are rounded before hashing so harmless rounding noise doesn't count
+
+# --- Layouts ---
+
+def layout_line(grid: CityGrid):
+    """A single row of power plants and turrets: weak, so buildings fall"""
+    start, end = grid.unlocked_range
+    for column in range(start, end):
+        grid.place_building(BuildingType.POWER_PLANT if column % 3 == 0 else BuildingType.TURRET, column, 0)
+
+def layout_stacked(grid: CityGrid):
+    """Three-high towers, so losses cascade through the buildings above"""
+    grid.unlock_column("left")
+    grid.unlock_column("right")
+    start, end = grid.unlocked_range
+    stack = [BuildingType.POWER_PLANT, BuildingType.DATACENTER, BuildingType.TURRET]
+    for column in range(start, end):
+        for row, building_type in enumerate(stack):
+            if column % 4 == 3 and row == 2:
+                building_type = BuildingType.DRONE_FACTORY
+            grid.place_building(building_type, column, row)
+
+def layout_fortress(grid: CityGrid):
+    """Every column unlocked, upgraded turrets, drones and barracks"""
+    while grid.unlock_column("left") or grid.unlock_column("right"):
+        pass
+    start, end = grid.unlocked_range
+    ground = [BuildingType.POWER_PLANT, BuildingType.TURRET, BuildingType.BARRACKS, BuildingType.TURRET]
+    for column in range(start, end):
+        grid.place_building(ground[column % len(ground)], column, 0)
+    for column in range(start, end, 2):
+        grid.place_building(BuildingType.DRONE_FACTORY if column % 8 == 0 else BuildingType.TURRET, column, 1)
+    for building in list(grid.buildings):
+        if building.template.type == BuildingType.TURRET and building.row == 0:
+            grid.upgrade_building(building.id)
+
+LAYOUTS: Dict[str, Callable[[CityGrid], None]] = {
+    'line': layout_line,
+    'stacked': layout_stacked,
+    'fortress': layout_fortress,
+}
+
+class Scenario(NamedTuple):
+    name: str
+    seed: int
+    layout: str # Key into LAYOUTS
+    first_wave: int # Wave number of the first wave played
+    waves: int # Number of waves played back to back (the base is not repaired)
+    credits: int = 100000
+
+# Waves 1-30, including the boss waves (every 10th)
+SCENARIOS: List[Scenario] = [
+    Scenario("opening", 1, 'line', 1, 3),
+    Scenario("stacked-5", 2, 'stacked', 4, 2),
+    Scenario("boss-10", 3, 'stacked', 10, 1),
+    Scenario("siege-15", 4, 'line', 15, 1),
+    Scenario("boss-20", 5, 'fortress', 20, 1),
+    Scenario("late-25", 6, 'stacked', 25, 1),
+    Scenario("boss-30", 7, 'fortress', 30, 1),
+]
+
+class ScenarioOutcome(NamedTuple):
+    wave: int
+    phase: str
+    credits: int
+    buildings: int
+    game_over: bool
+    ticks: int
+
+class ScenarioRun(NamedTuple):
+    scenario: Scenario
+    digests: List[bytes] # One per tick, after that tick's update
+    outcome: ScenarioOutcome
+    seconds: float # Time spent in simulation updates (digests excluded)
+
+def build_state(scenario: Scenario, grid_class=CityGrid, combat_class=CombatManager) -> GameState:
+    state = GameState(credits=scenario.credits, wave=scenario.first_wave - 1)
+    state.rng.seed(scenario.seed)
+    state.grid = grid_class()
+    LAYOUTS[scenario.layout](state.grid)
+    state.combat = combat_class(state)
+    state.update_economy()
+    state.shield_current_hp = state.shield_max_hp
+    return state
+
+# --- Digests ---
+
+# Field names of each row kind, for reporting what diverged
+ROW_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'state': ('credits', 'wave', 'phase', 'shield_current_hp', 'shield_is_active',
+              'enemies_remaining', 'spawn_timer', 'damage_taken_this_wave'),
+    'building': ('type', 'level', 'column', 'row', 'current_hp', 'spawn_timer', 'cooldown'),
+    'enemy': ENEMY_FIELDS,
+    'projectile': PROJECTILE_FIELDS,
+    'drone': DRONE_FIELDS,
+    'ground_unit': GROUND_UNIT_FIELDS,
+}
+
+def _round(values) -> tuple:
+    return tuple(round(v, DIGEST_PLACES) if isinstance(v, float) else v for v in values)
+
+def state_rows(state) -> List[Tuple[str, int, tuple]]:
+    """Everything gameplay depends on, as (kind, id or index, values) rows"""
+    combat = state.combat
+    wave = combat.current_wave
+    rows = [('state', 0, _round((
+        state.credits, state.wave, state.phase, state.shield_current_hp, state.shield_is_active,
+        wave.enemies_remaining if wave else 0, wave.spawn_timer if wave else 0.0,
+        combat.damage_taken_this_wave
+    )))]
+    rows += [('building', b.id, _round((b.template.type.value, b.template.level, b.column, b.row,
+                                        b.current_hp, b.spawn_timer, getattr(b, 'cooldown', 0.0))))
+             for b in state.grid.buildings]
+    for kind, entities in (('enemy', combat.enemies), ('projectile', combat.projectiles),
+                           ('drone', combat.drones), ('ground_unit', combat.ground_units)):
+        fields = ROW_FIELDS[kind]
+        rows += [(kind, i, _round(getattr(e, f) for f in fields)) for i, e in enumerate(entities)]
+    return rows
+
+def digest(rows) -> bytes:
+    return hashlib.blake2b(repr(rows).encode('utf-8'), digest_size=8).digest()
+
+# --- Running ---
+
+def run_scenario(scenario: Scenario, grid_class=CityGrid, combat_class=CombatManager,
+                 stop_tick: Optional[int] = None, record_digests: bool = True, max_ticks: Optional[int] = None):
+    """Play a scenario headless (at most max_ticks). With stop_tick, returns the state after that tick instead."""
+    sim = Simulation(DT)
+    sim.state = state = build_state(scenario, grid_class, combat_class)
+    digests = []
+    tick = 0
+    seconds = 0.0
+
+    for _ in range(scenario.waves):
+        start_wave(state)
+        wave_ticks = 0
+        while state.phase == "combat" and not sim.game_over and wave_ticks < MAX_WAVE_TICKS:
+            started = time.perf_counter()
+            sim.update(DT)
+            seconds += time.perf_counter() - started
+            if record_digests:
+                digests.append(digest(state_rows(state)))
+            if tick == stop_tick:
+                return state
+            tick += 1
+            wave_ticks += 1
+            if tick == max_ticks:
+                break
+        if sim.game_over or tick == max_ticks:
+            break
+
+    if stop_tick is not None:
+        return state
+    outcome = ScenarioOutcome(state.wave, state.phase, int(state.credits), len(state.grid.buildings),
+                              sim.game_over, tick)
+    return ScenarioRun(scenario, digests, outcome, seconds)
+
+def first_divergence(reference: ScenarioRun, candidate: ScenarioRun) -> Optional[int]:
+    """First tick whose digest differs (or where one run ended early), else None"""
+    for tick, (a, b) in enumerate(zip(reference.digests, candidate.digests)):
+        if a != b:
+            return tick
+    if len(reference.digests) != len(candidate.digests):
+        return min(len(reference.digests), len(candidate.digests))
+    return None
+
+def diff_rows(reference_rows, candidate_rows) -> List[str]:
+    """Describe the differing entities (first one first)"""
+    reference = {(kind, key): values for kind, key, values in reference_rows}
+    candidate = {(kind, key): values for kind, key, values in candidate_rows}
+    lines = []
+    for kind, key, values in reference_rows:
+        other = candidate.get((kind, key))
+        if other is None:
+            lines.append(f"{kind} {key}: missing in candidate")
+        elif other != values:
+            changes = [f"{name} {a!r} -> {b!r}" for name, a, b in zip(ROW_FIELDS[kind], values, other) if a != b]
+            lines.append(f"{kind} {key}: " + ", ".join(changes))
+    for kind, key, values in candidate_rows:
+        if (kind, key) not in reference:
+            lines.append(f"{kind} {key}: only in candidate")
+    return lines
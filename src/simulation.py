@@ -0,0 +1,440 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import NamedTuple, Optional, Tuple
+
+from src.core_data import BuildingType, WaveRewards
+from src.rewind import RewindBuffer
+from src.profiler import WaveCapture
+
+IDLE_TIMEOUT = 0.5 # Seconds an idle worker sleeps before re-checking
+
+class EnemyView(NamedTuple):
+    x: float
+    y: float
+    prev_x: float
+    prev_y: float
+    radius: int
+    hp_ratio: float
+    is_boss: bool
+
+class ProjectileView(NamedTuple):
+    x: float
+    y: float
+    prev_x: float
+    prev_y: float
+    radius: int
+    source: str
+
+class DroneView(NamedTuple):
+    x: float
+    y: float
+    prev_x: float
+    prev_y: float
+    hp_ratio: float
+
+class GroundUnitView(NamedTuple):
+    x: float
+    y: float
+    prev_x: float
+    prev_y: float
+    team: str
+    hp_ratio: float
+
+class BuildingView(NamedTuple):
+    id: int
+    type: BuildingType
+    level: int
+    tier: int
+    column: int
+    row: int
+    width: int
+    height: int
+    current_hp: int
+    max_hp: int
+
+@dataclass(frozen=True)
+class RenderSnapshot:
+    """Immutable copy of everything the renderer needs for one sim tick"""
+    tick: int
+    time: float # perf_counter() when published
+    phase: str
+    wave: int
+    credits: int
+    energy_production: int
+    energy_consumption: int
+    shield_recharge_rate: float
+    shield_current_hp: float
+    shield_max_hp: int
+    shield_is_active: bool
+    max_columns: int
+    rows: int
+    unlocked_range: Tuple[int, int]
+    selected: Tuple[int, int] # Cursor cell (column, row)
+    buildings: Tuple[BuildingView, ...]
+    enemies: Tuple[EnemyView, ...]
+    projectiles: Tuple[ProjectileView, ...]
+    drones: Tuple[DroneView, ...]
+    ground_units: Tuple[GroundUnitView, ...]
+    enemies_remaining: Optional[int] # None outside of an active wave
+    invaders: int
+    defenders: int
+    drone_capacity: int
+    barracks_capacity: int
+    logs: Tuple[str, ...]
+    last_wave_rewards: Optional[WaveRewards]
+    game_over: bool
+
+    @property
+    def energy_surplus(self) -> int:
+        return self.energy_production - self.energy_consumption
+
+def _prev(entity):
+    """Previous position, falling back to the current one (e.g. old saves)"""
+    if entity.prev_x is None:
+        return entity.x, entity.y
+    return entity.prev_x, entity.prev_y
+
+def capture_snapshot(state, tick: int, game_over: bool) -> RenderSnapshot:
+    """Copy the render-relevant parts of a GameState into a RenderSnapshot"""
+    combat = state.combat
+    grid = state.grid
+
+    buildings = []
+    drone_capacity = 0
+    barracks_capacity = 0
+    for b in grid.buildings:
+        template = b.template
+        width, height = template.footprint
+        buildings.append(BuildingView(b.id, template.type, template.level, template.tier, b.column, b.row,
+                                      width, height, b.current_hp, template.max_hp))
+        if template.type == BuildingType.DRONE_FACTORY:
+            drone_capacity += template.capacity
+        elif template.type == BuildingType.BARRACKS:
+            barracks_capacity += template.capacity
+
+    enemies = tuple(EnemyView(e.x, e.y, *_prev(e), e.radius, max(0, e.current_hp) / e.max_hp, e.is_boss)
+                    for e in combat.enemies if e.alive)
+    projectiles = tuple(ProjectileView(p.x, p.y, *_prev(p), p.radius, p.source)
+                        for p in combat.projectiles if p.alive)
+    drones = tuple(DroneView(d.x, d.y, *_prev(d), max(0, d.hp) / d.max_hp)
+                   for d in combat.drones if d.alive)
+    ground_units = tuple(GroundUnitView(u.x, u.y, *_prev(u), u.team, max(0, u.hp) / u.max_hp)
+                         for u in combat.ground_units if u.alive)
+    invaders = sum(1 for u in ground_units if u.team == "invader")
+
+    return RenderSnapshot(
+        tick=tick,
+        time=time.perf_counter(),
+        phase=state.phase,
+        wave=state.wave,
+        credits=state.credits,
+        energy_production=state.energy_production,
+        energy_consumption=state.energy_consumption,
+        shield_recharge_rate=state.shield_recharge_rate,
+        shield_current_hp=state.shield_current_hp,
+        shield_max_hp=state.shield_max_hp,
+        shield_is_active=state.shield_is_active,
+        max_columns=grid.max_columns,
+        rows=grid.rows,
+        unlocked_range=grid.unlocked_range,
+        selected=(state.selected_column, state.selected_row),
+        buildings=tuple(buildings),
+        enemies=enemies,
+        projectiles=projectiles,
+        drones=drones,
+        ground_units=ground_units,
+        enemies_remaining=combat.current_wave.enemies_remaining if combat.current_wave else None,
+        invaders=invaders,
+        defenders=len(ground_units) - invaders,
+        drone_capacity=drone_capacity,
+        barracks_capacity=barracks_capacity,
+        logs=tuple(state.logs[-8:]),
+        last_wave_rewards=state.last_wave_rewards,
+        game_over=game_over
+    )
+
+class Simulation:
+    """Fixed-step game simulation driven from the main loop.
+
+    All mutations of the GameState happen inside ``step``: queued commands
+    (player input) are applied first, then one tick of game logic runs, then a
+    new RenderSnapshot is published. The renderer only ever reads snapshots.
+    """
+
+    def __init__(self, dt: float, max_steps: int = 5, notify=None, is_active=None):
+        self.dt = dt
+        self.max_steps = max_steps
+        self.state = None
+        self.tick = 0
+        self.game_over = False
+        self.notify = notify or (lambda text, tone: None)
+        self.is_active = is_active or (lambda: True)
+        self.listeners = []
+        self.commands = queue.SimpleQueue()
+        self.lock = threading.RLock() # Held while the state is being mutated
+        self.snapshot: Optional[RenderSnapshot] = None
+        self.accumulator = 0.0
+        self.last_step_time = 0.0 # Seconds spent in the last step
+        self.wake = threading.Event() # Set whenever a command is submitted
+        self.rewind = RewindBuffer() # Recent history of the current wave
+        self.profile_mode = None # cProfile every wave in this mode ('combat' or 'frame')
+        self.profile_next = None # cProfile only the next wave in this mode
+        self.capture: Optional[WaveCapture] = None # Wave being profiled
+        self.last_wave = None # Wave object seen by the last combat tick
+        self.tick_playtime = True # Add dt to playtime per tick (off when the owner counts wall-clock time)
+
+    @property
+    def concurrent_step_time(self) -> float:
+        """Tick cost spent outside the caller's frame (seconds)"""
+        return 0.0
+
+    def start(self):
+        """Ticking is driven by advance() on the caller's thread"""
+        pass
+
+    def stop(self):
+        pass
+
+    # --- Commands & listeners ---
+
+    def submit(self, command, *args):
+        """Queue a callable to run on the simulation at the next tick boundary"""
+        self.commands.put((command, args))
+        self.wake.set()
+
+    def add_listener(self, listener):
+        """Register an object with optional on_tick(state, tick), on_wave_complete(state), on_rewind(state, ticks), on_effects(effects) hooks"""
+        self.listeners.append(listener)
+
+    def emit(self, event: str, *args):
+        for listener in self.listeners:
+            handler = getattr(listener, event, None)
+            if handler:
+                handler(*args)
+
+    def run_commands(self) -> bool:
+        """Apply all pending commands. Returns True if any ran."""
+        ran = False
+        while True:
+            try:
+                command, args = self.commands.get_nowait()
+            except queue.Empty:
+                return ran
+            command(*args)
+            ran = True
+
+    def is_idle(self) -> bool:
+        """True when ticking would change nothing until the next command"""
+        state = self.state
+        if state is None or not self.is_active():
+            return True
+        if state.phase == "combat":
+            return False
+        # Build phase: only credit drain and shield recharge move on their own
+        return state.energy_surplus >= 0 and state.shield_current_hp >= state.shield_max_hp
+
+    # --- Stepping ---
+
+    def advance(self, frame_dt: float):
+        """Run as many fixed ticks as the elapsed frame time allows"""
+        self.accumulator += frame_dt
+        steps = 0
+        while self.accumulator >= self.dt and steps < self.max_steps:
+            self.step()
+            self.accumulator -= self.dt
+            steps += 1
+        if steps == self.max_steps:
+            self.accumulator = min(self.accumulator, self.dt)
+        if steps == 0 and not self.commands.empty():
+            # Keep menus responsive between ticks
+            with self.lock:
+                if self.run_commands():
+                    self.publish()
+
+    def alpha(self) -> float:
+        """Interpolation factor between the snapshot's previous and current state"""
+        return min(1.0, self.accumulator / self.dt)
+
+    def step(self):
+        """Apply pending commands and advance the game by one fixed tick"""
+        started = time.perf_counter()
+        with self.lock:
+            self.run_commands()
+            if self.state is not None and self.is_active():
+                self.emit('on_tick', self.state, self.tick)
+                self.update(self.dt)
+                self.tick += 1
+            self.publish()
+        self.last_step_time = time.perf_counter() - started
+
+    def publish(self):
+        if self.state is not None:
+            self.snapshot = capture_snapshot(self.state, self.tick, self.game_over)
+
+    def update(self, dt):
+        """One tick of game logic"""
+        state = self.state
+        prev_phase = state.phase
+        if self.tick_playtime:
+            state.playtime += dt
+
+        if state.phase == "combat":
+            if state.combat.current_wave is not self.last_wave:
+                self.last_wave = state.combat.current_wave
+                self.start_capture(state.wave)
+                self.emit('on_wave_start', state)
+            capture = self.capture
+            started = time.perf_counter()
+            if capture is not None and capture.mode == 'combat' and not capture.finished:
+                capture.profile.runcall(state.combat.update, dt)
+            else:
+                state.combat.update(dt)
+            self.emit('on_combat_tick', state, self.tick, time.perf_counter() - started)
+
+        # Hand this tick's visual effects (explosions, shield impacts) to the renderer
+        if state.combat.effects:
+            self.emit('on_effects', tuple(state.combat.effects))
+            state.combat.effects.clear()
+
+        # Detect phase change to build
+        if prev_phase == "combat" and state.phase == "build":
+            self.notify("Wave Complete!", "success")
+            self.emit('on_wave_complete', state)
+            self.finish_capture()
+
+        # Energy Deficit Penalty (Credit Drain)
+        if state.energy_surplus < 0:
+            # Drain 1 credit per unit of deficit per second
+            drain_rate = abs(state.energy_surplus) * 1.0
+            drain_amount = drain_rate * dt
+
+            if state.credits > 0:
+                state.credits = max(0, state.credits - drain_amount)
+                state.credits = int(state.credits) # Keep it int for simplicity in UI
+            # If no credits, shield fails to recharge (handled below)
+
+        # Shield recharge (always active)
+        # If energy is negative, shield only recharges if we have credits to burn
+        can_recharge = state.energy_surplus >= 0 or state.credits > 0
+
+        if state.shield_current_hp < state.shield_max_hp and can_recharge:
+            recharge = state.shield_recharge_rate * dt
+            state.shield_current_hp = min(
+                state.shield_max_hp,
+                state.shield_current_hp + recharge
+            )
+
+            # Check for reactivation (25% threshold)
+            if not state.shield_is_active:
+                threshold = state.shield_max_hp * 0.25
+                if state.shield_current_hp >= threshold:
+                    state.shield_is_active = True
+                    self.notify("SHIELD ONLINE", "success")
+                    state.add_log("Shield Systems Restored")
+
+        # Check loss condition
+        if not state.grid.buildings and state.wave > 0 and state.phase == "combat":  # No buildings left
+            if not self.game_over:
+                self.game_over = True
+                self.notify("CRITICAL FAILURE: BASE DESTROYED", "alert")
+                self.finish_capture()
+                self.emit('on_game_over', state)
+
+        if state.phase == "combat" and not self.game_over:
+            self.rewind.record(state, dt)
+
+    def rewind_to(self, frame):
+        """Restore a frame of the current wave and tell listeners how many combat ticks into the wave it is"""
+        self.rewind.rewind(self.state, frame)
+        self.game_over = False
+        # The wave's first combat tick records the frame at time 0
+        self.emit('on_rewind', self.state, round(frame.time / self.dt) + 1)
+
+    # --- Wave profiling ---
+
+    def start_capture(self, wave: int):
+        mode = self.profile_next or self.profile_mode
+        if mode and self.capture is None:
+            self.capture = WaveCapture(mode, wave)
+            self.profile_next = None
+
+    def finish_capture(self):
+        """End of the profiled wave; the owner (the game's main thread) writes it with save_capture"""
+        if self.capture is not None:
+            self.capture.finished = True
+
+    def save_capture(self, capture: WaveCapture):
+        try:
+            path = capture.write()
+            self.notify(f"Profile saved: {path}", "success")
+        except OSError as e:
+            self.notify(f"Profile Failed: {e}", "alert")
+
+class ThreadedSimulation(Simulation):
+    """Simulation that ticks on its own worker thread.
+
+    Snapshots are double-buffered by reference: each tick builds a brand new
+    immutable RenderSnapshot off to the side and publishes it with a single
+    attribute assignment, so the renderer never sees a half-written frame.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    @property
+    def concurrent_step_time(self) -> float:
+        return self.last_step_time
+
+    def start(self):
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name="simulation", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def advance(self, frame_dt: float):
+        """Ticking happens on the worker thread"""
+        pass
+
+    def alpha(self) -> float:
+        snapshot = self.snapshot
+        if snapshot is None:
+            return 1.0
+        return max(0.0, min(1.0, (time.perf_counter() - snapshot.time) / self.dt))
+
+    def publish(self):
+        super().publish()
+        # Lets an idle renderer wake up for the new frame
+        self.emit('on_publish')
+
+    def run(self):
+        next_tick = time.perf_counter()
+        while not self.stop_event.is_set():
+            if self.is_idle():
+                # Nothing to simulate: sleep until a command arrives
+                if self.wake.wait(IDLE_TIMEOUT):
+                    self.wake.clear()
+                    self.step()
+                next_tick = time.perf_counter() + self.dt
+                continue
+
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self.stop_event.wait(delay)
+                continue
+
+            self.step()
+            next_tick += self.dt
+
+            # Drop the backlog instead of spiralling after a long stall
+            if time.perf_counter() - next_tick > self.dt * self.max_steps:
+                next_tick = time.perf_counter()
@@ -0,0 +1,104 @@
+import pygame
+
+# Transparent key for pre-rendered shapes (never used as a game color)
+COLORKEY = (255, 0, 255)
+
+ENEMY_COLOR = (255, 0, 0)
+BOSS_COLOR = (148, 0, 211) # Dark Violet
+DRONE_COLOR = (0, 255, 255)
+TURRET_SHOT_COLOR = (255, 255, 0)
+OTHER_SHOT_COLOR = (255, 0, 0)
+INVADER_COLOR = (255, 0, 0)
+DEFENDER_COLOR = (0, 100, 255)
+
+DRONE_SIZE = 8
+GROUND_UNIT_SIZE = 10
+
+class SpriteCache:
+    """Entity sprites rendered once and reused every frame.
+
+    Each sprite is returned together with the offset from the entity position
+    to the sprite's top-left corner, so callers can build ``blits()`` batches
+    without any per-entity drawing calls. Unit sprites come from the atlas
+    (``AssetManager``) once it has loaded; until then simple shapes are used.
+    """
+
+    def __init__(self, assets=None):
+        self.sprites = {}
+        self.assets = assets
+
+    def atlas_sprite(self, name, size, offset):
+        """Pre-scaled atlas view for a unit, or None while assets are loading"""
+        key = ('atlas', name, size)
+        sprite = self.sprites.get(key)
+        if sprite is None and self.assets is not None:
+            surf = self.assets.get(name, (size, size))
+            if surf is not None:
+                sprite = (surf, offset)
+                self.sprites[key] = sprite
+        return sprite
+
+    def _finish(self, surf):
+        surf.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+            surf.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        return surf
+
+    def circle(self, color, radius):
+        """Filled circle centered on the entity position"""
+        key = ('circle', color, radius)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            size = radius * 2 + 1
+            surf = pygame.Surface((size, size))
+            surf.fill(COLORKEY)
+            pygame.draw.circle(surf, color, (radius, radius), radius)
+            sprite = (self._finish(surf), (-radius, -radius))
+            self.sprites[key] = sprite
+        return sprite
+
+    def enemy(self, enemy):
+        size = enemy.radius * 2 + 1
+        sprite = self.atlas_sprite('boss' if enemy.is_boss else 'enemy', size, (-enemy.radius, -enemy.radius))
+        if sprite is not None:
+            return sprite
+        if enemy.is_boss:
+            return self.circle(BOSS_COLOR, enemy.radius)
+        return self.circle(ENEMY_COLOR, enemy.radius)
+
+    def projectile(self, proj):
+        color = TURRET_SHOT_COLOR if proj.source == "turret" else OTHER_SHOT_COLOR
+        return self.circle(color, proj.radius)
+
+    def drone(self):
+        """Cyan triangle (Top, BottomLeft, BottomRight)"""
+        sprite = self.atlas_sprite('drone', DRONE_SIZE * 2 + 1, (-DRONE_SIZE, -DRONE_SIZE))
+        if sprite is not None:
+            return sprite
+        sprite = self.sprites.get('drone')
+        if sprite is None:
+            size = DRONE_SIZE
+            surf = pygame.Surface((size * 2 + 1, size * 2 + 1))
+            surf.fill(COLORKEY)
+            points = [(size, 0), (0, size * 2), (size * 2, size * 2)]
+            pygame.draw.polygon(surf, DRONE_COLOR, points)
+            sprite = (self._finish(surf), (-size, -size))
+            self.sprites['drone'] = sprite
+        return sprite
+
+    def ground_unit(self, team):
+        """Small square standing on the ground"""
+        sprite = self.atlas_sprite(team, GROUND_UNIT_SIZE, (-GROUND_UNIT_SIZE // 2, -GROUND_UNIT_SIZE))
+        if sprite is not None:
+            return sprite
+        key = ('ground_unit', team)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            surf = pygame.Surface((GROUND_UNIT_SIZE, GROUND_UNIT_SIZE))
+            surf.fill(INVADER_COLOR if team == "invader" else DEFENDER_COLOR)
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert()
+            sprite = (surf, (-GROUND_UNIT_SIZE // 2, -GROUND_UNIT_SIZE))
+            self.sprites[key] = sprite
+        return sprite
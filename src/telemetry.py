@@ -0,0 +1,117 @@
+import csv
+import json
+import os
+import queue
+import threading
+from typing import List, Optional
+
+from src.core_data import DAMAGE_SOURCES
+
+# Row columns, in CSV order. damage_* are totals for the current wave;
+# tick_ms is the slowest combat update since the previous row.
+FIELDS = (
+    'event', 'tick', 'wave', 'playtime', 'enemies', 'projectiles', 'drones', 'invaders', 'defenders',
+    'buildings', 'shield_hp', 'credits', 'energy_surplus',
+) + tuple(f"damage_{source}" for source in DAMAGE_SOURCES) + ('tick_ms',)
+
+BATCH_ROWS = 60 # Rows handed to the writer at a time
+MAX_PENDING_BATCHES = 64 # Beyond this the sink drops batches rather than wait on disk
+
+class TelemetrySink:
+    """Streams per-tick combat telemetry to a JSONL or CSV file (--telemetry).
+
+    Registered as a simulation listener, it turns every ``every``-th combat
+    tick into a row (see FIELDS), plus a 'wave_end' or 'game_over' row with
+    the final numbers. Rows are batched and written by a background thread;
+    the simulation never waits on it (if the writer falls far behind, whole
+    batches are dropped and counted). The format follows the file extension:
+    .csv writes CSV, anything else JSON lines.
+    """
+
+    def __init__(self, path: str, every: int = 1):
+        self.path = path
+        self.every = max(1, every)
+        self.csv = path.lower().endswith(".csv")
+        self.rows: List[tuple] = []
+        self.slowest_ms = 0.0
+        self.batches = queue.Queue(maxsize=MAX_PENDING_BATCHES)
+        self.dropped = 0 # Batches lost to a slow disk
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="telemetry", daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Write what is buffered and stop the writer"""
+        self.flush() # Starts the writer if fewer than BATCH_ROWS rows were ever recorded
+        if self.thread is not None:
+            try:
+                self.batches.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self.thread.join(timeout)
+            self.thread = None
+
+    # --- Simulation hooks ---
+
+    def on_combat_tick(self, state, tick: int, seconds: float):
+        self.slowest_ms = max(self.slowest_ms, seconds * 1000)
+        if tick % self.every == 0:
+            self.record(state, tick, 'tick')
+
+    def on_wave_complete(self, state):
+        self.record(state, None, 'wave_end')
+        self.flush()
+
+    def on_game_over(self, state):
+        self.record(state, None, 'game_over')
+        self.flush()
+
+    def record(self, state, tick: Optional[int], event: str):
+        combat = state.combat
+        invaders = sum(1 for u in combat.ground_units if u.team == "invader")
+        self.rows.append((
+            event, tick, state.wave, round(state.playtime, 3), len(combat.enemies), len(combat.projectiles),
+            len(combat.drones), invaders, len(combat.ground_units) - invaders, len(state.grid.buildings),
+            round(state.shield_current_hp, 2), int(state.credits), state.energy_surplus,
+        ) + tuple(combat.damage_dealt[source] for source in DAMAGE_SOURCES) + (round(self.slowest_ms, 3),))
+        self.slowest_ms = 0.0
+        if len(self.rows) >= BATCH_ROWS:
+            self.flush()
+
+    def flush(self):
+        """Hand the buffered rows to the writer without blocking"""
+        if not self.rows:
+            return
+        self.start()
+        try:
+            self.batches.put_nowait(self.rows)
+        except queue.Full:
+            self.dropped += 1
+        self.rows = []
+
+    # --- Writer thread ---
+
+    def run(self):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, "a", newline="") as f:
+                writer = csv.writer(f) if self.csv else None
+                if writer and new_file:
+                    writer.writerow(FIELDS)
+                while True:
+                    batch = self.batches.get()
+                    if batch is None:
+                        return
+                    if writer:
+                        writer.writerows(batch)
+                    else:
+                        f.writelines(json.dumps(dict(zip(FIELDS, row))) + "\n" for row in batch)
+                    f.flush()
+        except OSError as e:
+            print(f"Telemetry error: {e}")